@@ -0,0 +1,94 @@
+"""
+Per-request helpers of the /chat endpoint
+
+Pure functions that run on every /chat request: Cypher extraction from the
+LLM reply, the read-only check, and Neo4j value serialization. They are fully
+annotated and kept free of FastAPI/driver imports so the module can be
+compiled with mypyc (``pip install mypy && mypyc api/_fastpath.py`` from the
+backend directory); Python picks up the resulting extension module in place
+of this file, and the plain module is used when it is not built.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+# Keywords that make generated Cypher write, call procedures or read files.
+# APOC stays blocked outright: apoc.cypher.runMany and apoc.periodic.iterate
+# execute arbitrary (including writing) Cypher passed as strings
+DISALLOWED_TOKENS = frozenset({
+    "CREATE", "MERGE", "DELETE", "SET", "REMOVE", "DROP", "CALL", "LOAD", "FOREACH", "APOC", "DBMS", "ALTER",
+})
+WORD_RE = re.compile(r"\w+")
+CODEBLOCK_RE = re.compile(r"```(?:cypher)?\s*([\s\S]*?)```", re.I)
+BARE_DISTANCE_RE = re.compile(r"(?<!point\.)\bdistance\s*\(", re.I)
+LEADING_JUNK_RE = re.compile(r"^[^\w\(\n\r]*")
+
+# Types Neo4j returns that are already JSON values
+JSON_SCALAR_TYPES = frozenset({int, float, str, bool, type(None)})
+
+
+# Pure functions of the LLM reply, which often repeats verbatim for repeated questions
+@lru_cache(maxsize=1024)
+def extract_cypher_from_text(text: str) -> Tuple[str, str]:
+    m = CODEBLOCK_RE.search(text or "")
+    cypher = ""
+    if m:
+        cypher = m.group(1).strip()
+        if cypher.upper().startswith("# EMPTY"):
+            cypher = ""
+    explanation = CODEBLOCK_RE.sub("", text or "").strip().split("\n")
+    explanation_line = ""
+    for line in explanation:
+        if line.strip():
+            explanation_line = line.strip()
+            break
+    return cypher, explanation_line
+
+
+def validate_cypher_readonly(cypher: str) -> bool:
+    if not cypher or ";" in cypher:
+        return False
+    tokens = set(WORD_RE.findall(cypher.upper()))
+    return "RETURN" in tokens and tokens.isdisjoint(DISALLOWED_TOKENS)
+
+
+@lru_cache(maxsize=1024)
+def normalize_distance_and_sanitize(cypher: str) -> str:
+    if not isinstance(cypher, str):
+        return ""
+    # Unescape literal "\n" sequences
+    cy = cypher.replace("\\n", "\n")
+
+    # 1. Fix bare 'distance(' -> 'point.distance('
+    # The (?<!point\.) prevents matching if 'point.' is already present
+    cy = BARE_DISTANCE_RE.sub("point.distance(", cy)
+
+    # 2. Fix 'point.point.distance' just in case it still occurs
+    cy = cy.replace("point.point.distance", "point.distance")
+
+    # Remove leading junk and trim
+    cy = LEADING_JUNK_RE.sub("", cy)
+    cy = cy.strip()
+
+    return cy
+
+
+def neo4j_json(v: Any) -> Any:
+    if type(v) in JSON_SCALAR_TYPES:
+        return v
+    try:
+        if hasattr(v, "x") and hasattr(v, "y"):
+            return {"x": float(v.x), "y": float(v.y), "z": float(getattr(v, "z", 0.0))}
+        if isinstance(v, dict):
+            return {k: neo4j_json(x) for k, x in v.items()}
+        if isinstance(v, (list, tuple)):
+            return [neo4j_json(x) for x in v]
+        if isinstance(v, (int, float, str, bool)) or v is None:
+            return v
+        return str(v)
+    except Exception:
+        return str(v)
+
+
+def serialize_rows(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{k: neo4j_json(v) for k, v in row.items()} for row in results]
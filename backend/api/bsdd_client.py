@@ -3,12 +3,14 @@ bSDD (buildingSMART Data Dictionary) API Client
 Provides interface to query bSDD GraphQL and REST APIs for standardized building data
 """
 import os
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 import logging
-from functools import lru_cache
+from cachetools import TTLCache, cachedmethod
 
 logger = logging.getLogger(__name__)
 
@@ -87,7 +89,9 @@ class BSDDClient:
     def __init__(
         self, 
         environment: BSDDEnvironment = BSDDEnvironment.PRODUCTION,
-        auth_token: Optional[str] = None
+        auth_token: Optional[str] = None,
+        dictionary_ttl: float = 3600,
+        max_connections: int = 100
     ):
         """
         Initialize bSDD client
@@ -95,11 +99,20 @@ class BSDDClient:
         Args:
             environment: Production or test environment
             auth_token: Optional OAuth2 token for secured endpoints
+            dictionary_ttl: Seconds to reuse the dictionary list before refetching
+            max_connections: Keep-alive connections pooled for concurrent callers
         """
         self.base_url = environment.value
         self.graphql_url = f"{self.base_url}/graphql"
         self.auth_token = auth_token or os.getenv("BSDD_AUTH_TOKEN")
         self.session = requests.Session()
+        # requests pools only 10 connections per host by default; concurrent
+        # callers beyond that open (and TLS-handshake) throwaway connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._dictionary_cache = TTLCache(maxsize=1, ttl=dictionary_ttl)
+        self._dictionary_lock = threading.Lock()
         
         if self.auth_token:
             self.session.headers.update({
@@ -141,7 +154,27 @@ class BSDDClient:
             logger.error(f"bSDD GraphQL request failed: {e}")
             raise
     
-    @lru_cache(maxsize=100)
+    def ping(self, timeout: float = 5) -> bool:
+        """
+        Check that the bSDD API is reachable
+        
+        Sends a bodiless HEAD to the API root over the pooled session, so a
+        liveness check costs one round-trip instead of a dictionary download.
+        
+        Args:
+            timeout: Seconds to wait for the response
+            
+        Returns:
+            True if the API answered without a server error
+        """
+        try:
+            response = self.session.head(self.base_url, timeout=timeout, allow_redirects=False)
+            return response.status_code < 500
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"bSDD ping failed: {e}")
+            return False
+    
+    @cachedmethod(lambda self: self._dictionary_cache, lock=lambda self: self._dictionary_lock)
     def get_dictionaries(self) -> List[BSDDDictionary]:
         """
         Get list of available dictionaries in bSDD
@@ -5,7 +5,7 @@ Fetches data from buildingSMART Data Dictionary and populates Neo4j knowledge gr
 import logging
 from typing import List, Optional, Dict
 from bsdd_client import BSDDClient, BSDDEnvironment
-from knowledge_graph_schema import KnowledgeGraphSchema
+from knowledge_graph_schema import BulkWriter, KnowledgeGraphSchema
 import time
 from datetime import datetime
 
@@ -124,26 +124,32 @@ class BSDDIngestionPipeline:
             if not dictionary:
                 raise ValueError(f"Dictionary not found: {dictionary_uri}")
             
-            # Create dictionary node in knowledge graph
-            logger.info(f"Creating dictionary node: {dictionary.name}")
-            self.kg.create_bsdd_dictionary_node(
-                uri=dictionary.uri,
-                name=dictionary.name,
-                version=dictionary.version,
-                organization_code=dictionary.organization_code,
-                status=dictionary.status,
-                language_code=dictionary.language_code,
-                license=dictionary.license,
-                release_date=dictionary.release_date,
-                more_info_url=dictionary.more_info_url
-            )
-            
-            if include_classes:
-                self._ingest_dictionary_classes(
-                    dictionary_uri,
-                    include_properties,
-                    max_classes
+            # All writes share one session; each chunk of classes and each
+            # class's links are committed as their own transactions rather
+            # than one auto-commit per statement
+            with self.kg.bulk() as kg:
+                # Create dictionary node in knowledge graph
+                logger.info(f"Creating dictionary node: {dictionary.name}")
+                kg.upsert_bsdd_dictionary_node(
+                    uri=dictionary.uri,
+                    name=dictionary.name,
+                    version=dictionary.version,
+                    organization_code=dictionary.organization_code,
+                    status=dictionary.status,
+                    language_code=dictionary.language_code,
+                    license=dictionary.license,
+                    release_date=dictionary.release_date,
+                    more_info_url=dictionary.more_info_url
                 )
+                kg.commit()
+                
+                if include_classes:
+                    self._ingest_dictionary_classes(
+                        kg,
+                        dictionary_uri,
+                        include_properties,
+                        max_classes
+                    )
         
         except Exception as e:
             logger.error(f"Failed to ingest dictionary {dictionary_uri}: {e}")
@@ -151,6 +157,7 @@ class BSDDIngestionPipeline:
     
     def _ingest_dictionary_classes(
         self,
+        kg: BulkWriter,
         dictionary_uri: str,
         include_properties: bool = True,
         max_classes: Optional[int] = None
@@ -167,134 +174,224 @@ class BSDDIngestionPipeline:
             
             logger.info(f"Found {len(classes)} classes to process")
             
-            for i, bsdd_class in enumerate(classes):
-                try:
-                    if (i + 1) % 10 == 0:
-                        logger.info(f"  Processing class {i+1}/{len(classes)}...")
-                    
-                    # Get full class details
-                    detailed_class = self.bsdd.get_class_details(
-                        dictionary_uri,
-                        bsdd_class.uri,
-                        include_properties=include_properties,
-                        include_relations=True
-                    )
-                    
-                    # Create class node
-                    self.kg.create_bsdd_class_node(
-                        uri=detailed_class.uri,
-                        code=detailed_class.code,
-                        name=detailed_class.name,
-                        dictionary_uri=dictionary_uri,
-                        definition=detailed_class.definition,
-                        class_type=detailed_class.class_type,
-                        synonyms=detailed_class.synonyms,
-                        related_ifc_entities=detailed_class.related_ifc_entities
-                    )
-                    
-                    self.stats["classes_processed"] += 1
-                    
-                    # Ingest properties
-                    if include_properties and detailed_class.properties:
-                        self._ingest_class_properties(
-                            detailed_class.uri,
-                            detailed_class.properties
-                        )
-                    
-                    # Ingest relationships
-                    if detailed_class.relations:
-                        self._ingest_class_relationships(
-                            detailed_class.uri,
-                            detailed_class.relations
-                        )
-                    
-                    # Link parent class if exists
-                    if detailed_class.parent_class_uri:
-                        try:
-                            self.kg.create_class_relationship(
-                                detailed_class.uri,
-                                detailed_class.parent_class_uri,
-                                "IsChildOf"
-                            )
-                            self.stats["relationships_created"] += 1
-                        except Exception as e:
-                            logger.warning(f"Failed to link parent class: {e}")
-                    
-                    # Rate limiting
-                    time.sleep(0.3)
-                    
-                except Exception as e:
-                    error_msg = f"Failed to process class {bsdd_class.uri}: {e}"
-                    logger.warning(error_msg)
-                    self.stats["errors"].append(error_msg)
-                    continue
+            # Details are fetched one class at a time, but the class nodes of
+            # each batch_size chunk go out in one UNWIND write
+            for start in range(0, len(classes), self.batch_size):
+                detailed_classes = []
+                for i, bsdd_class in enumerate(classes[start:start + self.batch_size], start):
+                    try:
+                        if (i + 1) % 10 == 0:
+                            logger.info(f"  Processing class {i+1}/{len(classes)}...")
+                        
+                        # Get full class details
+                        detailed_classes.append(self.bsdd.get_class_details(
+                            dictionary_uri,
+                            bsdd_class.uri,
+                            include_properties=include_properties,
+                            include_relations=True
+                        ))
+                        
+                        # Rate limiting
+                        time.sleep(0.3)
+                        
+                    except Exception as e:
+                        error_msg = f"Failed to process class {bsdd_class.uri}: {e}"
+                        logger.warning(error_msg)
+                        self.stats["errors"].append(error_msg)
+                
+                written = self._write_class_nodes(kg, dictionary_uri, detailed_classes)
+                
+                for detailed_class in written:
+                    self._ingest_class_links(kg, detailed_class, include_properties)
         
         except Exception as e:
             logger.error(f"Failed to fetch classes: {e}")
             raise
     
+    @staticmethod
+    def _class_row(detailed_class) -> Dict:
+        return {
+            "uri": detailed_class.uri,
+            "code": detailed_class.code,
+            "name": detailed_class.name,
+            "definition": detailed_class.definition,
+            "class_type": detailed_class.class_type,
+            "synonyms": detailed_class.synonyms,
+            "related_ifc_entities": detailed_class.related_ifc_entities
+        }
+    
+    def _write_class_nodes(
+        self,
+        kg: BulkWriter,
+        dictionary_uri: str,
+        detailed_classes: List
+    ) -> List:
+        """
+        Write a chunk of class nodes and return the classes that were written
+        
+        The chunk goes out through import_dictionary; if that write fails the
+        classes are retried one per transaction, so one bad class does not
+        drop the rest of the chunk.
+        """
+        if not detailed_classes:
+            return []
+        try:
+            kg.import_dictionary(
+                dictionary_uri,
+                [self._class_row(detailed_class) for detailed_class in detailed_classes]
+            )
+            kg.commit()
+            self.stats["classes_processed"] += len(detailed_classes)
+            return detailed_classes
+        except Exception as e:
+            logger.warning(f"Bulk class write failed, writing classes one by one: {e}")
+        
+        written = []
+        for detailed_class in detailed_classes:
+            try:
+                kg.upsert_bsdd_class_node(
+                    dictionary_uri=dictionary_uri,
+                    **self._class_row(detailed_class)
+                )
+                kg.commit()
+                self.stats["classes_processed"] += 1
+                written.append(detailed_class)
+            except Exception as e:
+                error_msg = f"Failed to process class {detailed_class.uri}: {e}"
+                logger.warning(error_msg)
+                self.stats["errors"].append(error_msg)
+        return written
+    
+    def _ingest_class_links(
+        self,
+        kg: BulkWriter,
+        detailed_class,
+        include_properties: bool
+    ):
+        """Ingest the properties, relations and parent link of a written class"""
+        # Ingest properties
+        if include_properties and detailed_class.properties:
+            self._ingest_class_properties(
+                kg,
+                detailed_class.uri,
+                detailed_class.properties
+            )
+        
+        # Ingest relationships
+        if detailed_class.relations:
+            self._ingest_class_relationships(
+                kg,
+                detailed_class.uri,
+                detailed_class.relations
+            )
+        
+        # Link parent class if exists
+        if detailed_class.parent_class_uri:
+            try:
+                kg.create_class_relationship(
+                    detailed_class.uri,
+                    detailed_class.parent_class_uri,
+                    "IsChildOf"
+                )
+                kg.commit()
+                self.stats["relationships_created"] += 1
+            except Exception as e:
+                logger.warning(f"Failed to link parent class: {e}")
+    
+    @staticmethod
+    def _property_row(prop: Dict) -> Dict:
+        return {
+            "uri": prop["uri"],
+            "code": prop.get("code", ""),
+            "name": prop.get("name", ""),
+            "definition": prop.get("definition") or prop.get("description"),
+            "data_type": prop.get("dataType"),
+            "units": prop.get("units", []),
+            "physical_quantity": prop.get("physicalQuantity"),
+            "dimension": prop.get("dimension"),
+            "pattern": prop.get("pattern"),
+            "is_required": prop.get("isRequired", False)
+        }
+    
+    @staticmethod
+    def _property_link(class_uri: str, prop: Dict) -> Dict:
+        return {
+            "class_uri": class_uri,
+            "property_uri": prop["uri"],
+            "property_set": prop.get("propertySet"),
+            "is_required": prop.get("isRequired", False)
+        }
+    
     def _ingest_class_properties(
         self,
+        kg: BulkWriter,
         class_uri: str,
         properties: List[Dict]
     ):
         """Ingest properties for a class"""
-        for prop in properties:
+        # Properties are keyed by uri, so one without it can never be written
+        valid = [prop for prop in properties if prop.get("uri")]
+        if len(valid) < len(properties):
+            logger.warning(
+                f"Skipping {len(properties) - len(valid)} properties without a uri for {class_uri}"
+            )
+        if not valid:
+            return
+        
+        # One UNWIND write for the nodes and one for the HAS_PROPERTY links,
+        # instead of two round-trips per property
+        try:
+            kg.create_bsdd_properties_bulk([self._property_row(prop) for prop in valid])
+            linked = kg.link_classes_to_properties_bulk(
+                [self._property_link(class_uri, prop) for prop in valid]
+            )
+            kg.commit()
+            
+            self.stats["properties_processed"] += len(valid)
+            self.stats["relationships_created"] += linked
+            return
+            
+        except Exception as e:
+            logger.warning(
+                f"Bulk property write failed for {class_uri}, writing properties one by one: {e}"
+            )
+        
+        # The failed batch was rolled back; retry each property in its own
+        # transaction so only the bad ones are lost
+        for prop in valid:
             try:
-                # Create property node
-                self.kg.create_bsdd_property_node(
-                    uri=prop.get("uri", ""),
-                    code=prop.get("code", ""),
-                    name=prop.get("name", ""),
-                    definition=prop.get("definition") or prop.get("description"),
-                    data_type=prop.get("dataType"),
-                    units=prop.get("units", []),
-                    physical_quantity=prop.get("physicalQuantity"),
-                    dimension=prop.get("dimension"),
-                    pattern=prop.get("pattern"),
-                    is_required=prop.get("isRequired", False)
-                )
-                
-                # Link property to class
-                self.kg.link_class_to_property(
-                    class_uri=class_uri,
-                    property_uri=prop.get("uri", ""),
-                    property_set=prop.get("propertySet"),
-                    is_required=prop.get("isRequired", False)
-                )
+                kg.upsert_bsdd_property_node(**self._property_row(prop))
+                kg.link_class_to_property(**self._property_link(class_uri, prop))
+                kg.commit()
                 
                 self.stats["properties_processed"] += 1
                 self.stats["relationships_created"] += 1
                 
             except Exception as e:
-                logger.warning(f"Failed to process property: {e}")
-                continue
+                logger.warning(f"Failed to process property {prop['uri']} for {class_uri}: {e}")
     
     def _ingest_class_relationships(
         self,
+        kg: BulkWriter,
         class_uri: str,
         relations: List[Dict]
     ):
         """Ingest relationships between classes"""
-        for relation in relations:
-            try:
-                related_uri = relation.get("relatedClassUri")
-                relation_type = relation.get("relationType")
-                
-                if not related_uri or not relation_type:
-                    continue
-                
-                self.kg.create_class_relationship(
-                    from_class_uri=class_uri,
-                    to_class_uri=related_uri,
-                    relation_type=relation_type
-                )
-                
-                self.stats["relationships_created"] += 1
-                
-            except Exception as e:
-                logger.warning(f"Failed to create relationship: {e}")
-                continue
+        # One UNWIND write per relationship type instead of a session per relation
+        try:
+            self.stats["relationships_created"] += kg.create_class_relationships_bulk([
+                {
+                    "from_class_uri": class_uri,
+                    "to_class_uri": relation.get("relatedClassUri"),
+                    "relation_type": relation.get("relationType")
+                }
+                for relation in relations
+                if relation.get("relatedClassUri") and relation.get("relationType")
+            ])
+            kg.commit()
+            
+        except Exception as e:
+            logger.warning(f"Failed to create relationships for {class_uri}: {e}")
     
     def ingest_ifc_dictionary(
         self,
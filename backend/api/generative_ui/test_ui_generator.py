@@ -126,7 +126,7 @@ async def test_streaming():
     event_count = 0
     async for event in streaming.stream_components(components, delay_ms=300):
         event_count += 1
-        lines = event.strip().split('\n')
+        lines = event.decode().strip().split('\n')
         for line in lines:
             if line.startswith('event:'):
                 print(f"\n{line}")
@@ -28,10 +28,11 @@ References:
 from typing import Dict, Any, List, Optional, Literal, Union, AsyncIterator
 from enum import Enum
 from pydantic import BaseModel, Field
-import json
+import orjson
 import asyncio
 import logging
 from datetime import datetime
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -390,57 +391,83 @@ class StreamingUIGenerator:
     def __init__(self):
         self.component_generator = ComponentGenerator()
     
-    async def stream_components(
-        self,
-        components: List[UIComponent],
-        delay_ms: int = 100
-    ) -> AsyncIterator[str]:
+    def encode_stream(self, components: List[UIComponent]) -> List[bytes]:
         """
-        Stream components with progressive rendering
+        Pre-encode the full SSE event sequence for a list of components
         
-        Args:
-            components: List of components to stream
-            delay_ms: Delay between component sends (simulates processing)
+        Each event is serialized exactly once, so the returned frames can be
+        written to any number of subscribers without re-encoding.
         
-        Yields:
-            SSE-formatted strings
+        Returns:
+            Start event, one event per component, completion event
         """
-        try:
-            # Send start event
-            yield self._format_sse(
+        total = len(components)
+        frames = [
+            self._encode_sse(
                 StreamEvent(
                     event=StreamEventType.PROGRESS,
-                    data={"status": "started", "total": len(components)}
+                    data={"status": "started", "total": total}
                 )
             )
-            
-            # Stream each component
-            for idx, component in enumerate(components):
-                await asyncio.sleep(delay_ms / 1000)
-                
-                yield self._format_sse(
+        ]
+        
+        for idx, component in enumerate(components):
+            frames.append(
+                self._encode_sse(
                     StreamEvent(
                         event=StreamEventType.COMPONENT,
                         data={
                             "component": self.component_generator.to_dict(component),
                             "index": idx,
-                            "total": len(components)
+                            "total": total
                         },
                         id=component.id
                     )
                 )
-            
-            # Send completion event
-            yield self._format_sse(
+            )
+        
+        frames.append(
+            self._encode_sse(
                 StreamEvent(
                     event=StreamEventType.COMPLETE,
-                    data={"status": "completed", "total": len(components)}
+                    data={"status": "completed", "total": total}
                 )
             )
+        )
+        return frames
+    
+    async def stream_components(
+        self,
+        components: List[UIComponent],
+        delay_ms: int = 100
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream components with progressive rendering
+        
+        Args:
+            components: List of components to stream
+            delay_ms: Delay between component sends (simulates processing)
+        
+        Yields:
+            SSE-formatted, UTF-8 encoded frames
+        """
+        try:
+            frames = self.encode_stream(components)
+            
+            # Send start event
+            yield frames[0]
+            
+            # Stream each component
+            for frame in frames[1:-1]:
+                await asyncio.sleep(delay_ms / 1000)
+                yield frame
+            
+            # Send completion event
+            yield frames[-1]
             
         except Exception as e:  # pylint: disable=broad-except
             logger.exception("Streaming error")
-            yield self._format_sse(
+            yield self._encode_sse(
                 StreamEvent(
                     event=StreamEventType.ERROR,
                     data={"error": str(e)}
@@ -455,8 +482,12 @@ class StreamingUIGenerator:
         return self._format_sse(event)
     
     def _format_sse(self, event: StreamEvent) -> str:
+        """Format event as Server-Sent Event string"""
+        return self._encode_sse(event).decode()
+    
+    def _encode_sse(self, event: StreamEvent) -> bytes:
         """
-        Format event as Server-Sent Event string
+        Format event as UTF-8 encoded Server-Sent Event
         
         SSE format:
         event: component
@@ -467,29 +498,49 @@ class StreamingUIGenerator:
         lines = []
         
         if event.event:
-            lines.append(f"event: {event.event}")
+            lines.append(f"event: {event.event}".encode())
         
         if event.data:
-            data_json = json.dumps(event.data)
-            lines.append(f"data: {data_json}")
+            lines.append(b"data: " + orjson.dumps(event.data))
         
         if event.id:
-            lines.append(f"id: {event.id}")
+            lines.append(f"id: {event.id}".encode())
         
         if event.retry:
-            lines.append(f"retry: {event.retry}")
+            lines.append(f"retry: {event.retry}".encode())
         
         # SSE requires double newline at end
-        lines.append("")
-        lines.append("")
+        lines.append(b"")
+        lines.append(b"")
         
-        return "\n".join(lines)
+        return b"\n".join(lines)
 
 
 # ============================================================================
 # Agent Response to UI Converter
 # ============================================================================
 
+# Metric value types that can be plotted
+_CHART_VALUE_TYPES = frozenset((int, float))
+
+# Exact value type → table column type (anything else renders as text)
+_COLUMN_TYPES = {bool: "boolean", int: "number", float: "number"}
+
+
+@lru_cache(maxsize=256)
+def _columns_for_schema(schema: tuple) -> tuple:
+    """Column definitions for a row shape given as ((key, column type), ...) pairs"""
+    return tuple(
+        {
+            "key": key,
+            "label": key.replace("_", " ").title(),
+            "type": col_type,
+            "sortable": True
+        }
+        for key, col_type in schema
+    )
+
+
 class AgentResponseConverter:
     """
     Convert agent responses to UI components
@@ -520,72 +571,79 @@ class AgentResponseConverter:
         """
         components = []
         
-        # Detect response type and generate appropriate components
-        if "results" in response_data and isinstance(response_data["results"], list):
-            # Tabular results
-            if len(response_data["results"]) > 0:
-                columns = self._infer_columns(response_data["results"])
-                table = self.generator.create_table(
-                    columns=columns,
-                    data=response_data["results"],
-                    title=response_data.get("title", "Results")
-                )
-                components.append(table)
+        # Dispatch each recognised response key to its handler, in table order
+        for key, handler in self._HANDLERS.items():
+            if key in response_data:
+                component = handler(self, response_data)
+                if component is not None:
+                    components.append(component)
         
-        if "properties" in response_data and isinstance(response_data["properties"], list):
-            # Property list
-            panel = self.generator.create_property_panel(
-                properties=response_data["properties"],
-                title=response_data.get("title", "Properties")
-            )
-            components.append(panel)
-        
-        if "metrics" in response_data:
-            # Metrics visualization
-            chart_data = self._prepare_chart_data(response_data["metrics"])
-            if chart_data:
-                chart = self.generator.create_chart(
-                    chart_type=ChartType.BAR,
-                    data=chart_data["data"],
-                    x_axis=chart_data["x"],
-                    y_axis=chart_data["y"],
-                    title=response_data.get("title", "Metrics")
-                )
-                components.append(chart)
+        return components
+    
+    def _handle_results(self, response_data: Dict[str, Any]) -> Optional[UIComponent]:
+        """Tabular results → table"""
+        results = response_data["results"]
+        if not isinstance(results, list) or not results:
+            return None
         
-        if "message" in response_data:
-            # Text message as card
-            card = self.generator.create_card(
-                title="Response",
-                content=response_data["message"]
-            )
-            components.append(card)
+        return self.generator.create_table(
+            columns=self._infer_columns(results),
+            data=results,
+            title=response_data.get("title", "Results")
+        )
+    
+    def _handle_properties(self, response_data: Dict[str, Any]) -> Optional[UIComponent]:
+        """Property list → property panel"""
+        properties = response_data["properties"]
+        if not isinstance(properties, list):
+            return None
         
-        return components
+        return self.generator.create_property_panel(
+            properties=properties,
+            title=response_data.get("title", "Properties")
+        )
+    
+    def _handle_metrics(self, response_data: Dict[str, Any]) -> Optional[UIComponent]:
+        """Metrics → bar chart"""
+        chart_data = self._prepare_chart_data(response_data["metrics"])
+        if not chart_data:
+            return None
+        
+        return self.generator.create_chart(
+            chart_type=ChartType.BAR,
+            data=chart_data["data"],
+            x_axis=chart_data["x"],
+            y_axis=chart_data["y"],
+            title=response_data.get("title", "Metrics")
+        )
+    
+    def _handle_message(self, response_data: Dict[str, Any]) -> Optional[UIComponent]:
+        """Text message → card"""
+        return self.generator.create_card(
+            title="Response",
+            content=response_data["message"]
+        )
+    
+    # Response key -> handler; insertion order is the component render order
+    _HANDLERS = {
+        "results": _handle_results,
+        "properties": _handle_properties,
+        "metrics": _handle_metrics,
+        "message": _handle_message,
+    }
     
     def _infer_columns(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Infer column definitions from data"""
         if not data:
             return []
         
-        first_row = data[0]
-        columns = []
-        
-        for key, value in first_row.items():
-            col_type = "text"
-            if isinstance(value, (int, float)):
-                col_type = "number"
-            elif isinstance(value, bool):
-                col_type = "boolean"
-            
-            columns.append({
-                "key": key,
-                "label": key.replace("_", " ").title(),
-                "type": col_type,
-                "sortable": True
-            })
-        
-        return columns
+        # Results of the same query share a shape, so the definitions are cached
+        # per schema; callers get copies they are free to modify
+        schema = tuple(
+            (key, _COLUMN_TYPES.get(type(value), "text"))
+            for key, value in data[0].items()
+        )
+        return [dict(column) for column in _columns_for_schema(schema)]
     
     def _prepare_chart_data(self, metrics: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Convert metrics to chart-compatible format"""
@@ -593,10 +651,11 @@ class AgentResponseConverter:
         if not metrics:
             return None
         
+        # Exact type test skips isinstance's MRO walk; bools are not chartable
         data = [
             {"label": k, "value": v}
             for k, v in metrics.items()
-            if isinstance(v, (int, float))
+            if type(v) in _CHART_VALUE_TYPES
         ]
         
         if not data:
@@ -684,7 +743,7 @@ async def test_generative_ui():
     
     print("Streaming components...")
     async for event in streaming.stream_components(components, delay_ms=500):
-        print(event)
+        print(event.decode())
     
     print("\n✅ All tests passed!")
 
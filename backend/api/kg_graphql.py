@@ -3,10 +3,18 @@ GraphQL API for Knowledge Graph
 Provides GraphQL interface to query Neo4j knowledge graph with bSDD integration
 """
 import os
+import re
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+from functools import cache
+from sys import intern
+from typing import Callable, List, Optional, Dict, Any, Set, Tuple
+import orjson
 import strawberry
-from strawberry.fastapi import GraphQLRouter
+from strawberry.dataloader import DataLoader
+from strawberry.fastapi import BaseContext, GraphQLRouter
+from strawberry.types import Info
+from strawberry.utils.str_converters import to_camel_case
 from dotenv import load_dotenv
 
 from .knowledge_graph_schema import KnowledgeGraphSchema
@@ -16,32 +24,211 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Initialize clients
-_kg_schema = None
-_bsdd_client = None
-
-
+@cache
 def get_kg_schema() -> KnowledgeGraphSchema:
-    """Get or create knowledge graph schema singleton"""
-    global _kg_schema
-    if _kg_schema is None:
-        neo4j_password = os.getenv("NEO4J_PASSWORD")
-        if not neo4j_password:
-            raise ValueError("NEO4J_PASSWORD environment variable is required")
-        _kg_schema = KnowledgeGraphSchema(
-            neo4j_uri=os.getenv("NEO4J_URI", "bolt://localhost:7687"),
-            neo4j_user=os.getenv("NEO4J_USER", "neo4j"),
-            neo4j_password=neo4j_password
-        )
-    return _kg_schema
+    """
+    Get or create knowledge graph schema singleton
 
+    Memoized so hot resolvers pay a single cache lookup instead of a global
+    load and None check; a failed construction is not cached and is retried.
+    """
+    neo4j_password = os.getenv("NEO4J_PASSWORD")
+    if not neo4j_password:
+        raise ValueError("NEO4J_PASSWORD environment variable is required")
+    return KnowledgeGraphSchema(
+        neo4j_uri=os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+        neo4j_user=os.getenv("NEO4J_USER", "neo4j"),
+        neo4j_password=neo4j_password,
+        max_connection_pool_size=int(os.getenv("NEO4J_MAX_POOL_SIZE", "100")),
+        connection_acquisition_timeout=float(os.getenv("NEO4J_ACQUIRE_TIMEOUT", "60")),
+        max_connection_lifetime=float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600")),
+        max_transaction_retry_time=float(os.getenv("NEO4J_MAX_RETRY_TIME", "30"))
+    )
 
+
+@cache
 def get_bsdd_client() -> BSDDClient:
     """Get or create bSDD client singleton"""
-    global _bsdd_client
-    if _bsdd_client is None:
-        _bsdd_client = BSDDClient(environment=BSDDEnvironment.PRODUCTION)
-    return _bsdd_client
+    return BSDDClient(environment=BSDDEnvironment.PRODUCTION)
+
+
+def warm_up_clients() -> None:
+    """
+    Build the GraphQL singletons and open the first Neo4j connection
+    
+    Registered as a startup handler so the first client request does not pay
+    for driver construction and the Bolt handshake.
+    """
+    try:
+        get_kg_schema().driver.verify_connectivity()
+    except Exception as e:
+        logger.warning(f"Knowledge graph warmup failed: {e}")
+    get_bsdd_client()
+
+
+async def close_clients() -> None:
+    """Close the knowledge graph drivers opened for the GraphQL resolvers"""
+    if get_kg_schema.cache_info().currsize:
+        kg = get_kg_schema()
+        kg.close()
+        await kg.close_async()
+        get_kg_schema.cache_clear()
+    get_ifc_link_writer.cache_clear()
+    get_segment_link_writer.cache_clear()
+
+
+# ============================================================================
+# Cypher Projections
+# ============================================================================
+
+# GraphQL field name -> Neo4j property name, per node type. Resolvers project
+# only these properties in their RETURN clause so the driver never has to
+# deserialize (or copy) properties that are not read. The first entry of each
+# map is the node key and is always projected, since nested resolvers need it.
+BSDD_DICTIONARY_FIELDS = {
+    "uri": "uri",
+    "name": "name",
+    "version": "version",
+    "organization_code": "organizationCode",
+    "status": "status",
+    "language_code": "languageCode",
+    "license": "license",
+    "release_date": "releaseDate",
+    "more_info_url": "moreInfoUrl",
+}
+
+BSDD_CLASS_FIELDS = {
+    "uri": "uri",
+    "code": "code",
+    "name": "name",
+    "definition": "definition",
+    "class_type": "classType",
+    "dictionary_uri": "dictionaryUri",
+    "parent_class_uri": "parentClassUri",
+    "related_ifc_entities": "relatedIfcEntities",
+    "synonyms": "synonyms",
+}
+
+BSDD_PROPERTY_FIELDS = {
+    "uri": "uri",
+    "code": "code",
+    "name": "name",
+    "definition": "definition",
+    "data_type": "dataType",
+    "units": "units",
+    "physical_quantity": "physicalQuantity",
+}
+
+IFC_ELEMENT_FIELDS = {
+    "global_id": "globalId",
+    "ifc_type": "ifcType",
+    "name": "name",
+    "description": "description",
+    "object_type": "objectType",
+}
+
+POINT_CLOUD_SEGMENT_FIELDS = {
+    "segment_id": "segmentId",
+    "semantic_label": "semanticLabel",
+    "confidence": "confidence",
+    "point_count": "pointCount",
+}
+
+
+def _projection(alias: str, field_map: Dict[str, str]) -> str:
+    """Build a Cypher RETURN projection such as ``c.uri AS uri, c.classType AS class_type``"""
+    return ", ".join(f"{alias}.{prop} AS {field}" for field, prop in field_map.items())
+
+
+def _map_projection(alias: str, field_map: Dict[str, str]) -> str:
+    """Build a Cypher map projection such as ``c {uri: c.uri, class_type: c.classType}``"""
+    entries = ", ".join(f"{field}: {alias}.{prop}" for field, prop in field_map.items())
+    return f"{alias} {{{entries}}}"
+
+
+def _selected_field_names(selections: List[Any]) -> Set[str]:
+    """Collect GraphQL field names from a selection set, flattening fragments"""
+    names = set()
+    for selection in selections:
+        if hasattr(selection, "type_condition"):
+            # InlineFragment / FragmentSpread
+            names.update(_selected_field_names(selection.selections))
+        else:
+            names.add(selection.name)
+    return names
+
+
+def _project(info: Optional[Info], alias: str, field_map: Dict[str, str]) -> str:
+    """
+    Build a RETURN projection limited to the fields the client selected
+
+    Falls back to the full projection when no selection info is available.
+    """
+    if info is None or not info.selected_fields:
+        return _projection(alias, field_map)
+
+    selected = _selected_field_names(info.selected_fields[0].selections)
+    key_field = next(iter(field_map))
+    return _projection(alias, {
+        field: prop
+        for field, prop in field_map.items()
+        if field == key_field or to_camel_case(field) in selected
+    })
+
+
+# Full-text indexes created by KnowledgeGraphSchema.create_schema()
+BSDD_CLASS_TEXT_INDEX = KnowledgeGraphSchema.FULLTEXT_INDEXES["BSDD_CLASS"]
+BSDD_PROPERTY_TEXT_INDEX = KnowledgeGraphSchema.FULLTEXT_INDEXES["BSDD_PROPERTY"]
+IFC_ELEMENT_TEXT_INDEX = KnowledgeGraphSchema.FULLTEXT_INDEXES["IFC_ELEMENT"]
+SEGMENT_TEXT_INDEX = KnowledgeGraphSchema.FULLTEXT_INDEXES["POINT_CLOUD_SEGMENT"]
+
+# Universal search buckets: result_type -> (full-text index, key, name, description property)
+SEARCH_TARGETS = {
+    "class": (BSDD_CLASS_TEXT_INDEX, "uri", "name", "definition"),
+    "property": (BSDD_PROPERTY_TEXT_INDEX, "uri", "name", "definition"),
+    "ifc_element": (IFC_ELEMENT_TEXT_INDEX, "globalId", "name", "description"),
+    "segment": (SEGMENT_TEXT_INDEX, "segmentId", "semanticLabel", None),
+}
+
+LUCENE_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def _fulltext_query(text: Optional[str]) -> str:
+    """
+    Turn free text into a Lucene query for db.index.fulltext.queryNodes
+
+    Every whitespace-separated term must match as a prefix; Lucene operators
+    in user input are escaped. Returns an empty string for blank input.
+    """
+    if not text:
+        return ""
+    terms = [LUCENE_SPECIAL_RE.sub(r"\\\1", term) for term in text.split()]
+    return " AND ".join(f"{term}*" for term in terms)
+
+
+def _keyset_page(alias: str, label: str, key_prop: str, after: Optional[str]) -> Tuple[str, str, str]:
+    """
+    Build keyset pagination clauses for a list ordered by name
+
+    ``after`` is the key (uri / globalId) of the last item of the previous
+    page. Returns ``(cursor_match, predicate, order_by)``: the cursor node
+    lookup to place before the main MATCH, a WHERE predicate resuming after
+    it (empty for the first page) and the matching ORDER BY expression.
+    Ties on name are broken by the key so pages never skip or repeat items.
+    A missing name sorts and compares as '' (the ORDER BY and the predicate
+    use the same expression), so unnamed nodes are reachable on every page.
+    """
+    name = f"coalesce({alias}.name, '')"
+    order_by = f"{name}, {alias}.{key_prop}"
+    if not after:
+        return "", "", order_by
+    cursor_match = f"MATCH (cursor:{label} {{{key_prop}: $after}})"
+    cursor_name = "coalesce(cursor.name, '')"
+    predicate = (
+        f"({name} > {cursor_name} OR "
+        f"({name} = {cursor_name} AND {alias}.{key_prop} > cursor.{key_prop}))"
+    )
+    return cursor_match, predicate, order_by
 
 
 # ============================================================================
@@ -78,46 +265,14 @@ class BsddClass:
     synonyms: List[str]
     
     @strawberry.field
-    def properties(self) -> List["BsddProperty"]:
+    async def properties(self, info: Info) -> List["BsddProperty"]:
         """Get properties for this class"""
-        kg = get_kg_schema()
-        query = """
-        MATCH (c:BsddClass {uri: $uri})-[:HAS_PROPERTY]->(p:BsddProperty)
-        RETURN p
-        """
-        result = kg.execute_query(query, {"uri": self.uri})
-        properties = []
-        for record in result:
-            prop_data = dict(record["p"])
-            properties.append(BsddProperty(
-                uri=prop_data.get("uri", ""),
-                code=prop_data.get("code", ""),
-                name=prop_data.get("name", ""),
-                definition=prop_data.get("definition"),
-                data_type=prop_data.get("dataType"),
-                units=prop_data.get("units", []),
-                physical_quantity=prop_data.get("physicalQuantity")
-            ))
-        return properties
+        return await info.context.class_properties_loader.load(self.uri)
     
     @strawberry.field
-    def relations(self) -> List["ClassRelation"]:
+    async def relations(self, info: Info) -> List["ClassRelation"]:
         """Get relations for this class"""
-        kg = get_kg_schema()
-        query = """
-        MATCH (c:BsddClass {uri: $uri})-[r:RELATED_TO|IS_SUBCLASS_OF|IS_PARENT_OF]->(related:BsddClass)
-        RETURN type(r) as relationType, related
-        """
-        result = kg.execute_query(query, {"uri": self.uri})
-        relations = []
-        for record in result:
-            related_data = dict(record["related"])
-            relations.append(ClassRelation(
-                relation_type=record["relationType"],
-                related_class_uri=related_data.get("uri", ""),
-                related_class_name=related_data.get("name", "")
-            ))
-        return relations
+        return await info.context.class_relations_loader.load(self.uri)
 
 
 @strawberry.type
@@ -132,26 +287,10 @@ class BsddProperty:
     physical_quantity: Optional[str] = None
     
     @strawberry.field
-    def classes(self) -> List[BsddClass]:
+    async def classes(self, info: Info) -> List[BsddClass]:
         """Get classes that use this property"""
-        kg = get_kg_schema()
-        query = """
-        MATCH (p:BsddProperty {uri: $uri})<-[:HAS_PROPERTY]-(c:BsddClass)
-        RETURN c
-        """
-        result = kg.execute_query(query, {"uri": self.uri})
-        classes = []
-        for record in result:
-            class_data = dict(record["c"])
-            classes.append(BsddClass(
-                uri=class_data.get("uri", ""),
-                code=class_data.get("code", ""),
-                name=class_data.get("name", ""),
-                definition=class_data.get("definition"),
-                class_type=class_data.get("classType"),
-                related_ifc_entities=class_data.get("relatedIfcEntities", []),
-                synonyms=class_data.get("synonyms", [])
-            ))
+        classes = await info.context.property_classes_loader.load(self.uri)
+        _prime_classes(info, classes)
         return classes
 
 
@@ -165,46 +304,16 @@ class IfcElement:
     object_type: Optional[str] = None
     
     @strawberry.field
-    def bsdd_mappings(self) -> List[BsddClass]:
+    async def bsdd_mappings(self, info: Info) -> List[BsddClass]:
         """Get bSDD classes mapped to this IFC element"""
-        kg = get_kg_schema()
-        query = """
-        MATCH (ifc:IfcElement {globalId: $global_id})-[:MAPS_TO_BSDD]->(bsdd:BsddClass)
-        RETURN bsdd
-        """
-        result = kg.execute_query(query, {"global_id": self.global_id})
-        mappings = []
-        for record in result:
-            bsdd_data = dict(record["bsdd"])
-            mappings.append(BsddClass(
-                uri=bsdd_data.get("uri", ""),
-                code=bsdd_data.get("code", ""),
-                name=bsdd_data.get("name", ""),
-                definition=bsdd_data.get("definition"),
-                class_type=bsdd_data.get("classType"),
-                related_ifc_entities=bsdd_data.get("relatedIfcEntities", []),
-                synonyms=bsdd_data.get("synonyms", [])
-            ))
+        mappings, _ = await info.context.ifc_children_loader.load(self.global_id)
+        _prime_classes(info, mappings)
         return mappings
     
     @strawberry.field
-    def point_cloud_segments(self) -> List["PointCloudSegment"]:
+    async def point_cloud_segments(self, info: Info) -> List["PointCloudSegment"]:
         """Get point cloud segments corresponding to this IFC element"""
-        kg = get_kg_schema()
-        query = """
-        MATCH (ifc:IfcElement {globalId: $global_id})-[:CORRESPONDS_TO]->(seg:PointCloudSegment)
-        RETURN seg
-        """
-        result = kg.execute_query(query, {"global_id": self.global_id})
-        segments = []
-        for record in result:
-            seg_data = dict(record["seg"])
-            segments.append(PointCloudSegment(
-                segment_id=seg_data.get("segmentId", ""),
-                semantic_label=seg_data.get("semanticLabel", ""),
-                confidence=seg_data.get("confidence"),
-                point_count=seg_data.get("pointCount")
-            ))
+        _, segments = await info.context.ifc_children_loader.load(self.global_id)
         return segments
 
 
@@ -217,26 +326,10 @@ class PointCloudSegment:
     point_count: Optional[int] = None
     
     @strawberry.field
-    def bsdd_mappings(self) -> List[BsddClass]:
+    async def bsdd_mappings(self, info: Info) -> List[BsddClass]:
         """Get bSDD classes mapped to this point cloud segment"""
-        kg = get_kg_schema()
-        query = """
-        MATCH (seg:PointCloudSegment {segmentId: $segment_id})-[:MAPS_TO_BSDD]->(bsdd:BsddClass)
-        RETURN bsdd
-        """
-        result = kg.execute_query(query, {"segment_id": self.segment_id})
-        mappings = []
-        for record in result:
-            bsdd_data = dict(record["bsdd"])
-            mappings.append(BsddClass(
-                uri=bsdd_data.get("uri", ""),
-                code=bsdd_data.get("code", ""),
-                name=bsdd_data.get("name", ""),
-                definition=bsdd_data.get("definition"),
-                class_type=bsdd_data.get("classType"),
-                related_ifc_entities=bsdd_data.get("relatedIfcEntities", []),
-                synonyms=bsdd_data.get("synonyms", [])
-            ))
+        mappings = await info.context.segment_mappings_loader.load(self.segment_id)
+        _prime_classes(info, mappings)
         return mappings
 
 
@@ -271,6 +364,264 @@ class SearchResult:
     score: Optional[float] = None
 
 
+# ============================================================================
+# Row Conversion
+# ============================================================================
+
+def _to_bsdd_dictionary(row: Dict[str, Any]) -> BsddDictionary:
+    """Build a BsddDictionary from a row projected with BSDD_DICTIONARY_FIELDS"""
+    return BsddDictionary(
+        uri=row.get("uri") or "",
+        name=row.get("name") or "",
+        version=row.get("version") or "",
+        organization_code=row.get("organization_code") or "",
+        status=row.get("status") or "",
+        language_code=row.get("language_code") or "en-GB",
+        license=row.get("license"),
+        release_date=row.get("release_date"),
+        more_info_url=row.get("more_info_url")
+    )
+
+
+def _intern_id(value: Optional[str]) -> Optional[str]:
+    """
+    Canonical copy of a URI or element id
+    
+    The same class URIs and globalIds recur across rows, loader batches and
+    mutations for the life of the process; interning keeps one shared string
+    per distinct id instead of one per occurrence.
+    """
+    return intern(value) if value else value
+
+
+def _to_bsdd_class(row: Dict[str, Any]) -> BsddClass:
+    """Build a BsddClass from a row projected with BSDD_CLASS_FIELDS"""
+    return BsddClass(
+        uri=_intern_id(row.get("uri")) or "",
+        code=row.get("code") or "",
+        name=row.get("name") or "",
+        definition=row.get("definition"),
+        class_type=row.get("class_type"),
+        dictionary_uri=_intern_id(row.get("dictionary_uri")),
+        parent_class_uri=_intern_id(row.get("parent_class_uri")),
+        related_ifc_entities=row.get("related_ifc_entities") or [],
+        synonyms=row.get("synonyms") or []
+    )
+
+
+def _to_bsdd_property(row: Dict[str, Any]) -> BsddProperty:
+    """Build a BsddProperty from a row projected with BSDD_PROPERTY_FIELDS"""
+    return BsddProperty(
+        uri=row.get("uri") or "",
+        code=row.get("code") or "",
+        name=row.get("name") or "",
+        definition=row.get("definition"),
+        data_type=row.get("data_type"),
+        units=row.get("units") or [],
+        physical_quantity=row.get("physical_quantity")
+    )
+
+
+def _to_ifc_element(row: Dict[str, Any]) -> IfcElement:
+    """Build an IfcElement from a row projected with IFC_ELEMENT_FIELDS"""
+    return IfcElement(
+        global_id=_intern_id(row.get("global_id")) or "",
+        ifc_type=row.get("ifc_type") or "",
+        name=row.get("name"),
+        description=row.get("description"),
+        object_type=row.get("object_type")
+    )
+
+
+def _to_point_cloud_segment(row: Dict[str, Any]) -> PointCloudSegment:
+    """Build a PointCloudSegment from a row projected with POINT_CLOUD_SEGMENT_FIELDS"""
+    return PointCloudSegment(
+        segment_id=_intern_id(row.get("segment_id")) or "",
+        semantic_label=row.get("semantic_label") or "",
+        confidence=row.get("confidence"),
+        point_count=row.get("point_count")
+    )
+
+
+def _to_class_relation(row: Dict[str, Any]) -> ClassRelation:
+    """Build a ClassRelation from a relation map collected by the relations loader"""
+    return ClassRelation(
+        relation_type=row["relation_type"],
+        related_class_uri=_intern_id(row["related_class_uri"]) or "",
+        related_class_name=row["related_class_name"] or ""
+    )
+
+
+async def _search_bucket(
+    kg: KnowledgeGraphSchema,
+    result_type: str,
+    search_query: str,
+    limit: Optional[int]
+) -> List[SearchResult]:
+    """Run one full-text search bucket of the universal search"""
+    index, key_prop, name_prop, description_prop = SEARCH_TARGETS[result_type]
+    description = f"n.{description_prop}" if description_prop else "null"
+    query = f"""
+    CALL db.index.fulltext.queryNodes('{index}', $search_query)
+    YIELD node AS n, score
+    RETURN n.{key_prop} as uri, n.{name_prop} as name, {description} as description, score
+    LIMIT $limit
+    """
+    records = await kg.execute_query_async(query, {"search_query": search_query, "limit": limit})
+    return [
+        SearchResult(
+            result_type=result_type,
+            uri=record["uri"] or "",
+            name=record["name"] or "",
+            description=record.get("description"),
+            score=record["score"]
+        )
+        for record in records
+    ]
+
+
+# ============================================================================
+# Data Loaders
+# ============================================================================
+
+IfcChildren = Tuple[List[BsddClass], List[PointCloudSegment]]
+
+
+async def _load_ifc_children(global_ids: List[str]) -> List[IfcChildren]:
+    """
+    Batch-load bSDD mappings and point cloud segments for IFC elements
+    
+    Both child lists are fetched in one round-trip for the whole batch of
+    parents; the intermediate collect() keeps the two OPTIONAL MATCHes from
+    multiplying into a cartesian product.
+    """
+    kg = get_kg_schema()
+    query = f"""
+    UNWIND $global_ids AS global_id
+    MATCH (ifc:IfcElement {{globalId: global_id}})
+    OPTIONAL MATCH (ifc)-[:MAPS_TO_BSDD]->(c:BsddClass)
+    WITH global_id, ifc, collect(DISTINCT {_map_projection("c", BSDD_CLASS_FIELDS)}) AS mappings
+    OPTIONAL MATCH (ifc)-[:CORRESPONDS_TO]->(seg:PointCloudSegment)
+    RETURN global_id, mappings,
+           collect(DISTINCT {_map_projection("seg", POINT_CLOUD_SEGMENT_FIELDS)}) AS segments
+    """
+    records = await kg.execute_query_async(query, {"global_ids": list(global_ids)})
+    
+    children = {
+        record["global_id"]: (
+            [_to_bsdd_class(row) for row in record["mappings"]],
+            [_to_point_cloud_segment(row) for row in record["segments"]]
+        )
+        for record in records
+    }
+    return [children.get(global_id, ([], [])) for global_id in global_ids]
+
+
+async def _load_grouped(
+    keys: List[str],
+    pattern: str,
+    item: str,
+    convert: Callable[[Dict[str, Any]], Any]
+) -> List[List[Any]]:
+    """
+    Batch-load one list of related nodes per parent key
+    
+    ``pattern`` is matched once per key (bound as ``key``) and ``item`` is the
+    map collected for each match, so a whole batch of parents costs a single
+    query instead of one per parent.
+    """
+    kg = get_kg_schema()
+    query = f"""
+    UNWIND $keys AS key
+    MATCH {pattern}
+    RETURN key, collect(DISTINCT {item}) AS items
+    """
+    records = await kg.execute_query_async(query, {"keys": list(keys)})
+    
+    grouped = {record["key"]: [convert(row) for row in record["items"]] for record in records}
+    return [grouped.get(key, []) for key in keys]
+
+
+async def _load_classes(uris: List[str]) -> List[Optional[BsddClass]]:
+    """Batch-load bSDD classes by URI"""
+    found = await _load_grouped(
+        uris,
+        "(c:BsddClass {uri: key})",
+        _map_projection("c", BSDD_CLASS_FIELDS),
+        _to_bsdd_class
+    )
+    return [items[0] if items else None for items in found]
+
+
+async def _load_class_properties(uris: List[str]) -> List[List[BsddProperty]]:
+    """Batch-load properties for bSDD classes"""
+    return await _load_grouped(
+        uris,
+        "(:BsddClass {uri: key})-[:HAS_PROPERTY]->(p:BsddProperty)",
+        _map_projection("p", BSDD_PROPERTY_FIELDS),
+        _to_bsdd_property
+    )
+
+
+async def _load_class_relations(uris: List[str]) -> List[List[ClassRelation]]:
+    """Batch-load outgoing class relations for bSDD classes"""
+    return await _load_grouped(
+        uris,
+        "(:BsddClass {uri: key})-[r:RELATED_TO|IS_SUBCLASS_OF|IS_PARENT_OF]->(related:BsddClass)",
+        "{relation_type: type(r), related_class_uri: related.uri, related_class_name: related.name}",
+        _to_class_relation
+    )
+
+
+async def _load_property_classes(uris: List[str]) -> List[List[BsddClass]]:
+    """Batch-load the classes using each bSDD property"""
+    return await _load_grouped(
+        uris,
+        "(:BsddProperty {uri: key})<-[:HAS_PROPERTY]-(c:BsddClass)",
+        _map_projection("c", BSDD_CLASS_FIELDS),
+        _to_bsdd_class
+    )
+
+
+async def _load_segment_mappings(segment_ids: List[str]) -> List[List[BsddClass]]:
+    """Batch-load bSDD classes mapped to point cloud segments"""
+    return await _load_grouped(
+        segment_ids,
+        "(:PointCloudSegment {segmentId: key})-[:MAPS_TO_BSDD]->(c:BsddClass)",
+        _map_projection("c", BSDD_CLASS_FIELDS),
+        _to_bsdd_class
+    )
+
+
+class GraphQLContext(BaseContext):
+    """Per-request GraphQL context holding the request-scoped data loaders"""
+    
+    def __init__(self):
+        super().__init__()
+        self.bsdd_class_loader = DataLoader(load_fn=_load_classes)
+        self.ifc_children_loader = DataLoader(load_fn=_load_ifc_children)
+        self.class_properties_loader = DataLoader(load_fn=_load_class_properties)
+        self.class_relations_loader = DataLoader(load_fn=_load_class_relations)
+        self.property_classes_loader = DataLoader(load_fn=_load_property_classes)
+        self.segment_mappings_loader = DataLoader(load_fn=_load_segment_mappings)
+
+
+def _prime_classes(info: Info, classes: List[BsddClass]) -> None:
+    """
+    Seed the by-URI class loader with fully projected classes already in hand
+    
+    Later ``bsddClass(uri:)`` lookups in the same request are then answered
+    from memory. Only pass classes built from every BSDD_CLASS_FIELDS entry;
+    a partially projected class would serve defaults for unselected fields.
+    """
+    info.context.bsdd_class_loader.prime_many({c.uri: c for c in classes})
+
+
+async def get_context() -> GraphQLContext:
+    """Create a fresh context (and loader caches) for each GraphQL request"""
+    return GraphQLContext()
+
+
 # ============================================================================
 # GraphQL Queries
 # ============================================================================
@@ -280,81 +631,73 @@ class Query:
     """GraphQL Query Root"""
     
     @strawberry.field
-    def bsdd_dictionaries(
+    async def bsdd_dictionaries(
         self,
+        info: Info,
         organization_code: Optional[str] = None,
         status: Optional[str] = None,
-        limit: Optional[int] = 100
+        limit: Optional[int] = 100,
+        after: Optional[str] = None
     ) -> List[BsddDictionary]:
-        """Get all bSDD dictionaries in the knowledge graph"""
+        """
+        Get all bSDD dictionaries in the knowledge graph
+        
+        Pass the uri of the last dictionary of a page as ``after`` to get the next page.
+        """
         kg = get_kg_schema()
-        query = """
+        cursor_match, cursor_predicate, order_by = _keyset_page("d", "BsddDictionary", "uri", after)
+        query = f"""
+        {cursor_match}
         MATCH (d:BsddDictionary)
         WHERE ($org_code IS NULL OR d.organizationCode = $org_code)
           AND ($status IS NULL OR d.status = $status)
-        RETURN d
-        ORDER BY d.name
+          {"AND " + cursor_predicate if cursor_predicate else ""}
+        RETURN {_project(info, "d", BSDD_DICTIONARY_FIELDS)}
+        ORDER BY {order_by}
         LIMIT $limit
         """
-        result = kg.execute_query(query, {
+        result = await kg.execute_query_async(query, {
             "org_code": organization_code,
             "status": status,
+            "after": after,
             "limit": limit
         })
         
-        dictionaries = []
-        for record in result:
-            dict_data = dict(record["d"])
-            dictionaries.append(BsddDictionary(
-                uri=dict_data.get("uri", ""),
-                name=dict_data.get("name", ""),
-                version=dict_data.get("version", ""),
-                organization_code=dict_data.get("organizationCode", ""),
-                status=dict_data.get("status", ""),
-                language_code=dict_data.get("languageCode", "en-GB"),
-                license=dict_data.get("license"),
-                release_date=dict_data.get("releaseDate"),
-                more_info_url=dict_data.get("moreInfoUrl")
-            ))
-        return dictionaries
+        return [_to_bsdd_dictionary(record) for record in result]
     
     @strawberry.field
-    def bsdd_class(self, uri: str) -> Optional[BsddClass]:
+    async def bsdd_class(self, info: Info, uri: str) -> Optional[BsddClass]:
         """Get a specific bSDD class by URI"""
-        kg = get_kg_schema()
-        query = """
-        MATCH (c:BsddClass {uri: $uri})
-        RETURN c
-        """
-        result = kg.execute_query(query, {"uri": uri})
-        
-        if not result:
-            return None
-        
-        class_data = dict(result[0]["c"])
-        return BsddClass(
-            uri=class_data.get("uri", ""),
-            code=class_data.get("code", ""),
-            name=class_data.get("name", ""),
-            definition=class_data.get("definition"),
-            class_type=class_data.get("classType"),
-            dictionary_uri=class_data.get("dictionaryUri"),
-            parent_class_uri=class_data.get("parentClassUri"),
-            related_ifc_entities=class_data.get("relatedIfcEntities", []),
-            synonyms=class_data.get("synonyms", [])
-        )
+        return await info.context.bsdd_class_loader.load(uri)
     
     @strawberry.field
-    def bsdd_classes(
+    async def bsdd_classes(
         self,
+        info: Info,
         dictionary_uri: Optional[str] = None,
         class_type: Optional[str] = None,
         ifc_entity: Optional[str] = None,
         search_text: Optional[str] = None,
-        limit: Optional[int] = 100
+        limit: Optional[int] = 100,
+        after: Optional[str] = None
     ) -> List[BsddClass]:
-        """Search bSDD classes with filters"""
+        """
+        Search bSDD classes with filters
+        
+        Pass the uri of the last class of a page as ``after`` to get the next page.
+        """
         kg = get_kg_schema()
+        cursor_match, cursor_predicate, order_by = _keyset_page("c", "BsddClass", "uri", after)
+        
+        # Text search goes through the full-text index instead of a label scan
+        search_query = _fulltext_query(search_text)
+        if search_query:
+            match_clause = (
+                f"CALL db.index.fulltext.queryNodes('{BSDD_CLASS_TEXT_INDEX}', $search_query) "
+                f"YIELD node AS c"
+            )
+        else:
+            match_clause = "MATCH (c:BsddClass)"
         
         # Build dynamic query based on filters
         where_clauses = []
@@ -364,205 +707,186 @@ class Query:
             where_clauses.append("c.classType = $class_type")
         if ifc_entity:
             where_clauses.append("$ifc_entity IN c.relatedIfcEntities")
-        if search_text:
-            where_clauses.append("(c.name CONTAINS $search_text OR c.definition CONTAINS $search_text)")
+        if cursor_predicate:
+            where_clauses.append(cursor_predicate)
         
         where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+        projection = _project(info, "c", BSDD_CLASS_FIELDS)
         
         query = f"""
-        MATCH (c:BsddClass)
+        {cursor_match}
+        {match_clause}
         {where_clause}
-        RETURN c
-        ORDER BY c.name
+        RETURN {projection}
+        ORDER BY {order_by}
         LIMIT $limit
         """
         
-        result = kg.execute_query(query, {
+        result = await kg.execute_query_async(query, {
             "dictionary_uri": dictionary_uri,
             "class_type": class_type,
             "ifc_entity": ifc_entity,
-            "search_text": search_text,
+            "search_query": search_query,
+            "after": after,
             "limit": limit
         })
         
-        classes = []
-        for record in result:
-            class_data = dict(record["c"])
-            classes.append(BsddClass(
-                uri=class_data.get("uri", ""),
-                code=class_data.get("code", ""),
-                name=class_data.get("name", ""),
-                definition=class_data.get("definition"),
-                class_type=class_data.get("classType"),
-                related_ifc_entities=class_data.get("relatedIfcEntities", []),
-                synonyms=class_data.get("synonyms", [])
-            ))
+        classes = [_to_bsdd_class(record) for record in result]
+        if projection == _projection("c", BSDD_CLASS_FIELDS):
+            _prime_classes(info, classes)
         return classes
     
     @strawberry.field
-    def bsdd_property(self, uri: str) -> Optional[BsddProperty]:
+    async def bsdd_property(self, info: Info, uri: str) -> Optional[BsddProperty]:
         """Get a specific bSDD property by URI"""
         kg = get_kg_schema()
-        query = """
-        MATCH (p:BsddProperty {uri: $uri})
-        RETURN p
+        query = f"""
+        MATCH (p:BsddProperty {{uri: $uri}})
+        RETURN {_project(info, "p", BSDD_PROPERTY_FIELDS)}
         """
-        result = kg.execute_query(query, {"uri": uri})
+        result = await kg.execute_query_async(query, {"uri": uri})
         
         if not result:
             return None
         
-        prop_data = dict(result[0]["p"])
-        return BsddProperty(
-            uri=prop_data.get("uri", ""),
-            code=prop_data.get("code", ""),
-            name=prop_data.get("name", ""),
-            definition=prop_data.get("definition"),
-            data_type=prop_data.get("dataType"),
-            units=prop_data.get("units", []),
-            physical_quantity=prop_data.get("physicalQuantity")
-        )
+        return _to_bsdd_property(result[0])
     
     @strawberry.field
-    def bsdd_properties(
+    async def bsdd_properties(
         self,
+        info: Info,
         class_uri: Optional[str] = None,
         data_type: Optional[str] = None,
         search_text: Optional[str] = None,
-        limit: Optional[int] = 100
+        limit: Optional[int] = 100,
+        after: Optional[str] = None
     ) -> List[BsddProperty]:
-        """Search bSDD properties with filters"""
+        """
+        Search bSDD properties with filters
+        
+        Pass the uri of the last property of a page as ``after`` to get the next page.
+        """
         kg = get_kg_schema()
+        cursor_match, cursor_predicate, order_by = _keyset_page("p", "BsddProperty", "uri", after)
         
-        if class_uri:
-            query = """
-            MATCH (c:BsddClass {uri: $class_uri})-[:HAS_PROPERTY]->(p:BsddProperty)
-            WHERE ($data_type IS NULL OR p.dataType = $data_type)
-              AND ($search_text IS NULL OR p.name CONTAINS $search_text OR p.definition CONTAINS $search_text)
-            RETURN p
-            ORDER BY p.name
-            LIMIT $limit
-            """
+        search_query = _fulltext_query(search_text)
+        match_clauses = [cursor_match] if cursor_match else []
+        if search_query:
+            match_clauses.append(
+                f"CALL db.index.fulltext.queryNodes('{BSDD_PROPERTY_TEXT_INDEX}', $search_query) "
+                f"YIELD node AS p"
+            )
+            if class_uri:
+                match_clauses.append("MATCH (c:BsddClass {uri: $class_uri})-[:HAS_PROPERTY]->(p)")
+        elif class_uri:
+            match_clauses.append("MATCH (c:BsddClass {uri: $class_uri})-[:HAS_PROPERTY]->(p:BsddProperty)")
         else:
-            query = """
-            MATCH (p:BsddProperty)
-            WHERE ($data_type IS NULL OR p.dataType = $data_type)
-              AND ($search_text IS NULL OR p.name CONTAINS $search_text OR p.definition CONTAINS $search_text)
-            RETURN p
-            ORDER BY p.name
-            LIMIT $limit
-            """
-        
-        result = kg.execute_query(query, {
+            match_clauses.append("MATCH (p:BsddProperty)")
+        match_clause = "\n".join(match_clauses)
+        
+        query = f"""
+        {match_clause}
+        WHERE ($data_type IS NULL OR p.dataType = $data_type)
+          {"AND " + cursor_predicate if cursor_predicate else ""}
+        RETURN {_project(info, "p", BSDD_PROPERTY_FIELDS)}
+        ORDER BY {order_by}
+        LIMIT $limit
+        """
+        
+        result = await kg.execute_query_async(query, {
             "class_uri": class_uri,
             "data_type": data_type,
-            "search_text": search_text,
+            "search_query": search_query,
+            "after": after,
             "limit": limit
         })
         
-        properties = []
-        for record in result:
-            prop_data = dict(record["p"])
-            properties.append(BsddProperty(
-                uri=prop_data.get("uri", ""),
-                code=prop_data.get("code", ""),
-                name=prop_data.get("name", ""),
-                definition=prop_data.get("definition"),
-                data_type=prop_data.get("dataType"),
-                units=prop_data.get("units", []),
-                physical_quantity=prop_data.get("physicalQuantity")
-            ))
-        return properties
+        return [_to_bsdd_property(record) for record in result]
     
     @strawberry.field
-    def ifc_element(self, global_id: str) -> Optional[IfcElement]:
+    async def ifc_element(self, info: Info, global_id: str) -> Optional[IfcElement]:
         """Get a specific IFC element by GlobalId"""
         kg = get_kg_schema()
-        query = """
-        MATCH (ifc:IfcElement {globalId: $global_id})
-        RETURN ifc
+        query = f"""
+        MATCH (ifc:IfcElement {{globalId: $global_id}})
+        RETURN {_project(info, "ifc", IFC_ELEMENT_FIELDS)}
         """
-        result = kg.execute_query(query, {"global_id": global_id})
+        result = await kg.execute_query_async(query, {"global_id": global_id})
         
         if not result:
             return None
         
-        ifc_data = dict(result[0]["ifc"])
-        return IfcElement(
-            global_id=ifc_data.get("globalId", ""),
-            ifc_type=ifc_data.get("ifcType", ""),
-            name=ifc_data.get("name"),
-            description=ifc_data.get("description"),
-            object_type=ifc_data.get("objectType")
-        )
+        return _to_ifc_element(result[0])
     
     @strawberry.field
-    def ifc_elements(
+    async def ifc_elements(
         self,
+        info: Info,
         ifc_type: Optional[str] = None,
         search_text: Optional[str] = None,
-        limit: Optional[int] = 100
+        limit: Optional[int] = 100,
+        after: Optional[str] = None
     ) -> List[IfcElement]:
-        """Search IFC elements with filters"""
+        """
+        Search IFC elements with filters
+        
+        Pass the globalId of the last element of a page as ``after`` to get the next page.
+        """
         kg = get_kg_schema()
+        cursor_match, cursor_predicate, order_by = _keyset_page("ifc", "IfcElement", "globalId", after)
+        
+        search_query = _fulltext_query(search_text)
+        if search_query:
+            match_clause = (
+                f"CALL db.index.fulltext.queryNodes('{IFC_ELEMENT_TEXT_INDEX}', $search_query) "
+                f"YIELD node AS ifc"
+            )
+        else:
+            match_clause = "MATCH (ifc:IfcElement)"
         
         where_clauses = []
         if ifc_type:
             where_clauses.append("ifc.ifcType = $ifc_type")
-        if search_text:
-            where_clauses.append("(ifc.name CONTAINS $search_text OR ifc.description CONTAINS $search_text)")
+        if cursor_predicate:
+            where_clauses.append(cursor_predicate)
         
         where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
         
         query = f"""
-        MATCH (ifc:IfcElement)
+        {cursor_match}
+        {match_clause}
         {where_clause}
-        RETURN ifc
-        ORDER BY ifc.name
+        RETURN {_project(info, "ifc", IFC_ELEMENT_FIELDS)}
+        ORDER BY {order_by}
         LIMIT $limit
         """
         
-        result = kg.execute_query(query, {
+        result = await kg.execute_query_async(query, {
             "ifc_type": ifc_type,
-            "search_text": search_text,
+            "search_query": search_query,
+            "after": after,
             "limit": limit
         })
         
-        elements = []
-        for record in result:
-            ifc_data = dict(record["ifc"])
-            elements.append(IfcElement(
-                global_id=ifc_data.get("globalId", ""),
-                ifc_type=ifc_data.get("ifcType", ""),
-                name=ifc_data.get("name"),
-                description=ifc_data.get("description"),
-                object_type=ifc_data.get("objectType")
-            ))
-        return elements
+        return [_to_ifc_element(record) for record in result]
     
     @strawberry.field
-    def point_cloud_segment(self, segment_id: str) -> Optional[PointCloudSegment]:
+    async def point_cloud_segment(self, info: Info, segment_id: str) -> Optional[PointCloudSegment]:
         """Get a specific point cloud segment by ID"""
         kg = get_kg_schema()
-        query = """
-        MATCH (seg:PointCloudSegment {segmentId: $segment_id})
-        RETURN seg
+        query = f"""
+        MATCH (seg:PointCloudSegment {{segmentId: $segment_id}})
+        RETURN {_project(info, "seg", POINT_CLOUD_SEGMENT_FIELDS)}
         """
-        result = kg.execute_query(query, {"segment_id": segment_id})
+        result = await kg.execute_query_async(query, {"segment_id": segment_id})
         
         if not result:
             return None
         
-        seg_data = dict(result[0]["seg"])
-        return PointCloudSegment(
-            segment_id=seg_data.get("segmentId", ""),
-            semantic_label=seg_data.get("semanticLabel", ""),
-            confidence=seg_data.get("confidence"),
-            point_count=seg_data.get("pointCount")
-        )
+        return _to_point_cloud_segment(result[0])
     
     @strawberry.field
-    def search(
+    async def search(
         self,
         query_text: str,
         result_types: Optional[List[str]] = None,
@@ -571,50 +895,28 @@ class Query:
         """Universal search across all node types"""
         kg = get_kg_schema()
         
+        search_query = _fulltext_query(query_text)
+        if not search_query:
+            return []
+        
         # If no types specified, search all
         if not result_types:
-            result_types = ["class", "property", "ifc_element", "segment"]
-        
-        results = []
-        
-        # Search bSDD classes
-        if "class" in result_types:
-            query = """
-            MATCH (c:BsddClass)
-            WHERE c.name CONTAINS $query_text OR c.definition CONTAINS $query_text
-            RETURN 'class' as type, c.uri as uri, c.name as name, c.definition as description
-            LIMIT $limit
-            """
-            class_results = kg.execute_query(query, {"query_text": query_text, "limit": limit})
-            for record in class_results:
-                results.append(SearchResult(
-                    result_type=record["type"],
-                    uri=record["uri"],
-                    name=record["name"],
-                    description=record.get("description")
-                ))
-        
-        # Search bSDD properties
-        if "property" in result_types:
-            query = """
-            MATCH (p:BsddProperty)
-            WHERE p.name CONTAINS $query_text OR p.definition CONTAINS $query_text
-            RETURN 'property' as type, p.uri as uri, p.name as name, p.definition as description
-            LIMIT $limit
-            """
-            prop_results = kg.execute_query(query, {"query_text": query_text, "limit": limit})
-            for record in prop_results:
-                results.append(SearchResult(
-                    result_type=record["type"],
-                    uri=record["uri"],
-                    name=record["name"],
-                    description=record.get("description")
-                ))
+            result_types = list(SEARCH_TARGETS)
         
+        # Each bucket is an independent round-trip, so run them concurrently
+        buckets = await asyncio.gather(*(
+            _search_bucket(kg, result_type, search_query, limit)
+            for result_type in result_types
+            if result_type in SEARCH_TARGETS
+        ))
+        results = [result for bucket in buckets for result in bucket]
+        
+        # Rank the merged buckets by full-text relevance
+        results.sort(key=lambda r: r.score or 0.0, reverse=True)
         return results[:limit]
     
     @strawberry.field
-    def graph_stats(self) -> GraphStats:
+    async def graph_stats(self) -> GraphStats:
         """Get knowledge graph statistics"""
         kg = get_kg_schema()
         
@@ -625,7 +927,7 @@ class Query:
         MATCH ()-[r]->()
         RETURN nodeCount, count(r) as relCount
         """
-        result = kg.execute_query(query, {})
+        result = await kg.execute_query_async(query, {})
         total_nodes = result[0]["nodeCount"] if result else 0
         total_rels = result[0]["relCount"] if result else 0
         
@@ -638,7 +940,7 @@ class Query:
         MATCH (seg:PointCloudSegment) WITH dictCount, classCount, propCount, ifcCount, count(seg) as segCount
         RETURN dictCount, classCount, propCount, ifcCount, segCount
         """
-        result = kg.execute_query(query, {})
+        result = await kg.execute_query_async(query, {})
         
         if result:
             counts = result[0]
@@ -671,6 +973,80 @@ class Query:
         )
 
 
+# ============================================================================
+# Write Coalescing
+# ============================================================================
+
+class WriteCoalescer:
+    """
+    Collects single-link writes from concurrent mutations into batched writes
+    
+    Each submit() waits until its item has been written. Items arriving within
+    ``window`` seconds of the first pending one (or until ``max_batch`` items
+    are pending) share one UNWIND transaction instead of one each.
+    """
+    
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict[str, Any]]], Any],
+        window: float = 0.01,
+        max_batch: int = 500
+    ):
+        self._write_batch = write_batch
+        self._window = window
+        self._max_batch = max_batch
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._writes: Set[asyncio.Task] = set()  # strong refs until each write finishes
+    
+    async def submit(self, item: Dict[str, Any]) -> None:
+        """Queue one item and wait for the batch containing it to commit"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        
+        await future
+    
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._write(batch))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+    
+    async def _write(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            await self._write_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+
+@cache
+def get_ifc_link_writer() -> WriteCoalescer:
+    """Coalescer for linkIfcToBsdd mutations"""
+    return WriteCoalescer(get_kg_schema().link_ifc_elements_to_bsdd_async)
+
+
+@cache
+def get_segment_link_writer() -> WriteCoalescer:
+    """Coalescer for linkSegmentToBsdd mutations"""
+    return WriteCoalescer(get_kg_schema().link_pointcloud_segments_to_bsdd_async)
+
+
 # ============================================================================
 # GraphQL Mutations
 # ============================================================================
@@ -680,30 +1056,36 @@ class Mutation:
     """GraphQL Mutation Root"""
     
     @strawberry.mutation
-    def link_ifc_to_bsdd(
+    async def link_ifc_to_bsdd(
         self,
         ifc_global_id: str,
         bsdd_class_uri: str
     ) -> bool:
         """Create a mapping between an IFC element and a bSDD class"""
-        kg = get_kg_schema()
         try:
-            kg.link_ifc_element_to_bsdd(ifc_global_id, bsdd_class_uri)
+            await get_ifc_link_writer().submit({
+                "source_id": _intern_id(ifc_global_id),
+                "bsdd_class_uri": _intern_id(bsdd_class_uri),
+                "confidence": 1.0
+            })
             return True
         except Exception as e:
             logger.error(f"Failed to link IFC to bSDD: {e}")
             return False
     
     @strawberry.mutation
-    def link_segment_to_bsdd(
+    async def link_segment_to_bsdd(
         self,
         segment_id: str,
         bsdd_class_uri: str
     ) -> bool:
         """Create a mapping between a point cloud segment and a bSDD class"""
-        kg = get_kg_schema()
         try:
-            kg.link_pointcloud_segment_to_bsdd(segment_id, bsdd_class_uri)
+            await get_segment_link_writer().submit({
+                "source_id": _intern_id(segment_id),
+                "bsdd_class_uri": _intern_id(bsdd_class_uri),
+                "confidence": 0.8
+            })
             return True
         except Exception as e:
             logger.error(f"Failed to link segment to bSDD: {e}")
@@ -716,10 +1098,18 @@ class Mutation:
 
 schema = strawberry.Schema(query=Query, mutation=Mutation)
 
+class ORJSONGraphQLRouter(GraphQLRouter):
+    """GraphQL router that encodes responses with orjson instead of stdlib json"""
+    
+    def encode_json(self, data: Any) -> str:
+        return orjson.dumps(data).decode()
+
+
 # Create GraphQL router for FastAPI
-graphql_router = GraphQLRouter(
+graphql_router = ORJSONGraphQLRouter(
     schema,
     path="/api/graphql",
+    context_getter=get_context,
     graphiql=True  # Enable GraphiQL UI
 )
 
@@ -3,13 +3,25 @@ Knowledge Graph API Routes for BIMTwinOps
 Provides REST endpoints for bSDD integration, GenAI queries, and knowledge graph operations
 """
 import os
+import json
+import hashlib
+import asyncio
 import logging
-from typing import List, Dict, Optional, Any
-from fastapi import APIRouter, HTTPException, Query, Body
-from pydantic import BaseModel, Field
+import threading
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List, Dict, Optional, Any, Tuple
+import orjson
+from fastapi import APIRouter, Body, Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from cachetools import LRUCache, cached
+from cachetools.func import ttl_cache
+from pydantic import BaseModel, ConfigDict, Field
+from neo4j import READ_ACCESS, WRITE_ACCESS
 from dotenv import load_dotenv
 
-from .bsdd_client import BSDDClient, BSDDEnvironment
+from .bsdd_client import BSDDClient, BSDDClass, BSDDEnvironment
 from .knowledge_graph_schema import KnowledgeGraphSchema
 from .genai_service import BIMTwinOpsGenAI
 
@@ -20,52 +32,110 @@ logger = logging.getLogger(__name__)
 # Initialize router
 router = APIRouter(prefix="/api/kg", tags=["Knowledge Graph"])
 
-# Initialize clients (singleton pattern)
-_bsdd_client = None
-_kg_schema = None
-_genai_service = None
-
-
-def get_bsdd_client() -> BSDDClient:
-    """Get or create bSDD client singleton"""
-    global _bsdd_client
-    if _bsdd_client is None:
-        _bsdd_client = BSDDClient(environment=BSDDEnvironment.PRODUCTION)
-    return _bsdd_client
-
-
-def get_kg_schema() -> KnowledgeGraphSchema:
-    """Get or create knowledge graph schema singleton"""
-    global _kg_schema
-    if _kg_schema is None:
-        neo4j_password = os.getenv("NEO4J_PASSWORD")
-        if not neo4j_password:
-            raise HTTPException(
-                status_code=500,
-                detail="NEO4J_PASSWORD environment variable is required"
-            )
-        _kg_schema = KnowledgeGraphSchema(
-            neo4j_uri=os.getenv("NEO4J_URI", "bolt://localhost:7687"),
-            neo4j_user=os.getenv("NEO4J_USER", "neo4j"),
-            neo4j_password=neo4j_password
-        )
-    return _kg_schema
+# How long bSDD dictionary listings (and lookups derived from them) are reused
+BSDD_DICTIONARY_TTL = float(os.getenv("BSDD_DICTIONARY_TTL", "3600"))
 
+# Keep-alive connections to bSDD shared by concurrent requests
+BSDD_MAX_CONNECTIONS = int(os.getenv("BSDD_MAX_CONNECTIONS", "100"))
 
-def get_genai_service() -> BIMTwinOpsGenAI:
-    """Get or create GenAI service singleton"""
-    global _genai_service
-    if _genai_service is None:
-        azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        
-        if not azure_endpoint or not azure_api_key:
-            raise HTTPException(
-                status_code=500,
-                detail="Azure OpenAI credentials not configured"
-            )
-        
-        _genai_service = BIMTwinOpsGenAI(
+# Browser/proxy cache lifetime for bSDD class details (immutable per dictionary version)
+BSDD_CLASS_MAX_AGE = int(os.getenv("BSDD_CLASS_MAX_AGE", "86400"))
+
+# Upper bound in seconds on each backend probe made by /health
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+
+
+class AdmissionController:
+    """
+    Caps concurrent calls into one slow backend; the limit can be resized live
+    
+    Long LLM calls or expensive Cypher would otherwise pile up and hold every
+    worker thread / pooled connection, starving unrelated endpoints. Waiters
+    queue on a Condition (not a Semaphore) so a raised limit admits them at once.
+    """
+    
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self._limit = limit
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+    
+    @property
+    def limit(self) -> int:
+        return self._limit
+    
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+    
+    async def resize(self, limit: int) -> None:
+        """Change the slot budget, waking waiters if it grew"""
+        async with self._condition:
+            self._limit = limit
+            self._condition.notify_all()
+    
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one in-flight slot for the duration of the block"""
+        async with self._condition:
+            while self._in_flight >= self._limit:
+                await self._condition.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+
+def load_cypher_queries(path: Path) -> Dict[str, str]:
+    """Load the named Cypher queries that /graph/cypher is allowed to run"""
+    with open(path, encoding="utf-8") as f:
+        queries = json.load(f)
+    logger.info(f"Loaded {len(queries)} named Cypher queries from {path}")
+    return queries
+
+
+# Named queries are fixed strings, so Neo4j's plan cache (keyed by query text)
+# hits on every call; arbitrary Cypher must be enabled explicitly
+CYPHER_QUERIES = load_cypher_queries(
+    Path(os.getenv("KG_QUERIES_FILE", Path(__file__).with_name("kg_queries.json")))
+)
+ALLOW_ADHOC_CYPHER = os.getenv("KG_ALLOW_ADHOC_CYPHER", "false").lower() in ("1", "true", "yes")
+
+genai_admission = AdmissionController("genai", int(os.getenv("GENAI_MAX_INFLIGHT", "8")))
+neo4j_admission = AdmissionController("neo4j", int(os.getenv("NEO4J_MAX_INFLIGHT", "32")))
+
+# Clients are created once by the app lifespan (open_clients) and kept on
+# app.state; routes receive them through the get_* dependencies below.
+
+def _create_kg_schema() -> Optional[KnowledgeGraphSchema]:
+    neo4j_password = os.getenv("NEO4J_PASSWORD")
+    if not neo4j_password:
+        logger.warning("NEO4J_PASSWORD not set - knowledge graph endpoints are disabled")
+        return None
+    return KnowledgeGraphSchema(
+        neo4j_uri=os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+        neo4j_user=os.getenv("NEO4J_USER", "neo4j"),
+        neo4j_password=neo4j_password,
+        max_connection_pool_size=int(os.getenv("NEO4J_MAX_POOL_SIZE", "100")),
+        connection_acquisition_timeout=float(os.getenv("NEO4J_ACQUIRE_TIMEOUT", "60")),
+        max_connection_lifetime=float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600")),
+        max_transaction_retry_time=float(os.getenv("NEO4J_MAX_RETRY_TIME", "30"))
+    )
+
+
+def _create_genai_service() -> Optional[BIMTwinOpsGenAI]:
+    azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+    azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
+    
+    if not azure_endpoint or not azure_api_key:
+        logger.warning("Azure OpenAI credentials not configured - GenAI endpoints are disabled")
+        return None
+    
+    try:
+        return BIMTwinOpsGenAI(
             azure_endpoint=azure_endpoint,
             azure_api_key=azure_api_key,
             deployment_name=os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o"),
@@ -73,22 +143,165 @@ def get_genai_service() -> BIMTwinOpsGenAI:
             neo4j_user=os.getenv("NEO4J_USER", "neo4j"),
             neo4j_password=os.getenv("NEO4J_PASSWORD")  # Required - validated by BIMTwinOpsGenAI
         )
-    return _genai_service
+    except Exception as e:
+        logger.error(f"Failed to initialize GenAI service: {e}")
+        return None
+
+
+def open_clients(app: FastAPI) -> None:
+    """Create the knowledge graph route clients and store them on app.state"""
+    app.state.bsdd_client = BSDDClient(
+        environment=BSDDEnvironment.PRODUCTION,
+        dictionary_ttl=BSDD_DICTIONARY_TTL,
+        max_connections=BSDD_MAX_CONNECTIONS
+    )
+    app.state.kg_schema = _create_kg_schema()
+    app.state.genai_service = _create_genai_service()
+
+
+async def close_clients(app: FastAPI) -> None:
+    """Close the drivers opened by open_clients"""
+    kg = app.state.kg_schema
+    if kg is not None:
+        kg.close()
+        await kg.close_async()
+    if app.state.genai_service is not None:
+        app.state.genai_service.close()
+
+
+def get_bsdd_client(request: Request) -> BSDDClient:
+    """bSDD client dependency"""
+    return request.app.state.bsdd_client
+
+
+def get_kg_schema(request: Request) -> KnowledgeGraphSchema:
+    """Knowledge graph schema dependency"""
+    kg = request.app.state.kg_schema
+    if kg is None:
+        raise HTTPException(
+            status_code=500,
+            detail="NEO4J_PASSWORD environment variable is required"
+        )
+    return kg
+
+
+def get_genai_service(request: Request) -> BIMTwinOpsGenAI:
+    """GenAI service dependency"""
+    genai = request.app.state.genai_service
+    if genai is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Azure OpenAI credentials not configured"
+        )
+    return genai
+
+
+@ttl_cache(maxsize=1, ttl=BSDD_DICTIONARY_TTL)
+def get_dictionary_index(client: BSDDClient) -> Dict[Tuple[str, str], str]:
+    """
+    bSDD dictionary URIs keyed by (lowercased name, version)
+    
+    Rebuilt only when the dictionary list itself is refetched, so per-request
+    lookups are a dict probe instead of a scan with per-entry lowercasing.
+    """
+    return {(d.name.lower(), d.version): d.uri for d in client.get_dictionaries()}
+
+
+def get_ifc_dictionary_uri(client: BSDDClient) -> str:
+    """URI of the IFC 4.3 dictionary, the default target for class searches"""
+    index = get_dictionary_index(client)
+    uri = index.get(("ifc", "4.3"))
+    if uri is None:
+        # Fall back to the looser match for names like "IFC 4.3 (ADD2)"
+        uri = next(
+            (uri for (name, version), uri in index.items() if "ifc" in name and "4.3" in version),
+            None
+        )
+    if uri is None:
+        raise HTTPException(status_code=404, detail="IFC dictionary not found")
+    return uri
+
+
+@cached(LRUCache(maxsize=10000), lock=threading.Lock())
+def get_class_details_cached(
+    client: BSDDClient,
+    dictionary_uri: str,
+    class_uri: str,
+    include_properties: bool,
+    include_relations: bool
+) -> BSDDClass:
+    """
+    bSDD class details, memoized per (dictionary, class, includes)
+    
+    Class URIs are versioned and a released dictionary version does not
+    change, so entries never need to expire; the LRU bound caps memory.
+    """
+    return client.get_class_details(
+        dictionary_uri=dictionary_uri,
+        class_uri=class_uri,
+        include_properties=include_properties,
+        include_relations=include_relations
+    )
+
+
+@cached(LRUCache(maxsize=1024), lock=threading.Lock())
+def search_classes_cached(
+    client: BSDDClient,
+    dictionary_uri: str,
+    search_text: Optional[str],
+    related_ifc_entity: Optional[str],
+    language_code: str
+) -> List[BSDDClass]:
+    """bSDD class search results, memoized per distinct search"""
+    return client.search_classes(
+        dictionary_uri=dictionary_uri,
+        search_text=search_text,
+        related_ifc_entity=related_ifc_entity,
+        language_code=language_code
+    )
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag (quoted hex digest) over the given parts"""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 carrying the validators the client should keep"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
 
 
 # Request/Response Models
-class SemanticSearchRequest(BaseModel):
+class RequestModel(BaseModel):
+    """
+    Base for request bodies: immutable once validated, unknown keys dropped
+    and surrounding whitespace stripped from strings during validation
+    """
+    model_config = ConfigDict(frozen=True, extra="ignore", str_strip_whitespace=True)
+
+
+class SemanticSearchRequest(RequestModel):
     query: str = Field(..., description="Natural language search query")
     context_type: str = Field("all", description="Context type: bsdd, ifc, pointcloud, all")
     limit: int = Field(10, ge=1, le=100, description="Maximum results")
 
 
-class PropertyRecommendationRequest(BaseModel):
+class PropertyRecommendationRequest(RequestModel):
     element_type: str = Field(..., description="Building element type (e.g., IfcWall)")
     context: Optional[Dict[str, Any]] = Field(None, description="Additional context")
 
 
-class ClassificationSuggestionRequest(BaseModel):
+class ClassificationSuggestionRequest(RequestModel):
     element_description: str = Field(..., description="Element description")
     available_systems: Optional[List[str]] = Field(
         None,
@@ -96,7 +309,7 @@ class ClassificationSuggestionRequest(BaseModel):
     )
 
 
-class ChatRequest(BaseModel):
+class ChatRequest(RequestModel):
     message: str = Field(..., description="User message")
     conversation_history: Optional[List[Dict[str, str]]] = Field(
         None,
@@ -104,84 +317,113 @@ class ChatRequest(BaseModel):
     )
 
 
-class BSDDSearchRequest(BaseModel):
+class AdmissionConfigRequest(RequestModel):
+    genai_max_inflight: Optional[int] = Field(None, ge=1, description="Concurrent GenAI calls")
+    neo4j_max_inflight: Optional[int] = Field(None, ge=1, description="Concurrent Neo4j queries")
+
+
+class BSDDSearchRequest(RequestModel):
     dictionary_uri: Optional[str] = Field(None, description="Specific dictionary URI")
     search_text: Optional[str] = Field(None, description="Search text")
     related_ifc_entity: Optional[str] = Field(None, description="IFC entity filter")
     language_code: str = Field("en-GB", description="Language code")
 
 
+class DictionaryOut(BaseModel):
+    """bSDD dictionary as returned by the API (read straight from BSDDDictionary)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    uri: str
+    name: str
+    version: str
+    organization_code: str = Field(serialization_alias="organizationCode")
+    status: str
+    language_code: str = Field(serialization_alias="languageCode")
+    license: Optional[str] = None
+    release_date: Optional[str] = Field(None, serialization_alias="releaseDate")
+    more_info_url: Optional[str] = Field(None, serialization_alias="moreInfoUrl")
+
+
+class DictionaryListOut(BaseModel):
+    count: int
+    dictionaries: List[DictionaryOut]
+
+
+class ClassSummaryOut(BaseModel):
+    """bSDD class search hit (read straight from BSDDClass)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    uri: str
+    code: str
+    name: str
+    definition: Optional[str] = None
+    class_type: Optional[str] = Field(None, serialization_alias="classType")
+    related_ifc_entities: List[str] = Field(serialization_alias="relatedIfcEntities")
+    synonyms: List[str]
+
+
+class ClassSearchOut(BaseModel):
+    count: int
+    dictionary_uri: str
+    classes: List[ClassSummaryOut]
+
+
 # bSDD Endpoints
-@router.get("/bsdd/dictionaries")
-async def get_bsdd_dictionaries():
+# Response models let FastAPI serialize the client's dataclasses directly to
+# JSON bytes with pydantic-core instead of rebuilding each row as a dict
+@router.get("/bsdd/dictionaries", response_model=DictionaryListOut)
+async def get_bsdd_dictionaries(
+    request: Request,
+    response: Response,
+    client: BSDDClient = Depends(get_bsdd_client)
+):
     """Get all available bSDD dictionaries"""
     try:
-        client = get_bsdd_client()
-        dictionaries = client.get_dictionaries()
+        dictionaries = await run_in_threadpool(client.get_dictionaries)
+        
+        # The listing changes only when bSDD publishes or retires a dictionary version
+        etag = make_etag(*(f"{d.uri}:{d.version}:{d.status}" for d in dictionaries))
+        cache_control = f"public, max-age={int(BSDD_DICTIONARY_TTL)}"
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
         
         return {
             "count": len(dictionaries),
-            "dictionaries": [
-                {
-                    "uri": d.uri,
-                    "name": d.name,
-                    "version": d.version,
-                    "organizationCode": d.organization_code,
-                    "status": d.status,
-                    "languageCode": d.language_code,
-                    "license": d.license,
-                    "releaseDate": d.release_date,
-                    "moreInfoUrl": d.more_info_url
-                }
-                for d in dictionaries
-            ]
+            "dictionaries": dictionaries
         }
     except Exception as e:
         logger.error(f"Failed to get dictionaries: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/bsdd/search")
-async def search_bsdd_classes(request: BSDDSearchRequest):
+@router.post("/bsdd/search", response_model=ClassSearchOut)
+async def search_bsdd_classes(
+    request: BSDDSearchRequest,
+    client: BSDDClient = Depends(get_bsdd_client)
+):
     """Search for bSDD classes"""
     try:
-        client = get_bsdd_client()
-        
         if not request.dictionary_uri:
             # Get IFC dictionary by default
-            dictionaries = client.get_dictionaries()
-            ifc_dict = next(
-                (d for d in dictionaries if "ifc" in d.name.lower() and "4.3" in d.version),
-                None
-            )
-            if not ifc_dict:
-                raise HTTPException(status_code=404, detail="IFC dictionary not found")
-            dictionary_uri = ifc_dict.uri
+            dictionary_uri = await run_in_threadpool(get_ifc_dictionary_uri, client)
         else:
             dictionary_uri = request.dictionary_uri
         
-        classes = client.search_classes(
-            dictionary_uri=dictionary_uri,
-            search_text=request.search_text,
-            related_ifc_entity=request.related_ifc_entity,
-            language_code=request.language_code
+        classes = await run_in_threadpool(
+            search_classes_cached,
+            client,
+            dictionary_uri,
+            request.search_text,
+            request.related_ifc_entity,
+            request.language_code
         )
         
         return {
             "count": len(classes),
             "dictionary_uri": dictionary_uri,
-            "classes": [
-                {
-                    "uri": c.uri,
-                    "code": c.code,
-                    "name": c.name,
-                    "definition": c.definition,
-                    "classType": c.class_type,
-                    "relatedIfcEntities": c.related_ifc_entities,
-                    "synonyms": c.synonyms
-                }
-                for c in classes
-            ]
+            "classes": classes
         }
     except Exception as e:
         logger.error(f"bSDD search failed: {e}")
@@ -190,22 +432,34 @@ async def search_bsdd_classes(request: BSDDSearchRequest):
 
 @router.get("/bsdd/class/{class_uri:path}")
 async def get_bsdd_class_details(
+    request: Request,
+    response: Response,
     class_uri: str,
     dictionary_uri: str = Query(..., description="Dictionary URI"),
     include_properties: bool = Query(True, description="Include properties"),
-    include_relations: bool = Query(True, description="Include relations")
+    include_relations: bool = Query(True, description="Include relations"),
+    client: BSDDClient = Depends(get_bsdd_client)
 ):
     """Get detailed information about a bSDD class"""
+    # Dictionary URIs are versioned and released versions are immutable, so the
+    # ETag follows from the request alone and repeat clients never reach bSDD
+    etag = make_etag(dictionary_uri, class_uri, include_properties, include_relations)
+    cache_control = f"public, max-age={BSDD_CLASS_MAX_AGE}"
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    
     try:
-        client = get_bsdd_client()
-        
-        bsdd_class = client.get_class_details(
-            dictionary_uri=dictionary_uri,
-            class_uri=class_uri,
-            include_properties=include_properties,
-            include_relations=include_relations
+        bsdd_class = await run_in_threadpool(
+            get_class_details_cached,
+            client,
+            dictionary_uri,
+            class_uri,
+            include_properties,
+            include_relations
         )
         
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
         return {
             "uri": bsdd_class.uri,
             "code": bsdd_class.code,
@@ -224,11 +478,10 @@ async def get_bsdd_class_details(
 
 
 @router.get("/bsdd/ifc-mappings/{ifc_entity}")
-async def get_ifc_bsdd_mappings(ifc_entity: str):
+async def get_ifc_bsdd_mappings(ifc_entity: str, client: BSDDClient = Depends(get_bsdd_client)):
     """Get bSDD classes mapped to an IFC entity"""
     try:
-        client = get_bsdd_client()
-        mappings = client.get_ifc_mappings(ifc_entity)
+        mappings = await run_in_threadpool(client.get_ifc_mappings, ifc_entity)
         
         return {
             "ifcEntity": ifc_entity,
@@ -251,18 +504,22 @@ async def get_ifc_bsdd_mappings(ifc_entity: str):
 
 # GenAI Endpoints
 @router.post("/ai/semantic-search")
-async def semantic_search(request: SemanticSearchRequest):
+async def semantic_search(
+    request: SemanticSearchRequest,
+    genai: BIMTwinOpsGenAI = Depends(get_genai_service)
+):
     """
     Perform semantic search across knowledge graph using GenAI
     Returns relevant results with AI-generated summaries
     """
     try:
-        genai = get_genai_service()
-        results = genai.semantic_search(
-            query=request.query,
-            context_type=request.context_type,
-            limit=request.limit
-        )
+        async with genai_admission.slot():
+            results = await run_in_threadpool(
+                genai.semantic_search,
+                query=request.query,
+                context_type=request.context_type,
+                limit=request.limit
+            )
         
         return {
             "query": request.query,
@@ -274,17 +531,21 @@ async def semantic_search(request: SemanticSearchRequest):
 
 
 @router.post("/ai/recommend-properties")
-async def recommend_properties(request: PropertyRecommendationRequest):
+async def recommend_properties(
+    request: PropertyRecommendationRequest,
+    genai: BIMTwinOpsGenAI = Depends(get_genai_service)
+):
     """
     Get AI-powered property recommendations for a building element
     Returns standardized properties from bSDD with rationale
     """
     try:
-        genai = get_genai_service()
-        properties = genai.recommend_properties(
-            element_type=request.element_type,
-            context=request.context
-        )
+        async with genai_admission.slot():
+            properties = await run_in_threadpool(
+                genai.recommend_properties,
+                element_type=request.element_type,
+                context=request.context
+            )
         
         return {
             "elementType": request.element_type,
@@ -297,17 +558,21 @@ async def recommend_properties(request: PropertyRecommendationRequest):
 
 
 @router.post("/ai/suggest-classifications")
-async def suggest_classifications(request: ClassificationSuggestionRequest):
+async def suggest_classifications(
+    request: ClassificationSuggestionRequest,
+    genai: BIMTwinOpsGenAI = Depends(get_genai_service)
+):
     """
     Get AI-powered classification suggestions for an element
     Returns appropriate classifications with confidence scores
     """
     try:
-        genai = get_genai_service()
-        classifications = genai.suggest_classifications(
-            element_description=request.element_description,
-            available_systems=request.available_systems
-        )
+        async with genai_admission.slot():
+            classifications = await run_in_threadpool(
+                genai.suggest_classifications,
+                element_description=request.element_description,
+                available_systems=request.available_systems
+            )
         
         return {
             "description": request.element_description,
@@ -320,17 +585,21 @@ async def suggest_classifications(request: ClassificationSuggestionRequest):
 
 
 @router.post("/ai/chat")
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    genai: BIMTwinOpsGenAI = Depends(get_genai_service)
+):
     """
     Natural language chat interface for knowledge graph
     Provides conversational access to building data and standards
     """
     try:
-        genai = get_genai_service()
-        response = genai.chat(
-            message=request.message,
-            conversation_history=request.conversation_history
-        )
+        async with genai_admission.slot():
+            response = await run_in_threadpool(
+                genai.chat,
+                message=request.message,
+                conversation_history=request.conversation_history
+            )
         
         return {
             "message": request.message,
@@ -343,11 +612,11 @@ async def chat(request: ChatRequest):
 
 # Knowledge Graph Query Endpoints
 @router.get("/graph/stats")
-async def get_graph_stats():
+async def get_graph_stats(kg: KnowledgeGraphSchema = Depends(get_kg_schema)):
     """Get statistics about the knowledge graph"""
     try:
-        kg = get_kg_schema()
-        stats = kg.get_schema_info()
+        async with neo4j_admission.slot():
+            stats = await kg.get_schema_info_async()
         
         return {
             "nodes": stats.get("nodes", []),
@@ -358,23 +627,60 @@ async def get_graph_stats():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/graph/queries")
+async def list_cypher_queries():
+    """List the named Cypher queries accepted by /graph/cypher"""
+    return {
+        "queries": CYPHER_QUERIES,
+        "adhocEnabled": ALLOW_ADHOC_CYPHER
+    }
+
+
+def _resolve_cypher(query_name: Optional[str], query: Optional[str]) -> str:
+    """Look up a named query, or vet raw Cypher against KG_ALLOW_ADHOC_CYPHER"""
+    if query_name is not None:
+        if query_name not in CYPHER_QUERIES:
+            raise HTTPException(status_code=404, detail=f"Unknown query: {query_name}")
+        return CYPHER_QUERIES[query_name]
+    if query is None:
+        raise HTTPException(status_code=422, detail="Either query_name or query is required")
+    if not ALLOW_ADHOC_CYPHER:
+        raise HTTPException(
+            status_code=403,
+            detail="Ad-hoc Cypher is disabled; use a named query from /graph/queries"
+        )
+    return query
+
+
+def _cypher_access_mode(query_name: Optional[str]) -> str:
+    """Named registry queries are reads; admin ad-hoc Cypher may also write"""
+    return READ_ACCESS if query_name is not None else WRITE_ACCESS
+
+
 @router.post("/graph/cypher")
 async def execute_cypher(
-    query: str = Body(..., embed=True),
-    parameters: Optional[Dict[str, Any]] = Body(None, embed=True)
+    query_name: Optional[str] = Body(None, embed=True),
+    query: Optional[str] = Body(None, embed=True),
+    parameters: Optional[Dict[str, Any]] = Body(None, embed=True),
+    kg: KnowledgeGraphSchema = Depends(get_kg_schema)
 ):
     """
-    Execute a custom Cypher query (admin only - add auth in production)
-    For advanced users to directly query the knowledge graph
+    Execute a named Cypher query from the registry with the given parameters
+    Raw Cypher via ``query`` is only accepted when KG_ALLOW_ADHOC_CYPHER is set
+    (admin only - add auth in production)
     """
+    query = _resolve_cypher(query_name, query)
+    
     try:
-        kg = get_kg_schema()
-        
-        with kg.driver.session() as session:
-            result = session.run(query, parameters or {})
-            data = result.data()
+        async with neo4j_admission.slot():
+            data = await kg.execute_query_async(
+                query,
+                parameters or {},
+                access_mode=_cypher_access_mode(query_name)
+            )
         
         return {
+            "query_name": query_name,
             "query": query,
             "parameters": parameters,
             "result_count": len(data),
@@ -385,36 +691,113 @@ async def execute_cypher(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# Health check
-@router.get("/health")
-async def health_check():
-    """Check health of knowledge graph services"""
-    health = {
-        "bsdd_client": "unknown",
-        "neo4j": "unknown",
-        "genai": "unknown"
-    }
-    
-    try:
-        client = get_bsdd_client()
-        client.get_dictionaries()
-        health["bsdd_client"] = "healthy"
-    except Exception as e:
-        health["bsdd_client"] = f"error: {str(e)}"
+@router.post("/graph/cypher/stream")
+async def stream_cypher(
+    query_name: Optional[str] = Body(None, embed=True),
+    query: Optional[str] = Body(None, embed=True),
+    parameters: Optional[Dict[str, Any]] = Body(None, embed=True),
+    kg: KnowledgeGraphSchema = Depends(get_kg_schema)
+):
+    """
+    Execute a Cypher query like /graph/cypher, streaming rows as Server-Sent Events
+    Each row is sent as a ``record`` event as soon as Neo4j produces it, followed
+    by a ``complete`` event with the row count (or an ``error`` event)
+    """
+    query = _resolve_cypher(query_name, query)
     
-    try:
-        kg = get_kg_schema()
-        with kg.driver.session() as session:
-            session.run("RETURN 1")
-        health["neo4j"] = "healthy"
-    except Exception as e:
-        health["neo4j"] = f"error: {str(e)}"
+    async def event_generator():
+        count = 0
+        try:
+            async with neo4j_admission.slot():
+                async for row in kg.stream_query_async(
+                    query,
+                    parameters or {},
+                    access_mode=_cypher_access_mode(query_name)
+                ):
+                    count += 1
+                    yield b"event: record\ndata: " + orjson.dumps(row, default=str) + b"\n\n"
+            yield b"event: complete\ndata: " + orjson.dumps({"result_count": count}) + b"\n\n"
+        except Exception as e:
+            logger.error(f"Cypher stream failed: {e}")
+            yield b"event: error\ndata: " + orjson.dumps({"error": str(e)}) + b"\n\n"
     
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Admission control
+def _admission_config() -> Dict[str, Any]:
+    return {
+        controller.name: {"maxInflight": controller.limit, "inflight": controller.in_flight}
+        for controller in (genai_admission, neo4j_admission)
+    }
+
+
+@router.get("/config")
+async def get_admission_config():
+    """Get the in-flight limits for GenAI and Neo4j calls"""
+    return _admission_config()
+
+
+@router.put("/config")
+async def update_admission_config(request: AdmissionConfigRequest):
+    """Resize the in-flight limits at runtime (admin only - add auth in production)"""
+    if request.genai_max_inflight is not None:
+        await genai_admission.resize(request.genai_max_inflight)
+    if request.neo4j_max_inflight is not None:
+        await neo4j_admission.resize(request.neo4j_max_inflight)
+    return _admission_config()
+
+
+# Health check
+async def _probe_bsdd(http_request: Request) -> None:
+    """bSDD API reachable"""
+    client = get_bsdd_client(http_request)
+    if not await run_in_threadpool(client.ping, HEALTH_PROBE_TIMEOUT):
+        raise RuntimeError("bSDD API unreachable")
+
+
+async def _probe_neo4j(http_request: Request) -> None:
+    """Neo4j answers a trivial query"""
+    kg = get_kg_schema(http_request)
+    await kg.execute_query_async("RETURN 1", {})
+
+
+async def _probe_genai(http_request: Request) -> None:
+    """Azure OpenAI service configured"""
+    get_genai_service(http_request)
+
+
+HEALTH_PROBES = {
+    "bsdd_client": _probe_bsdd,
+    "neo4j": _probe_neo4j,
+    "genai": _probe_genai
+}
+
+
+async def _run_probe(probe, http_request: Request) -> str:
+    """Run one health probe, bounded by HEALTH_PROBE_TIMEOUT"""
     try:
-        genai = get_genai_service()
-        health["genai"] = "healthy"
+        await asyncio.wait_for(probe(http_request), timeout=HEALTH_PROBE_TIMEOUT)
+        return "healthy"
+    except asyncio.TimeoutError:
+        return f"error: timed out after {HEALTH_PROBE_TIMEOUT:g}s"
     except Exception as e:
-        health["genai"] = f"error: {str(e)}"
+        return f"error: {str(e)}"
+
+
+@router.get("/health")
+async def health_check(http_request: Request):
+    """Check health of knowledge graph services"""
+    # Probes run concurrently so one slow backend bounds the response time
+    # instead of adding to it
+    statuses = await asyncio.gather(
+        *(_run_probe(probe, http_request) for probe in HEALTH_PROBES.values())
+    )
+    health = dict(zip(HEALTH_PROBES, statuses))
     
     all_healthy = all(status == "healthy" for status in health.values())
     
@@ -2,170 +2,116 @@
 Knowledge Graph Schema for BIMTwinOps
 Defines Neo4j node types, relationships, and constraints for bSDD integration
 """
-from typing import Dict, List, Any
-from neo4j import GraphDatabase
+import re
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, Final, Iterator, List, Mapping, Optional, Set, Tuple, Any
+from neo4j import GraphDatabase, AsyncGraphDatabase, READ_ACCESS
+from neo4j.exceptions import ClientError
+from cachetools import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class KnowledgeGraphSchema:
-    """
-    Defines and manages the knowledge graph schema for BIMTwinOps
-    Integrates IFC models, point cloud semantics, and bSDD standardization
+# Node labels and relationship types as plain module constants: query
+# templates interpolate these directly instead of looking them up in the
+# NODE_LABELS / RELATIONSHIPS dicts, which remain for introspection
+
+# Node Labels: Building Model Nodes
+IFC_ELEMENT_LABEL: Final = "IfcElement"
+IFC_SPACE_LABEL: Final = "IfcSpace"
+IFC_BUILDING_LABEL: Final = "IfcBuilding"
+IFC_STOREY_LABEL: Final = "IfcStorey"
+
+# Point Cloud Nodes
+POINT_CLOUD_SEGMENT_LABEL: Final = "PointCloudSegment"
+SEMANTIC_CLASS_LABEL: Final = "SemanticClass"
+
+# bSDD Standard Nodes
+BSDD_DICTIONARY_LABEL: Final = "BsddDictionary"
+BSDD_CLASS_LABEL: Final = "BsddClass"
+BSDD_PROPERTY_LABEL: Final = "BsddProperty"
+BSDD_UNIT_LABEL: Final = "BsddUnit"
+BSDD_ALLOWED_VALUE_LABEL: Final = "BsddAllowedValue"
+
+# Property and Relationship Nodes
+PROPERTY_LABEL: Final = "Property"
+CLASSIFICATION_LABEL: Final = "Classification"
+MATERIAL_LABEL: Final = "Material"
+
+# Relationship Types: Spatial Relationships
+CONTAINS_REL: Final = "CONTAINS"
+LOCATED_IN_REL: Final = "LOCATED_IN"
+CONNECTED_TO_REL: Final = "CONNECTED_TO"
+NEAR_REL: Final = "NEAR"
+
+# Classification Relationships
+HAS_CLASSIFICATION_REL: Final = "HAS_CLASSIFICATION"
+CLASSIFIED_AS_REL: Final = "CLASSIFIED_AS"
+IS_SUBCLASS_OF_REL: Final = "IS_SUBCLASS_OF"
+IS_PARENT_OF_REL: Final = "IS_PARENT_OF"
+
+# Property Relationships
+HAS_PROPERTY_REL: Final = "HAS_PROPERTY"
+PROPERTY_OF_REL: Final = "PROPERTY_OF"
+HAS_ALLOWED_VALUE_REL: Final = "HAS_ALLOWED_VALUE"
+HAS_UNIT_REL: Final = "HAS_UNIT"
+
+# bSDD Relationships
+MAPS_TO_BSDD_REL: Final = "MAPS_TO_BSDD"
+IFC_ENTITY_MAPPING_REL: Final = "IFC_ENTITY_MAPPING"
+RELATED_TO_REL: Final = "RELATED_TO"
+EQUIVALENT_TO_REL: Final = "EQUIVALENT_TO"
+
+# Point Cloud Relationships
+SEGMENT_OF_REL: Final = "SEGMENT_OF"
+HAS_SEMANTIC_LABEL_REL: Final = "HAS_SEMANTIC_LABEL"
+CORRESPONDS_TO_REL: Final = "CORRESPONDS_TO"
+
+# Dictionary Organization
+IN_DICTIONARY_REL: Final = "IN_DICTIONARY"
+VERSION_OF_REL: Final = "VERSION_OF"
+
+# bSDD class relation types and the relationship each is stored as; anything
+# not listed becomes RELATED_TO
+BSDD_RELATION_MAP: Final[Mapping[str, str]] = MappingProxyType({
+    "IsParentOf": IS_PARENT_OF_REL,
+    "IsChildOf": IS_SUBCLASS_OF_REL,
+    "IsEqualTo": EQUIVALENT_TO_REL,
+    "IsSimilarTo": RELATED_TO_REL,
+    "HasReference": RELATED_TO_REL
+})
+
+
+class BsddWriteMixin:
     """
+    bSDD and mapping write helpers shared by KnowledgeGraphSchema and BulkWriter
     
-    # Node Labels
-    NODE_LABELS = {
-        # Building Model Nodes
-        "IFC_ELEMENT": "IfcElement",
-        "IFC_SPACE": "IfcSpace",
-        "IFC_BUILDING": "IfcBuilding",
-        "IFC_STOREY": "IfcStorey",
-        
-        # Point Cloud Nodes
-        "POINT_CLOUD_SEGMENT": "PointCloudSegment",
-        "SEMANTIC_CLASS": "SemanticClass",
-        
-        # bSDD Standard Nodes
-        "BSDD_DICTIONARY": "BsddDictionary",
-        "BSDD_CLASS": "BsddClass",
-        "BSDD_PROPERTY": "BsddProperty",
-        "BSDD_UNIT": "BsddUnit",
-        "BSDD_ALLOWED_VALUE": "BsddAllowedValue",
-        
-        # Property and Relationship Nodes
-        "PROPERTY": "Property",
-        "CLASSIFICATION": "Classification",
-        "MATERIAL": "Material"
-    }
-    
-    # Relationship Types
-    RELATIONSHIPS = {
-        # Spatial Relationships
-        "CONTAINS": "CONTAINS",
-        "LOCATED_IN": "LOCATED_IN",
-        "CONNECTED_TO": "CONNECTED_TO",
-        "NEAR": "NEAR",
-        
-        # Classification Relationships
-        "HAS_CLASSIFICATION": "HAS_CLASSIFICATION",
-        "CLASSIFIED_AS": "CLASSIFIED_AS",
-        "IS_SUBCLASS_OF": "IS_SUBCLASS_OF",
-        "IS_PARENT_OF": "IS_PARENT_OF",
-        
-        # Property Relationships
-        "HAS_PROPERTY": "HAS_PROPERTY",
-        "PROPERTY_OF": "PROPERTY_OF",
-        "HAS_ALLOWED_VALUE": "HAS_ALLOWED_VALUE",
-        "HAS_UNIT": "HAS_UNIT",
-        
-        # bSDD Relationships
-        "MAPS_TO_BSDD": "MAPS_TO_BSDD",
-        "IFC_ENTITY_MAPPING": "IFC_ENTITY_MAPPING",
-        "RELATED_TO": "RELATED_TO",
-        "EQUIVALENT_TO": "EQUIVALENT_TO",
-        
-        # Point Cloud Relationships
-        "SEGMENT_OF": "SEGMENT_OF",
-        "HAS_SEMANTIC_LABEL": "HAS_SEMANTIC_LABEL",
-        "CORRESPONDS_TO": "CORRESPONDS_TO",
-        
-        # Dictionary Organization
-        "IN_DICTIONARY": "IN_DICTIONARY",
-        "VERSION_OF": "VERSION_OF"
-    }
-    
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
-        """Initialize connection to Neo4j database"""
-        self.driver = GraphDatabase.driver(
-            neo4j_uri,
-            auth=(neo4j_user, neo4j_password)
-        )
-    
-    def close(self):
-        """Close Neo4j driver connection"""
-        self.driver.close()
+    Every helper goes through self._write, so the schema runs each write in
+    its own managed transaction while a BulkWriter runs it in its open one.
+    Subclasses provide _write, apoc_merge_available and invalidate_schema_info.
+    """
     
-    def execute_query(self, query: str, parameters: Dict[str, Any]) -> List[Dict]:
-        """
-        Execute a Cypher query and return results
-        Helper method for GraphQL resolvers
-        """
-        with self.driver.session() as session:
-            result = session.run(query, parameters)
-            return [record.data() for record in result]
+    def _write(self, query: str, parameters: Dict[str, Any]):
+        raise NotImplementedError
     
-    def create_schema(self):
-        """Create all constraints and indexes for the knowledge graph"""
-        with self.driver.session() as session:
-            # Create constraints for unique identifiers
-            constraints = [
-                # IFC Elements
-                f"CREATE CONSTRAINT ifc_element_guid IF NOT EXISTS "
-                f"FOR (e:{self.NODE_LABELS['IFC_ELEMENT']}) REQUIRE e.globalId IS UNIQUE",
-                
-                # Point Cloud Segments
-                f"CREATE CONSTRAINT pc_segment_id IF NOT EXISTS "
-                f"FOR (s:{self.NODE_LABELS['POINT_CLOUD_SEGMENT']}) REQUIRE s.segmentId IS UNIQUE",
-                
-                # bSDD Nodes
-                f"CREATE CONSTRAINT bsdd_dict_uri IF NOT EXISTS "
-                f"FOR (d:{self.NODE_LABELS['BSDD_DICTIONARY']}) REQUIRE d.uri IS UNIQUE",
-                
-                f"CREATE CONSTRAINT bsdd_class_uri IF NOT EXISTS "
-                f"FOR (c:{self.NODE_LABELS['BSDD_CLASS']}) REQUIRE c.uri IS UNIQUE",
-                
-                f"CREATE CONSTRAINT bsdd_property_uri IF NOT EXISTS "
-                f"FOR (p:{self.NODE_LABELS['BSDD_PROPERTY']}) REQUIRE p.uri IS UNIQUE",
-                
-                # Semantic Classes
-                f"CREATE CONSTRAINT semantic_class_label IF NOT EXISTS "
-                f"FOR (sc:{self.NODE_LABELS['SEMANTIC_CLASS']}) REQUIRE sc.label IS UNIQUE"
-            ]
-            
-            for constraint in constraints:
-                try:
-                    session.run(constraint)
-                    logger.info(f"Created constraint: {constraint[:50]}...")
-                except Exception as e:
-                    logger.warning(f"Constraint may already exist: {e}")
-            
-            # Create indexes for common queries
-            indexes = [
-                # Text search indexes
-                f"CREATE INDEX ifc_element_name IF NOT EXISTS "
-                f"FOR (e:{self.NODE_LABELS['IFC_ELEMENT']}) ON (e.name)",
-                
-                f"CREATE INDEX bsdd_class_name IF NOT EXISTS "
-                f"FOR (c:{self.NODE_LABELS['BSDD_CLASS']}) ON (c.name)",
-                
-                f"CREATE INDEX bsdd_class_code IF NOT EXISTS "
-                f"FOR (c:{self.NODE_LABELS['BSDD_CLASS']}) ON (c.code)",
-                
-                f"CREATE INDEX bsdd_property_name IF NOT EXISTS "
-                f"FOR (p:{self.NODE_LABELS['BSDD_PROPERTY']}) ON (p.name)",
-                
-                # Lookup indexes
-                f"CREATE INDEX ifc_element_type IF NOT EXISTS "
-                f"FOR (e:{self.NODE_LABELS['IFC_ELEMENT']}) ON (e.ifcType)",
-                
-                f"CREATE INDEX bsdd_dict_org IF NOT EXISTS "
-                f"FOR (d:{self.NODE_LABELS['BSDD_DICTIONARY']}) ON (d.organizationCode)",
-                
-                f"CREATE INDEX semantic_class_id IF NOT EXISTS "
-                f"FOR (sc:{self.NODE_LABELS['SEMANTIC_CLASS']}) ON (sc.classId)"
-            ]
-            
-            for index in indexes:
-                try:
-                    session.run(index)
-                    logger.info(f"Created index: {index[:50]}...")
-                except Exception as e:
-                    logger.warning(f"Index may already exist: {e}")
+    # Write statements are rendered once at import rather than per call; the
+    # identical text each time also keeps Neo4j's query-plan cache warm.
+    # MERGE_* statements return nothing (upserts); CREATE_* ones read back
+    # only the node's identifying fields instead of the whole node.
+    MERGE_DICTIONARY_QUERY = f"""
+    MERGE (d:{BSDD_DICTIONARY_LABEL} {{uri: $uri}})
+    SET d += $props,
+        d.lastUpdated = coalesce($last_updated, timestamp())
+    """
+    CREATE_DICTIONARY_QUERY = MERGE_DICTIONARY_QUERY + "RETURN d {.uri, .name, .version}"
     
-    def create_bsdd_dictionary_node(
-        self,
+    @staticmethod
+    def _dictionary_params(
         uri: str,
         name: str,
         version: str,
@@ -173,109 +119,143 @@ class KnowledgeGraphSchema:
         status: str,
         language_code: str,
         **kwargs
-    ) -> Dict:
-        """Create a bSDD Dictionary node"""
-        query = f"""
-        MERGE (d:{self.NODE_LABELS['BSDD_DICTIONARY']} {{uri: $uri}})
-        SET d.name = $name,
-            d.version = $version,
-            d.organizationCode = $organization_code,
-            d.status = $status,
-            d.languageCode = $language_code,
-            d.license = $license,
-            d.releaseDate = $release_date,
-            d.moreInfoUrl = $more_info_url,
-            d.lastUpdated = timestamp()
-        RETURN d
-        """
-        
-        with self.driver.session() as session:
-            result = session.run(query, {
-                "uri": uri,
+    ) -> Dict[str, Any]:
+        return {
+            "uri": uri,
+            "last_updated": kwargs.get("last_updated"),
+            "props": {
                 "name": name,
                 "version": version,
-                "organization_code": organization_code,
+                "organizationCode": organization_code,
                 "status": status,
-                "language_code": language_code,
+                "languageCode": language_code,
                 "license": kwargs.get("license"),
-                "release_date": kwargs.get("release_date"),
-                "more_info_url": kwargs.get("more_info_url")
-            })
-            return result.single()[0]
+                "releaseDate": kwargs.get("release_date"),
+                "moreInfoUrl": kwargs.get("more_info_url")
+            }
+        }
     
-    def create_bsdd_class_node(
+    def create_bsdd_dictionary_node(
         self,
+        uri: str,
+        name: str,
+        version: str,
+        organization_code: str,
+        status: str,
+        language_code: str,
+        **kwargs
+    ) -> Dict:
+        """Create a bSDD Dictionary node and return its uri, name and version"""
+        return self._write(self.CREATE_DICTIONARY_QUERY, self._dictionary_params(
+            uri, name, version, organization_code, status, language_code, **kwargs
+        ))[0]
+    
+    def upsert_bsdd_dictionary_node(self, *args, **kwargs) -> None:
+        """Create or update a bSDD Dictionary node without reading it back (same arguments as create)"""
+        self._write(self.MERGE_DICTIONARY_QUERY, self._dictionary_params(*args, **kwargs))
+    
+    MERGE_CLASS_QUERY = f"""
+    MATCH (d:{BSDD_DICTIONARY_LABEL} {{uri: $dictionary_uri}})
+    MERGE (c:{BSDD_CLASS_LABEL} {{uri: $uri}})
+    SET c += $props,
+        c.lastUpdated = coalesce($last_updated, timestamp())
+    MERGE (c)-[:{IN_DICTIONARY_REL}]->(d)
+    """
+    CREATE_CLASS_QUERY = MERGE_CLASS_QUERY + "RETURN c {.uri, .code, .name}"
+    
+    @staticmethod
+    def _class_params(
         uri: str,
         code: str,
         name: str,
         dictionary_uri: str,
         **kwargs
-    ) -> Dict:
-        """Create a bSDD Class node and link to dictionary"""
-        query = f"""
-        MATCH (d:{self.NODE_LABELS['BSDD_DICTIONARY']} {{uri: $dictionary_uri}})
-        MERGE (c:{self.NODE_LABELS['BSDD_CLASS']} {{uri: $uri}})
-        SET c.code = $code,
-            c.name = $name,
-            c.definition = $definition,
-            c.classType = $class_type,
-            c.synonyms = $synonyms,
-            c.relatedIfcEntities = $related_ifc_entities,
-            c.lastUpdated = timestamp()
-        MERGE (c)-[:{self.RELATIONSHIPS['IN_DICTIONARY']}]->(d)
-        RETURN c
-        """
-        
-        with self.driver.session() as session:
-            result = session.run(query, {
-                "uri": uri,
+    ) -> Dict[str, Any]:
+        return {
+            "uri": uri,
+            "dictionary_uri": dictionary_uri,
+            "last_updated": kwargs.get("last_updated"),
+            "props": {
                 "code": code,
                 "name": name,
-                "dictionary_uri": dictionary_uri,
+                "dictionaryUri": dictionary_uri,
                 "definition": kwargs.get("definition"),
-                "class_type": kwargs.get("class_type"),
-                "synonyms": kwargs.get("synonyms", []),
-                "related_ifc_entities": kwargs.get("related_ifc_entities", [])
-            })
-            return result.single()[0]
+                "classType": kwargs.get("class_type"),
+                "synonyms": kwargs.get("synonyms") or [],
+                "relatedIfcEntities": kwargs.get("related_ifc_entities") or []
+            }
+        }
     
-    def create_bsdd_property_node(
+    def create_bsdd_class_node(
         self,
         uri: str,
         code: str,
         name: str,
+        dictionary_uri: str,
         **kwargs
     ) -> Dict:
-        """Create a bSDD Property node"""
-        query = f"""
-        MERGE (p:{self.NODE_LABELS['BSDD_PROPERTY']} {{uri: $uri}})
-        SET p.code = $code,
-            p.name = $name,
-            p.definition = $definition,
-            p.dataType = $data_type,
-            p.units = $units,
-            p.physicalQuantity = $physical_quantity,
-            p.dimension = $dimension,
-            p.pattern = $pattern,
-            p.isRequired = $is_required,
-            p.lastUpdated = timestamp()
-        RETURN p
-        """
-        
-        with self.driver.session() as session:
-            result = session.run(query, {
-                "uri": uri,
+        """Create a bSDD Class node, link it to its dictionary and return its uri, code and name"""
+        return self._write(self.CREATE_CLASS_QUERY, self._class_params(
+            uri, code, name, dictionary_uri, **kwargs
+        ))[0]
+    
+    def upsert_bsdd_class_node(self, *args, **kwargs) -> None:
+        """Create or update a bSDD Class node linked to its dictionary, without reading it back"""
+        self._write(self.MERGE_CLASS_QUERY, self._class_params(*args, **kwargs))
+    
+    MERGE_PROPERTY_QUERY = f"""
+    MERGE (p:{BSDD_PROPERTY_LABEL} {{uri: $uri}})
+    SET p += $props,
+        p.lastUpdated = coalesce($last_updated, timestamp())
+    """
+    CREATE_PROPERTY_QUERY = MERGE_PROPERTY_QUERY + "RETURN p {.uri, .code, .name}"
+    
+    @staticmethod
+    def _property_params(
+        uri: str,
+        code: str,
+        name: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        return {
+            "uri": uri,
+            "last_updated": kwargs.get("last_updated"),
+            "props": {
                 "code": code,
                 "name": name,
                 "definition": kwargs.get("definition"),
-                "data_type": kwargs.get("data_type"),
-                "units": kwargs.get("units", []),
-                "physical_quantity": kwargs.get("physical_quantity"),
+                "dataType": kwargs.get("data_type"),
+                "units": kwargs.get("units") or [],
+                "physicalQuantity": kwargs.get("physical_quantity"),
                 "dimension": kwargs.get("dimension"),
                 "pattern": kwargs.get("pattern"),
-                "is_required": kwargs.get("is_required", False)
-            })
-            return result.single()[0]
+                "isRequired": kwargs.get("is_required", False)
+            }
+        }
+    
+    def create_bsdd_property_node(
+        self,
+        uri: str,
+        code: str,
+        name: str,
+        **kwargs
+    ) -> Dict:
+        """Create a bSDD Property node and return its uri, code and name"""
+        return self._write(self.CREATE_PROPERTY_QUERY, self._property_params(
+            uri, code, name, **kwargs
+        ))[0]
+    
+    def upsert_bsdd_property_node(self, *args, **kwargs) -> None:
+        """Create or update a bSDD Property node without reading it back (same arguments as create)"""
+        self._write(self.MERGE_PROPERTY_QUERY, self._property_params(*args, **kwargs))
+    
+    LINK_CLASS_PROPERTY_QUERY = f"""
+    MATCH (c:{BSDD_CLASS_LABEL} {{uri: $class_uri}})
+    MATCH (p:{BSDD_PROPERTY_LABEL} {{uri: $property_uri}})
+    MERGE (c)-[r:{HAS_PROPERTY_REL}]->(p)
+    SET r.propertySet = $property_set,
+        r.isRequired = $is_required
+    """
     
     def link_class_to_property(
         self,
@@ -285,22 +265,36 @@ class KnowledgeGraphSchema:
         is_required: bool = False
     ):
         """Create HAS_PROPERTY relationship between class and property"""
-        query = f"""
-        MATCH (c:{self.NODE_LABELS['BSDD_CLASS']} {{uri: $class_uri}})
-        MATCH (p:{self.NODE_LABELS['BSDD_PROPERTY']} {{uri: $property_uri}})
-        MERGE (c)-[r:{self.RELATIONSHIPS['HAS_PROPERTY']}]->(p)
-        SET r.propertySet = $property_set,
-            r.isRequired = $is_required
-        RETURN r
+        self._write(self.LINK_CLASS_PROPERTY_QUERY, {
+            "class_uri": class_uri,
+            "property_uri": property_uri,
+            "property_set": property_set,
+            "is_required": is_required
+        })
+    
+    # With APOC the relationship type is a parameter, so every bSDD relation
+    # type shares one cached plan instead of compiling its own
+    CLASS_RELATIONSHIP_QUERY = f"""
+    MATCH (c1:{BSDD_CLASS_LABEL} {{uri: $from_uri}})
+    MATCH (c2:{BSDD_CLASS_LABEL} {{uri: $to_uri}})
+    CALL apoc.merge.relationship(
+        c1, $rel_type, {{}}, {{relationType: $relation_type}},
+        c2, {{relationType: $relation_type}}
+    ) YIELD rel
+    RETURN count(rel)
+    """
+    
+    # Without APOC: the same statement with each stored type inlined, built
+    # once here rather than formatted on every call
+    CLASS_RELATIONSHIP_TYPED_QUERIES: Final[Mapping[str, str]] = MappingProxyType({
+        relationship: f"""
+        MATCH (c1:{BSDD_CLASS_LABEL} {{uri: $from_uri}})
+        MATCH (c2:{BSDD_CLASS_LABEL} {{uri: $to_uri}})
+        MERGE (c1)-[r:{relationship}]->(c2)
+        SET r.relationType = $relation_type
         """
-        
-        with self.driver.session() as session:
-            session.run(query, {
-                "class_uri": class_uri,
-                "property_uri": property_uri,
-                "property_set": property_set,
-                "is_required": is_required
-            })
+        for relationship in set(BSDD_RELATION_MAP.values())
+    })
     
     def create_class_relationship(
         self,
@@ -309,31 +303,25 @@ class KnowledgeGraphSchema:
         relation_type: str
     ):
         """Create relationship between two bSDD classes"""
-        # Map bSDD relation types to our schema
-        relation_mapping = {
-            "IsParentOf": self.RELATIONSHIPS['IS_PARENT_OF'],
-            "IsChildOf": self.RELATIONSHIPS['IS_SUBCLASS_OF'],
-            "IsEqualTo": self.RELATIONSHIPS['EQUIVALENT_TO'],
-            "IsSimilarTo": self.RELATIONSHIPS['RELATED_TO'],
-            "HasReference": self.RELATIONSHIPS['RELATED_TO']
+        relationship = BSDD_RELATION_MAP.get(relation_type, RELATED_TO_REL)
+        params = {
+            "from_uri": from_class_uri,
+            "to_uri": to_class_uri,
+            "relation_type": relation_type
         }
         
-        relationship = relation_mapping.get(relation_type, self.RELATIONSHIPS['RELATED_TO'])
-        
-        query = f"""
-        MATCH (c1:{self.NODE_LABELS['BSDD_CLASS']} {{uri: $from_uri}})
-        MATCH (c2:{self.NODE_LABELS['BSDD_CLASS']} {{uri: $to_uri}})
-        MERGE (c1)-[r:{relationship}]->(c2)
-        SET r.relationType = $relation_type
-        RETURN r
-        """
-        
-        with self.driver.session() as session:
-            session.run(query, {
-                "from_uri": from_class_uri,
-                "to_uri": to_class_uri,
-                "relation_type": relation_type
-            })
+        if self.apoc_merge_available():
+            self._write(self.CLASS_RELATIONSHIP_QUERY, {**params, "rel_type": relationship})
+        else:
+            self._write(self.CLASS_RELATIONSHIP_TYPED_QUERIES[relationship], params)
+    
+    LINK_IFC_ELEMENT_QUERY = f"""
+    MATCH (ifc:{IFC_ELEMENT_LABEL} {{globalId: $ifc_global_id}})
+    MATCH (bsdd:{BSDD_CLASS_LABEL} {{uri: $bsdd_class_uri}})
+    MERGE (ifc)-[r:{MAPS_TO_BSDD_REL}]->(bsdd)
+    SET r.confidence = $confidence,
+        r.createdAt = timestamp()
+    """
     
     def link_ifc_element_to_bsdd(
         self,
@@ -342,21 +330,20 @@ class KnowledgeGraphSchema:
         confidence: float = 1.0
     ):
         """Create mapping between IFC element and bSDD class"""
-        query = f"""
-        MATCH (ifc:{self.NODE_LABELS['IFC_ELEMENT']} {{globalId: $ifc_global_id}})
-        MATCH (bsdd:{self.NODE_LABELS['BSDD_CLASS']} {{uri: $bsdd_class_uri}})
-        MERGE (ifc)-[r:{self.RELATIONSHIPS['MAPS_TO_BSDD']}]->(bsdd)
-        SET r.confidence = $confidence,
-            r.createdAt = timestamp()
-        RETURN r
-        """
-        
-        with self.driver.session() as session:
-            session.run(query, {
-                "ifc_global_id": ifc_global_id,
-                "bsdd_class_uri": bsdd_class_uri,
-                "confidence": confidence
-            })
+        self._write(self.LINK_IFC_ELEMENT_QUERY, {
+            "ifc_global_id": ifc_global_id,
+            "bsdd_class_uri": bsdd_class_uri,
+            "confidence": confidence
+        })
+        self.invalidate_schema_info()
+    
+    LINK_SEGMENT_QUERY = f"""
+    MATCH (seg:{POINT_CLOUD_SEGMENT_LABEL} {{segmentId: $segment_id}})
+    MATCH (bsdd:{BSDD_CLASS_LABEL} {{uri: $bsdd_class_uri}})
+    MERGE (seg)-[r:{MAPS_TO_BSDD_REL}]->(bsdd)
+    SET r.confidence = $confidence,
+        r.createdAt = timestamp()
+    """
     
     def link_pointcloud_segment_to_bsdd(
         self,
@@ -365,43 +352,873 @@ class KnowledgeGraphSchema:
         confidence: float = 0.8
     ):
         """Create mapping between point cloud segment and bSDD class"""
-        query = f"""
-        MATCH (seg:{self.NODE_LABELS['POINT_CLOUD_SEGMENT']} {{segmentId: $segment_id}})
-        MATCH (bsdd:{self.NODE_LABELS['BSDD_CLASS']} {{uri: $bsdd_class_uri}})
-        MERGE (seg)-[r:{self.RELATIONSHIPS['MAPS_TO_BSDD']}]->(bsdd)
-        SET r.confidence = $confidence,
-            r.createdAt = timestamp()
-        RETURN r
+        self._write(self.LINK_SEGMENT_QUERY, {
+            "segment_id": segment_id,
+            "bsdd_class_uri": bsdd_class_uri,
+            "confidence": confidence
+        })
+        self.invalidate_schema_info()
+    
+    # Rows shipped per UNWIND statement by the *_bulk writers
+    UNWIND_BATCH_SIZE = 1000
+    
+    def _write_rows(self, query: str, rows: List[Dict[str, Any]], **parameters) -> int:
         """
+        Run an UNWIND $rows write in chunks and return the summed RETURN count
         
-        with self.driver.session() as session:
-            session.run(query, {
-                "segment_id": segment_id,
-                "bsdd_class_uri": bsdd_class_uri,
-                "confidence": confidence
+        The write time is taken once here and passed as $now, so every row of
+        the call carries the same timestamp without a timestamp() per row.
+        Extra keyword arguments are passed as parameters to every chunk.
+        """
+        now = int(time.time() * 1000)
+        written = 0
+        for start in range(0, len(rows), self.UNWIND_BATCH_SIZE):
+            record = self._write(query, {
+                **parameters,
+                "rows": rows[start:start + self.UNWIND_BATCH_SIZE],
+                "now": now
             })
+            written += record[0] if record else 0
+        return written
     
-    def get_schema_info(self) -> Dict:
-        """Get information about the current schema"""
+    # The dictionary is matched once and carried into the UNWIND, rather than
+    # looked up again for every class row
+    MERGE_CLASSES_QUERY = f"""
+    MATCH (d:{BSDD_DICTIONARY_LABEL} {{uri: $dictionary_uri}})
+    UNWIND $rows AS row
+    MERGE (c:{BSDD_CLASS_LABEL} {{uri: row.uri}})
+    SET c += row.props,
+        c.lastUpdated = coalesce(row.last_updated, $now)
+    MERGE (c)-[:{IN_DICTIONARY_REL}]->(d)
+    RETURN count(c) AS written
+    """
+    
+    def create_bsdd_classes_bulk(self, classes: List[Dict[str, Any]]) -> int:
+        """
+        Create many bSDD Class nodes and link each to its dictionary
+        
+        Each item takes the create_bsdd_class_node arguments as keys (uri,
+        code, name, dictionary_uri, definition, class_type, synonyms,
+        related_ifc_entities). Returns the number of classes written.
+        """
+        by_dictionary: Dict[str, List[Dict[str, Any]]] = {}
+        for cls in classes:
+            row = self._class_params(**cls)
+            by_dictionary.setdefault(row["dictionary_uri"], []).append(row)
+        return sum(
+            self._write_rows(self.MERGE_CLASSES_QUERY, rows, dictionary_uri=dictionary_uri)
+            for dictionary_uri, rows in by_dictionary.items()
+        )
+    
+    MERGE_PROPERTIES_QUERY = f"""
+    UNWIND $rows AS row
+    MERGE (p:{BSDD_PROPERTY_LABEL} {{uri: row.uri}})
+    SET p += row.props,
+        p.lastUpdated = coalesce(row.last_updated, $now)
+    RETURN count(p) AS written
+    """
+    
+    def create_bsdd_properties_bulk(self, properties: List[Dict[str, Any]]) -> int:
+        """
+        Create many bSDD Property nodes
+        
+        Each item takes the create_bsdd_property_node arguments as keys.
+        Returns the number of properties written.
+        """
+        rows = [self._property_params(**prop) for prop in properties]
+        return self._write_rows(self.MERGE_PROPERTIES_QUERY, rows)
+    
+    LINK_CLASSES_PROPERTIES_QUERY = f"""
+    UNWIND $rows AS row
+    MATCH (c:{BSDD_CLASS_LABEL} {{uri: row.class_uri}})
+    MATCH (p:{BSDD_PROPERTY_LABEL} {{uri: row.property_uri}})
+    MERGE (c)-[r:{HAS_PROPERTY_REL}]->(p)
+    SET r.propertySet = row.property_set,
+        r.isRequired = row.is_required
+    RETURN count(r) AS written
+    """
+    
+    def link_classes_to_properties_bulk(self, links: List[Dict[str, Any]]) -> int:
+        """
+        Create many HAS_PROPERTY relationships
+        
+        Each link is ``{"class_uri", "property_uri", "property_set", "is_required"}``.
+        Returns the number of relationships written.
+        """
+        rows = [
+            {
+                "class_uri": link["class_uri"],
+                "property_uri": link["property_uri"],
+                "property_set": link.get("property_set"),
+                "is_required": link.get("is_required", False)
+            }
+            for link in links
+        ]
+        return self._write_rows(self.LINK_CLASSES_PROPERTIES_QUERY, rows)
+    
+    # One UNWIND statement per stored relationship type, since Cypher cannot
+    # take the type of a MERGEd relationship as a parameter
+    CLASS_RELATIONSHIPS_QUERIES: Final[Mapping[str, str]] = MappingProxyType({
+        relationship: f"""
+        UNWIND $rows AS row
+        MATCH (c1:{BSDD_CLASS_LABEL} {{uri: row.from_uri}})
+        MATCH (c2:{BSDD_CLASS_LABEL} {{uri: row.to_uri}})
+        MERGE (c1)-[r:{relationship}]->(c2)
+        SET r.relationType = row.relation_type
+        RETURN count(r) AS written
+        """
+        for relationship in set(BSDD_RELATION_MAP.values())
+    })
+    
+    def create_class_relationships_bulk(self, relations: List[Dict[str, Any]]) -> int:
+        """
+        Create many relationships between bSDD classes
+        
+        Each relation is ``{"from_class_uri", "to_class_uri", "relation_type"}``.
+        Relations are grouped by stored relationship type, so at most one
+        write per type is issued. Returns the number of relationships written.
+        """
+        by_relationship: Dict[str, List[Dict[str, Any]]] = {}
+        for relation in relations:
+            relationship = BSDD_RELATION_MAP.get(relation["relation_type"], RELATED_TO_REL)
+            by_relationship.setdefault(relationship, []).append({
+                "from_uri": relation["from_class_uri"],
+                "to_uri": relation["to_class_uri"],
+                "relation_type": relation["relation_type"]
+            })
+        return sum(
+            self._write_rows(self.CLASS_RELATIONSHIPS_QUERIES[relationship], rows)
+            for relationship, rows in by_relationship.items()
+        )
+    
+    def import_dictionary(
+        self,
+        dictionary_uri: str,
+        classes: List[Dict[str, Any]],
+        properties: Optional[List[Dict[str, Any]]] = None,
+        property_links: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, int]:
+        """
+        Bulk-write the classes of one (existing) dictionary, then their
+        properties and HAS_PROPERTY links
+        
+        Items take the keys of create_bsdd_classes_bulk,
+        create_bsdd_properties_bulk and link_classes_to_properties_bulk;
+        dictionary_uri is filled in for every class. Returns the counts written.
+        """
+        return {
+            "classes": self.create_bsdd_classes_bulk(
+                [{**cls, "dictionary_uri": dictionary_uri} for cls in classes]
+            ),
+            "properties": self.create_bsdd_properties_bulk(properties or []),
+            "property_links": self.link_classes_to_properties_bulk(property_links or [])
+        }
+    
+    # One MATCH per endpoint on the uniquely-constrained key (globalId /
+    # segmentId / uri), so each row resolves through index seeks
+    LINK_IFC_ELEMENTS_QUERY = f"""
+    UNWIND $rows AS row
+    MATCH (src:{IFC_ELEMENT_LABEL} {{globalId: row.source_id}})
+    MATCH (bsdd:{BSDD_CLASS_LABEL} {{uri: row.bsdd_class_uri}})
+    MERGE (src)-[r:{MAPS_TO_BSDD_REL}]->(bsdd)
+    SET r.confidence = row.confidence,
+        r.createdAt = $now
+    RETURN count(r) AS written
+    """
+    
+    LINK_SEGMENTS_QUERY = f"""
+    UNWIND $rows AS row
+    MATCH (src:{POINT_CLOUD_SEGMENT_LABEL} {{segmentId: row.source_id}})
+    MATCH (bsdd:{BSDD_CLASS_LABEL} {{uri: row.bsdd_class_uri}})
+    MERGE (src)-[r:{MAPS_TO_BSDD_REL}]->(bsdd)
+    SET r.confidence = row.confidence,
+        r.createdAt = $now
+    RETURN count(r) AS written
+    """
+    
+    def link_ifc_elements_to_bsdd_bulk(self, links: List[Dict[str, Any]]) -> int:
+        """
+        Create many IFC element -> bSDD class mappings
+        
+        Each link is ``{"source_id": globalId, "bsdd_class_uri": ..., "confidence": ...}``
+        (confidence defaults to 1.0). Returns the number of mappings written.
+        """
+        rows = [
+            {
+                "source_id": link["source_id"],
+                "bsdd_class_uri": link["bsdd_class_uri"],
+                "confidence": link.get("confidence", 1.0)
+            }
+            for link in links
+        ]
+        written = self._write_rows(self.LINK_IFC_ELEMENTS_QUERY, rows)
+        self.invalidate_schema_info()
+        return written
+    
+    def link_pointcloud_segments_to_bsdd_bulk(self, links: List[Dict[str, Any]]) -> int:
+        """
+        Create many point cloud segment -> bSDD class mappings
+        
+        Each link is ``{"source_id": segmentId, "bsdd_class_uri": ..., "confidence": ...}``
+        (confidence defaults to 0.8). Returns the number of mappings written.
+        """
+        rows = [
+            {
+                "source_id": link["source_id"],
+                "bsdd_class_uri": link["bsdd_class_uri"],
+                "confidence": link.get("confidence", 0.8)
+            }
+            for link in links
+        ]
+        written = self._write_rows(self.LINK_SEGMENTS_QUERY, rows)
+        self.invalidate_schema_info()
+        return written
+
+
+class KnowledgeGraphSchema(BsddWriteMixin):
+    """
+    Defines and manages the knowledge graph schema for BIMTwinOps
+    Integrates IFC models, point cloud semantics, and bSDD standardization
+    """
+    
+    # Node Labels
+    NODE_LABELS = {
+        # Building Model Nodes
+        "IFC_ELEMENT": IFC_ELEMENT_LABEL,
+        "IFC_SPACE": IFC_SPACE_LABEL,
+        "IFC_BUILDING": IFC_BUILDING_LABEL,
+        "IFC_STOREY": IFC_STOREY_LABEL,
+        
+        # Point Cloud Nodes
+        "POINT_CLOUD_SEGMENT": POINT_CLOUD_SEGMENT_LABEL,
+        "SEMANTIC_CLASS": SEMANTIC_CLASS_LABEL,
+        
+        # bSDD Standard Nodes
+        "BSDD_DICTIONARY": BSDD_DICTIONARY_LABEL,
+        "BSDD_CLASS": BSDD_CLASS_LABEL,
+        "BSDD_PROPERTY": BSDD_PROPERTY_LABEL,
+        "BSDD_UNIT": BSDD_UNIT_LABEL,
+        "BSDD_ALLOWED_VALUE": BSDD_ALLOWED_VALUE_LABEL,
+        
+        # Property and Relationship Nodes
+        "PROPERTY": PROPERTY_LABEL,
+        "CLASSIFICATION": CLASSIFICATION_LABEL,
+        "MATERIAL": MATERIAL_LABEL
+    }
+    
+    # Relationship Types
+    RELATIONSHIPS = {
+        # Spatial Relationships
+        "CONTAINS": CONTAINS_REL,
+        "LOCATED_IN": LOCATED_IN_REL,
+        "CONNECTED_TO": CONNECTED_TO_REL,
+        "NEAR": NEAR_REL,
+        
+        # Classification Relationships
+        "HAS_CLASSIFICATION": HAS_CLASSIFICATION_REL,
+        "CLASSIFIED_AS": CLASSIFIED_AS_REL,
+        "IS_SUBCLASS_OF": IS_SUBCLASS_OF_REL,
+        "IS_PARENT_OF": IS_PARENT_OF_REL,
+        
+        # Property Relationships
+        "HAS_PROPERTY": HAS_PROPERTY_REL,
+        "PROPERTY_OF": PROPERTY_OF_REL,
+        "HAS_ALLOWED_VALUE": HAS_ALLOWED_VALUE_REL,
+        "HAS_UNIT": HAS_UNIT_REL,
+        
+        # bSDD Relationships
+        "MAPS_TO_BSDD": MAPS_TO_BSDD_REL,
+        "IFC_ENTITY_MAPPING": IFC_ENTITY_MAPPING_REL,
+        "RELATED_TO": RELATED_TO_REL,
+        "EQUIVALENT_TO": EQUIVALENT_TO_REL,
+        
+        # Point Cloud Relationships
+        "SEGMENT_OF": SEGMENT_OF_REL,
+        "HAS_SEMANTIC_LABEL": HAS_SEMANTIC_LABEL_REL,
+        "CORRESPONDS_TO": CORRESPONDS_TO_REL,
+        
+        # Dictionary Organization
+        "IN_DICTIONARY": IN_DICTIONARY_REL,
+        "VERSION_OF": VERSION_OF_REL
+    }
+    
+    # Full-text (Lucene) index names used for text search
+    FULLTEXT_INDEXES = {
+        "BSDD_CLASS": "bsdd_class_text",
+        "BSDD_PROPERTY": "bsdd_property_text",
+        "IFC_ELEMENT": "ifc_element_text",
+        "POINT_CLOUD_SEGMENT": "pc_segment_text"
+    }
+    
+    def __init__(
+        self,
+        neo4j_uri: str,
+        neo4j_user: str,
+        neo4j_password: str,
+        max_connection_pool_size: int = 100,
+        connection_acquisition_timeout: float = 60.0,
+        max_connection_lifetime: float = 3600.0,
+        max_transaction_retry_time: float = 30.0,
+        keep_alive: bool = True,
+        schema_info_ttl: float = 30.0
+    ):
+        """
+        Initialize connection to Neo4j database
+        
+        Pool settings are shared by the sync and async drivers. Connections
+        older than ``max_connection_lifetime`` seconds are recycled so firewalls
+        and load balancers don't silently drop idle ones, and managed
+        transactions retry transient failures for up to
+        ``max_transaction_retry_time`` seconds.
+        """
+        self._neo4j_uri = neo4j_uri
+        self._neo4j_auth = (neo4j_user, neo4j_password)
+        self._pool_config = {
+            "max_connection_pool_size": max_connection_pool_size,
+            "connection_acquisition_timeout": connection_acquisition_timeout,
+            "max_connection_lifetime": max_connection_lifetime,
+            "max_transaction_retry_time": max_transaction_retry_time,
+            "keep_alive": keep_alive
+        }
+        self._async_driver = None
+        # get_schema_info can be costly (a full scan without APOC); dashboards
+        # poll it, so the answer is reused briefly and dropped when this
+        # instance writes links
+        self._schema_info_cache = TTLCache(maxsize=1, ttl=schema_info_ttl)
+        self._schema_info_lock = threading.Lock()
+        self._use_meta_stats = True
+        # Probed on first use by create_class_relationship
+        self._use_apoc_merge: Optional[bool] = None
+        self.driver = GraphDatabase.driver(
+            neo4j_uri,
+            auth=self._neo4j_auth,
+            **self._pool_config
+        )
+        logger.info(
+            f"Neo4j pool: max_connection_pool_size={max_connection_pool_size}, "
+            f"connection_acquisition_timeout={connection_acquisition_timeout}s, "
+            f"max_connection_lifetime={max_connection_lifetime}s"
+        )
+    
+    @property
+    def async_driver(self):
+        """Async Neo4j driver, created on first use from inside the event loop"""
+        if self._async_driver is None:
+            self._async_driver = AsyncGraphDatabase.driver(
+                self._neo4j_uri,
+                auth=self._neo4j_auth,
+                **self._pool_config
+            )
+        return self._async_driver
+    
+    def close(self):
+        """Close Neo4j driver connection"""
+        self.driver.close()
+    
+    async def close_async(self):
+        """Close the async Neo4j driver connection, if one was opened"""
+        if self._async_driver is not None:
+            await self._async_driver.close()
+            self._async_driver = None
+    
+    def execute_query(
+        self,
+        query: str,
+        parameters: Dict[str, Any],
+        access_mode: str = READ_ACCESS,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Execute a Cypher query and return results
+        Helper method for GraphQL resolvers; sessions are read-routed (so a
+        cluster can serve them from followers) unless WRITE_ACCESS is passed
+        """
+        return list(self.stream_query(query, parameters, access_mode, limit))
+    
+    def stream_query(
+        self,
+        query: str,
+        parameters: Dict[str, Any],
+        access_mode: str = READ_ACCESS,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Execute a Cypher query, yielding records as they arrive
+        With a limit, only that many records are fetched from the server; the
+        rest of the result is discarded when the session closes
+        """
+        session_config = {"default_access_mode": access_mode}
+        if limit is not None:
+            session_config["fetch_size"] = limit
+        with self.driver.session(**session_config) as session:
+            result = session.run(query, parameters)
+            for record in islice(result, limit):
+                yield record.data()
+    
+    async def execute_query_async(
+        self,
+        query: str,
+        parameters: Dict[str, Any],
+        access_mode: str = READ_ACCESS
+    ) -> List[Dict]:
+        """
+        Execute a Cypher query on the async driver and return results
+        Lets async resolvers run independent queries concurrently
+        """
+        async with self.async_driver.session(default_access_mode=access_mode) as session:
+            result = await session.run(query, parameters)
+            return [record.data() async for record in result]
+    
+    async def stream_query_async(
+        self,
+        query: str,
+        parameters: Dict[str, Any],
+        access_mode: str = READ_ACCESS
+    ) -> AsyncIterator[Dict]:
+        """
+        Execute a Cypher query on the async driver, yielding records as they arrive
+        Memory stays bounded by the driver's fetch size rather than the result size
+        """
+        async with self.async_driver.session(default_access_mode=access_mode) as session:
+            result = await session.run(query, parameters)
+            async for record in result:
+                yield record.data()
+    
+    # Name of the constraint/index a CREATE ... IF NOT EXISTS statement defines
+    SCHEMA_ITEM_NAME = re.compile(r"CREATE (?:CONSTRAINT|(?:FULLTEXT )?INDEX) (\w+)")
+    
+    def create_schema(self, await_timeout: int = 300):
+        """
+        Create all constraints and indexes for the knowledge graph
+        
+        Items that already exist are skipped, and the call returns once every
+        index is online (or ``await_timeout`` seconds have passed).
+        """
         with self.driver.session() as session:
-            # Get node counts
-            node_query = """
-            MATCH (n)
-            RETURN labels(n) as labels, count(n) as count
-            """
-            nodes = session.run(node_query).data()
+            statements = self._pending_schema_statements(self._existing_schema_names(session))
+            if not statements:
+                logger.info("Knowledge graph schema already up to date")
+                return
+            
+            # Commit all DDL together in one transaction instead of one
+            # auto-commit round-trip per statement
+            try:
+                session.execute_write(self._run_statements, statements)
+                logger.info(f"Created {len(statements)} constraints and indexes")
+            except Exception as e:
+                logger.warning(f"Batched schema creation failed, applying statements one by one: {e}")
+                
+                # A conflicting existing definition fails the whole batch; fall
+                # back so every other constraint/index still gets created
+                for statement in statements:
+                    try:
+                        session.run(statement).consume()
+                        logger.info(f"Created schema item: {statement[:50]}...")
+                    except Exception as e:
+                        logger.warning(f"Schema item may already exist: {e}")
+            
+            # New indexes populate in the background; until they are online the
+            # planner falls back to scans, so bulk loads right after startup
+            # would otherwise run without index seeks
+            session.run("CALL db.awaitIndexes($timeout)", {"timeout": await_timeout}).consume()
+    
+    def _schema_statements(self) -> List[str]:
+        """DDL for all constraints and indexes of the knowledge graph"""
+        # Create constraints for unique identifiers
+        constraints = [
+            # IFC Elements
+            f"CREATE CONSTRAINT ifc_element_guid IF NOT EXISTS "
+            f"FOR (e:{IFC_ELEMENT_LABEL}) REQUIRE e.globalId IS UNIQUE",
+            
+            # Point Cloud Segments
+            f"CREATE CONSTRAINT pc_segment_id IF NOT EXISTS "
+            f"FOR (s:{POINT_CLOUD_SEGMENT_LABEL}) REQUIRE s.segmentId IS UNIQUE",
+            
+            # bSDD Nodes
+            f"CREATE CONSTRAINT bsdd_dict_uri IF NOT EXISTS "
+            f"FOR (d:{BSDD_DICTIONARY_LABEL}) REQUIRE d.uri IS UNIQUE",
+            
+            f"CREATE CONSTRAINT bsdd_class_uri IF NOT EXISTS "
+            f"FOR (c:{BSDD_CLASS_LABEL}) REQUIRE c.uri IS UNIQUE",
+            
+            f"CREATE CONSTRAINT bsdd_property_uri IF NOT EXISTS "
+            f"FOR (p:{BSDD_PROPERTY_LABEL}) REQUIRE p.uri IS UNIQUE",
+            
+            # Semantic Classes
+            f"CREATE CONSTRAINT semantic_class_label IF NOT EXISTS "
+            f"FOR (sc:{SEMANTIC_CLASS_LABEL}) REQUIRE sc.label IS UNIQUE"
+        ]
+        
+        # Create indexes for common queries
+        indexes = [
+            # Text search indexes
+            f"CREATE INDEX ifc_element_name IF NOT EXISTS "
+            f"FOR (e:{IFC_ELEMENT_LABEL}) ON (e.name)",
+            
+            f"CREATE INDEX bsdd_class_name IF NOT EXISTS "
+            f"FOR (c:{BSDD_CLASS_LABEL}) ON (c.name)",
+            
+            f"CREATE INDEX bsdd_class_code IF NOT EXISTS "
+            f"FOR (c:{BSDD_CLASS_LABEL}) ON (c.code)",
+            
+            # Composite index for class lookups within one dictionary
+            f"CREATE INDEX bsdd_class_dict_code IF NOT EXISTS "
+            f"FOR (c:{BSDD_CLASS_LABEL}) ON (c.dictionaryUri, c.code)",
+            
+            f"CREATE INDEX bsdd_property_name IF NOT EXISTS "
+            f"FOR (p:{BSDD_PROPERTY_LABEL}) ON (p.name)",
+            
+            f"CREATE INDEX bsdd_dict_name IF NOT EXISTS "
+            f"FOR (d:{BSDD_DICTIONARY_LABEL}) ON (d.name)",
+            
+            # Lookup indexes
+            f"CREATE INDEX ifc_element_type IF NOT EXISTS "
+            f"FOR (e:{IFC_ELEMENT_LABEL}) ON (e.ifcType)",
             
-            # Get relationship counts
-            rel_query = """
-            MATCH ()-[r]->()
-            RETURN type(r) as type, count(r) as count
-            """
-            relationships = session.run(rel_query).data()
+            f"CREATE INDEX bsdd_dict_org IF NOT EXISTS "
+            f"FOR (d:{BSDD_DICTIONARY_LABEL}) ON (d.organizationCode)",
             
-            return {
-                "nodes": nodes,
-                "relationships": relationships
+            f"CREATE INDEX semantic_class_id IF NOT EXISTS "
+            f"FOR (sc:{SEMANTIC_CLASS_LABEL}) ON (sc.classId)",
+            
+            # Relationship property indexes for filtering mappings
+            f"CREATE INDEX maps_to_bsdd_confidence IF NOT EXISTS "
+            f"FOR ()-[r:{MAPS_TO_BSDD_REL}]-() ON (r.confidence)",
+            
+            f"CREATE INDEX maps_to_bsdd_created_at IF NOT EXISTS "
+            f"FOR ()-[r:{MAPS_TO_BSDD_REL}]-() ON (r.createdAt)"
+        ]
+        
+        # Create full-text indexes for text search
+        fulltext_indexes = [
+            f"CREATE FULLTEXT INDEX {self.FULLTEXT_INDEXES['BSDD_CLASS']} IF NOT EXISTS "
+            f"FOR (c:{BSDD_CLASS_LABEL}) ON EACH [c.name, c.definition]",
+            
+            f"CREATE FULLTEXT INDEX {self.FULLTEXT_INDEXES['BSDD_PROPERTY']} IF NOT EXISTS "
+            f"FOR (p:{BSDD_PROPERTY_LABEL}) ON EACH [p.name, p.definition]",
+            
+            f"CREATE FULLTEXT INDEX {self.FULLTEXT_INDEXES['IFC_ELEMENT']} IF NOT EXISTS "
+            f"FOR (e:{IFC_ELEMENT_LABEL}) ON EACH [e.name, e.description]",
+            
+            f"CREATE FULLTEXT INDEX {self.FULLTEXT_INDEXES['POINT_CLOUD_SEGMENT']} IF NOT EXISTS "
+            f"FOR (s:{POINT_CLOUD_SEGMENT_LABEL}) ON EACH [s.semanticLabel]"
+        ]
+        
+        return constraints + indexes + fulltext_indexes
+    
+    def _pending_schema_statements(self, existing: Set[str]) -> List[str]:
+        """Schema statements whose constraint/index is not in ``existing``"""
+        # IF NOT EXISTS still takes the schema lock for every statement, so on
+        # a warm database send only the items that are actually missing
+        return [
+            statement for statement in self._schema_statements()
+            if self.SCHEMA_ITEM_NAME.match(statement).group(1) not in existing
+        ]
+    
+    @staticmethod
+    def _existing_schema_names(session) -> Set[str]:
+        """Names of the constraints and indexes already defined in the database"""
+        try:
+            names = {record["name"] for record in session.run("SHOW CONSTRAINTS YIELD name")}
+            names.update(record["name"] for record in session.run("SHOW INDEXES YIELD name"))
+            return names
+        except Exception as e:
+            logger.warning(f"Could not list existing schema, creating all items: {e}")
+            return set()
+    
+    @staticmethod
+    def _run_statements(tx, statements: List[str]):
+        """Run each statement in the given transaction"""
+        for statement in statements:
+            tx.run(statement).consume()
+    
+    async def create_schema_async(self, await_timeout: int = 300):
+        """Same as create_schema, on the async driver so the event loop is not blocked"""
+        async with self.async_driver.session() as session:
+            statements = self._pending_schema_statements(await self._existing_schema_names_async(session))
+            if not statements:
+                logger.info("Knowledge graph schema already up to date")
+                return
+            
+            # One transaction, as in create_schema: a session runs one query at
+            # a time, and concurrent DDL transactions only queue on the schema lock
+            try:
+                await session.execute_write(self._run_statements_async, statements)
+                logger.info(f"Created {len(statements)} constraints and indexes")
+            except Exception as e:
+                logger.warning(f"Batched schema creation failed, applying statements one by one: {e}")
+                for statement in statements:
+                    try:
+                        await (await session.run(statement)).consume()
+                        logger.info(f"Created schema item: {statement[:50]}...")
+                    except Exception as e:
+                        logger.warning(f"Schema item may already exist: {e}")
+            
+            result = await session.run("CALL db.awaitIndexes($timeout)", {"timeout": await_timeout})
+            await result.consume()
+    
+    @staticmethod
+    async def _existing_schema_names_async(session) -> Set[str]:
+        """Async variant of _existing_schema_names"""
+        try:
+            names = {record["name"] async for record in await session.run("SHOW CONSTRAINTS YIELD name")}
+            names.update([record["name"] async for record in await session.run("SHOW INDEXES YIELD name")])
+            return names
+        except Exception as e:
+            logger.warning(f"Could not list existing schema, creating all items: {e}")
+            return set()
+    
+    @staticmethod
+    async def _run_statements_async(tx, statements: List[str]):
+        """Run each statement in the given async transaction"""
+        for statement in statements:
+            await (await tx.run(statement)).consume()
+    
+    @staticmethod
+    def _run(runner, query: str, parameters: Dict[str, Any]):
+        """Run a write on a session or transaction and return its single record"""
+        return runner.run(query, parameters).single()
+    
+    def _write(self, query: str, parameters: Dict[str, Any]):
+        """
+        Run one write in its own managed transaction
+        execute_write retries it on transient errors (e.g. a leader switch)
+        instead of failing the import
+        """
+        with self.driver.session() as session:
+            return session.execute_write(self._run, query, parameters)
+    
+    @staticmethod
+    async def _run_async(tx, query: str, parameters: Dict[str, Any]):
+        """Async variant of _run for managed transactions"""
+        result = await tx.run(query, parameters)
+        return await result.single()
+    
+    @contextmanager
+    def bulk(self, batch_size: int = 1000) -> Iterator["BulkWriter"]:
+        """
+        Share one session and explicit transaction across many writes
+        
+        Usage: ``with schema.bulk() as kg: kg.create_bsdd_class_node(...)``.
+        The yielded writer offers the same create_*/link_* methods; writes are
+        committed every ``batch_size`` calls, on ``commit()`` and when the block
+        exits. A failed write, or the block raising, rolls back the writes
+        issued since the last commit.
+        """
+        with self.driver.session() as session:
+            writer = BulkWriter(self, session, batch_size)
+            try:
+                yield writer
+                writer.commit()
+            except BaseException:
+                writer.rollback()
+                raise
+    
+    APOC_MERGE_PROBE_QUERY = """
+    SHOW PROCEDURES YIELD name
+    WHERE name = 'apoc.merge.relationship'
+    RETURN count(*) > 0 AS available
+    """
+    
+    def apoc_merge_available(self) -> bool:
+        """Whether apoc.merge.relationship is installed (checked once per instance)"""
+        if self._use_apoc_merge is None:
+            try:
+                with self.driver.session(default_access_mode=READ_ACCESS) as session:
+                    self._use_apoc_merge = bool(session.run(self.APOC_MERGE_PROBE_QUERY).single()[0])
+            except ClientError as e:
+                logger.warning(f"Could not list procedures, assuming APOC is missing: {e}")
+                self._use_apoc_merge = False
+            if not self._use_apoc_merge:
+                logger.info("apoc.merge.relationship not available, relationship types are inlined")
+        return self._use_apoc_merge
+    
+    # Per-label and per-type counts read from the count store by APOC, without
+    # touching any node or relationship
+    SCHEMA_STATS_QUERY = """
+    CALL apoc.meta.stats() YIELD labels, relTypesCount
+    RETURN labels, relTypesCount
+    """
+    
+    # Without APOC, get_schema_info lists the label and relationship type
+    # tokens and then counts each one (see _count_store_queries). Each list is
+    # collected in its own subquery so an empty one still yields a row
+    SCHEMA_TOKENS_QUERY = """
+    CALL { CALL db.labels() YIELD label RETURN collect(label) AS labels }
+    CALL { CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) AS types }
+    RETURN labels, types
+    """
+    NO_SCHEMA_TOKENS = {"labels": [], "types": []}
+    
+    @staticmethod
+    def _count_store_queries(tokens: Dict[str, List[str]]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Node and relationship count queries for the tokens of SCHEMA_TOKENS_QUERY
+        Each UNION branch names one label/type literally, so Neo4j answers it
+        from the count store instead of scanning; None when there are no tokens
+        """
+        node_query = "\nUNION ALL\n".join(
+            f"MATCH (:`{label.replace('`', '``')}`) RETURN [$labels[{i}]] AS labels, count(*) AS count"
+            for i, label in enumerate(tokens["labels"])
+        )
+        rel_query = "\nUNION ALL\n".join(
+            f"MATCH ()-[:`{rel.replace('`', '``')}`]->() RETURN $types[{i}] AS type, count(*) AS count"
+            for i, rel in enumerate(tokens["types"])
+        )
+        return node_query or None, rel_query or None
+    
+    def invalidate_schema_info(self):
+        """Drop the cached get_schema_info result after a write changes the counts"""
+        with self._schema_info_lock:
+            self._schema_info_cache.clear()
+    
+    async def _link_many_to_bsdd_async(self, query: str, links: List[Dict[str, Any]]):
+        """MERGE a batch of MAPS_TO_BSDD relationships in a single write"""
+        async with self.async_driver.session() as session:
+            await session.execute_write(
+                self._run_async,
+                query,
+                {"rows": links, "now": int(time.time() * 1000)}
+            )
+        self.invalidate_schema_info()
+    
+    async def link_ifc_elements_to_bsdd_async(self, links: List[Dict[str, Any]]):
+        """
+        Create many IFC element -> bSDD class mappings in one transaction
+        Each link is ``{"source_id": globalId, "bsdd_class_uri": ..., "confidence": ...}``
+        """
+        await self._link_many_to_bsdd_async(self.LINK_IFC_ELEMENTS_QUERY, links)
+    
+    async def link_pointcloud_segments_to_bsdd_async(self, links: List[Dict[str, Any]]):
+        """
+        Create many point cloud segment -> bSDD class mappings in one transaction
+        Each link is ``{"source_id": segmentId, "bsdd_class_uri": ..., "confidence": ...}``
+        """
+        await self._link_many_to_bsdd_async(self.LINK_SEGMENTS_QUERY, links)
+    
+    @staticmethod
+    def _schema_info_from_stats(record) -> Dict:
+        """Shape an apoc.meta.stats record like the scanning count queries"""
+        return {
+            "nodes": [{"labels": [label], "count": count} for label, count in record["labels"].items()],
+            "relationships": [{"type": rel, "count": count} for rel, count in record["relTypesCount"].items()]
+        }
+    
+    def _meta_stats_unavailable(self, error: ClientError) -> bool:
+        """Remember (and report) that APOC is missing, so later calls go straight to the fallback"""
+        if error.code != "Neo.ClientError.Procedure.ProcedureNotFound":
+            return False
+        logger.info("apoc.meta.stats not available, counting schema per label and type")
+        self._use_meta_stats = False
+        return True
+    
+    def get_schema_info(self) -> Dict:
+        """Get information about the current schema (cached for schema_info_ttl seconds)"""
+        with self._schema_info_lock:
+            info = self._schema_info_cache.get("info")
+        if info is not None:
+            return info
+        
+        info = None
+        with self.driver.session(default_access_mode=READ_ACCESS) as session:
+            if self._use_meta_stats:
+                try:
+                    info = self._schema_info_from_stats(session.run(self.SCHEMA_STATS_QUERY).single())
+                except ClientError as e:
+                    if not self._meta_stats_unavailable(e):
+                        raise
+            if info is None:
+                record = session.run(self.SCHEMA_TOKENS_QUERY).single()
+                tokens = record.data() if record else self.NO_SCHEMA_TOKENS
+                node_query, rel_query = self._count_store_queries(tokens)
+                info = {
+                    "nodes": session.run(node_query, tokens).data() if node_query else [],
+                    "relationships": session.run(rel_query, tokens).data() if rel_query else []
+                }
+        
+        with self._schema_info_lock:
+            self._schema_info_cache["info"] = info
+        return info
+    
+    async def get_schema_info_async(self) -> Dict:
+        """Get information about the current schema on the async driver"""
+        with self._schema_info_lock:
+            info = self._schema_info_cache.get("info")
+        if info is not None:
+            return info
+        
+        info = None
+        if self._use_meta_stats:
+            try:
+                records = await self.execute_query_async(self.SCHEMA_STATS_QUERY, {})
+                info = self._schema_info_from_stats(records[0])
+            except ClientError as e:
+                if not self._meta_stats_unavailable(e):
+                    raise
+        if info is None:
+            records = await self.execute_query_async(self.SCHEMA_TOKENS_QUERY, {})
+            tokens = records[0] if records else self.NO_SCHEMA_TOKENS
+            node_query, rel_query = self._count_store_queries(tokens)
+            info = {
+                "nodes": await self.execute_query_async(node_query, tokens) if node_query else [],
+                "relationships": await self.execute_query_async(rel_query, tokens) if rel_query else []
             }
+        
+        with self._schema_info_lock:
+            self._schema_info_cache["info"] = info
+        return info
+
+
+class BulkWriter(BsddWriteMixin):
+    """
+    Runs KnowledgeGraphSchema writes inside one long-lived transaction
+    
+    Obtained from ``KnowledgeGraphSchema.bulk()``. Bulk ingest would otherwise
+    pay a pooled-connection checkout and an auto-commit for every single MERGE.
+    """
+    
+    def __init__(self, schema: KnowledgeGraphSchema, session, batch_size: int):
+        self._schema = schema
+        self._session = session
+        self._batch_size = batch_size
+        self._tx = None
+        self._pending = 0
+    
+    def _write(self, query: str, parameters: Dict[str, Any]):
+        """Run one write in the open transaction, committing every batch_size writes"""
+        if self._tx is None:
+            self._tx = self._session.begin_transaction()
+        try:
+            record = KnowledgeGraphSchema._run(self._tx, query, parameters)
+        except Exception:
+            # A failed statement leaves the transaction unusable; drop it so the
+            # next write starts a fresh one
+            self.rollback()
+            raise
+        self._pending += 1
+        if self._pending >= self._batch_size:
+            self.commit()
+        return record
+    
+    def commit(self):
+        """Commit the writes issued since the last commit"""
+        if self._tx is not None:
+            self._tx.commit()
+            self._tx = None
+            self._pending = 0
+    
+    def rollback(self):
+        """Discard the writes issued since the last commit"""
+        if self._tx is not None:
+            self._tx.rollback()
+            self._tx = None
+            self._pending = 0
+    
+    def invalidate_schema_info(self):
+        self._schema.invalidate_schema_info()
+    
+    def apoc_merge_available(self) -> bool:
+        return self._schema.apoc_merge_available()
 
 
 # Example usage
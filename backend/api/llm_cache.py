@@ -0,0 +1,201 @@
+"""
+Response cache for the /chat endpoint
+
+A question asked again about the same scene is answered from memory instead
+of repeating the Cypher generation and reply synthesis LLM calls. Questions
+are matched exactly first (normalized text), then by cosine similarity of
+their embeddings against earlier questions for the same scene. A similar
+question is only answered from memory when its signature (by default, the
+numbers it mentions) matches: "within 2 m of the door" and "within 5 m of
+the door" embed almost identically but need different rows.
+"""
+import hashlib
+import re
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+from cachetools import TTLCache
+
+# Maps question text to an embedding vector, or None when no embedding is available
+Embedder = Callable[[str], Optional[np.ndarray]]
+# Maps normalized question text to the details a reused answer must agree on
+Signature = Callable[[str], Hashable]
+
+NUMBER_RE = re.compile(r"\d*\.?\d+")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase and collapse whitespace so trivially different phrasings share a key"""
+    return " ".join((question or "").lower().split())
+
+
+def numeric_tokens(question: str) -> Tuple[float, ...]:
+    """Numbers mentioned in a question, in order ("2" and "2.0" compare equal)"""
+    return tuple(float(token) for token in NUMBER_RE.findall(question))
+
+
+class LLMCache:
+    """
+    In-process TTL/LRU cache of /chat responses keyed by (scene_id, question)
+
+    Entries expire after ``ttl`` seconds and the least recently used are
+    evicted beyond ``maxsize``. Without an ``embed`` function only exact
+    (normalized) repeats are served; a similar question is served only when
+    ``signature`` gives the same value for both. Question embeddings are kept as
+    ``dtype``; float16 halves their memory but numpy scores it without BLAS,
+    so lookups over large scenes get slower.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 3600.0,
+        similarity: float = 0.92,
+        embed: Optional[Embedder] = None,
+        dtype: Any = np.float32,
+        signature: Signature = numeric_tokens
+    ):
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # scene -> (entry keys, normalized questions, unit-length embeddings),
+        # row-aligned with each other
+        self._index: Dict[str, Tuple[List[str], List[str], np.ndarray]] = {}
+        # scene -> keys of every entry stored for it, so a scene can be invalidated
+        self._scene_keys: Dict[str, Set[str]] = {}
+        self._similarity = similarity
+        self._embed = embed
+        self._signature = signature
+        self._dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(scene_id: Optional[str], question: str) -> str:
+        text = f"{scene_id or ''}\x00{normalize_question(question)}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, scene_id: Optional[str], question: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached response for an exact (normalized) repeat, or None
+        Only hashes the question, so it is cheap enough to call on the event loop
+        """
+        key = self._key(scene_id, question)
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self.hits += 1
+            return response
+
+    def lookup(
+        self,
+        scene_id: Optional[str],
+        question: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Return the cached response (or None) and the question's embedding
+        The embedding is handed back so store() does not compute it again
+        """
+        response = self.get(scene_id, question)
+        if response is not None:
+            return response, None
+
+        embedding = self._embedding(question)
+        with self._lock:
+            if embedding is not None:
+                response = self._nearest(scene_id or "", embedding, normalize_question(question))
+                if response is not None:
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    return response, embedding
+            self.misses += 1
+        return None, embedding
+
+    def store(
+        self,
+        scene_id: Optional[str],
+        question: str,
+        response: Dict[str, Any],
+        embedding: Optional[np.ndarray] = None
+    ):
+        """Cache a response, indexing its embedding (from lookup) for similar questions"""
+        key = self._key(scene_id, question)
+        scene = scene_id or ""
+        with self._lock:
+            self._entries[key] = response
+            scene_keys = self._scene_keys.setdefault(scene, set())
+            scene_keys.add(key)
+            if len(scene_keys) > self._entries.maxsize:
+                # Forget keys whose entries have expired or been evicted
+                scene_keys.intersection_update([k for k in scene_keys if k in self._entries])
+            if embedding is None:
+                return
+            text = normalize_question(question)
+            keys, questions, vectors = self._index.get(scene, ([], [], None))
+            if vectors is None or vectors.shape[1] != embedding.shape[0]:
+                # First entry, or the embedding model changed dimension
+                self._index[scene] = ([key], [text], embedding[np.newaxis, :])
+            else:
+                self._index[scene] = (keys + [key], questions + [text], np.vstack([vectors, embedding]))
+
+    def invalidate_scene(self, scene_id: Optional[str]):
+        """Drop every cached response for a scene, e.g. after its data is replaced"""
+        scene = scene_id or ""
+        with self._lock:
+            for key in self._scene_keys.pop(scene, ()):
+                self._entries.pop(key, None)
+            self._index.pop(scene, None)
+
+    def _embedding(self, question: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of the normalized question, or None"""
+        if self._embed is None:
+            return None
+        vector = self._embed(normalize_question(question))
+        if vector is None:
+            return None
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return (vector / norm).astype(self._dtype) if norm else None
+
+    def _nearest(self, scene: str, embedding: np.ndarray, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Response of the most similar live question in the scene that is similar
+        enough and has the same signature as ``question`` (normalized), if any
+        """
+        if scene not in self._index:
+            return None
+        keys, questions, vectors = self._index[scene]
+
+        # Drop questions whose responses have expired or been evicted
+        live = [i for i, key in enumerate(keys) if key in self._entries]
+        if not live:
+            del self._index[scene]
+            return None
+        if len(live) != len(keys):
+            keys, questions, vectors = [keys[i] for i in live], [questions[i] for i in live], vectors[live]
+            self._index[scene] = (keys, questions, vectors)
+
+        if vectors.shape[1] != embedding.shape[0]:
+            return None
+        scores = vectors @ embedding
+        candidates = np.flatnonzero(scores >= self._similarity)
+        if not len(candidates):
+            return None
+        # Close wording is not enough: a question about other numbers or
+        # objects needs its own answer
+        signature = self._signature(question)
+        for i in candidates[np.argsort(-scores[candidates])]:
+            if self._signature(questions[i]) == signature:
+                return self._entries.get(keys[i])
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses
+            }
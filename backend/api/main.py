@@ -1,21 +1,43 @@
 import os
 import io
+import asyncio
 import re
 import json
+import inspect
 import logging
+import shutil
+import tempfile
+import warnings
+from itertools import combinations
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import anyio
 import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from neo4j import GraphDatabase, basic_auth
 
 from pointnet_s3dis.online_segmentation import process_uploaded_array
 
+from ._fastpath import (
+    CODEBLOCK_RE,
+    extract_cypher_from_text,
+    normalize_distance_and_sanitize,
+    serialize_rows,
+    validate_cypher_readonly,
+)
+from .llm_cache import LLMCache, numeric_tokens
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -49,13 +71,37 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:1b")
 OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text:latest")
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama")  # "ollama" or "gemini"
+# How long Ollama keeps the model (and the KV cache of the shared system prompt) loaded
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "1h")
+
+# /chat response cache: entries, seconds to keep them, and the cosine
+# similarity at which a different question reuses a cached answer
+CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "1024"))
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "3600"))
+CHAT_CACHE_SIMILARITY = float(os.getenv("CHAT_CACHE_SIMILARITY", "0.92"))
+CHAT_CACHE_EMBEDDING_DTYPE = os.getenv("CHAT_CACHE_EMBEDDING_DTYPE", "float32")
+# Longer /chat questions are rejected before they reach the LLM
+CHAT_MAX_QUESTION_CHARS = int(os.getenv("CHAT_MAX_QUESTION_CHARS", "4000"))
+CHAT_MAX_QUESTION_LINES = int(os.getenv("CHAT_MAX_QUESTION_LINES", "100"))
+
+# Keep-alive connections per host for the Ollama / Gemini HTTP calls
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+
+# Server configuration
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "200"))  # Starlette defaults to 40
 
 driver = None
 if not NEO4J_URI or not NEO4J_USER or not NEO4J_PASSWORD:
     logger.warning("Neo4j is not configured (NEO4J_URI/NEO4J_USER/NEO4J_PASSWORD). Neo4j features will be disabled.")
 else:
     try:
-        driver = GraphDatabase.driver(NEO4J_URI, auth=basic_auth(NEO4J_USER, NEO4J_PASSWORD))
+        driver = GraphDatabase.driver(
+            NEO4J_URI,
+            auth=basic_auth(NEO4J_USER, NEO4J_PASSWORD),
+            max_connection_pool_size=int(os.getenv("NEO4J_MAX_POOL_SIZE", "100")),
+            connection_acquisition_timeout=float(os.getenv("NEO4J_ACQUIRE_TIMEOUT", "60")),
+            max_transaction_retry_time=float(os.getenv("NEO4J_MAX_RETRY_TIME", "30"))
+        )
     except Exception as e:
         logger.warning("Failed to connect to Neo4j (%s). Neo4j features will be disabled.", e)
         driver = None
@@ -68,11 +114,8 @@ MODEL_ENDPOINTS = [
     "https://generativelanguage.googleapis.com/v1/models/gemini-1.5-flash:generateContent",
 ]
 
-DISALLOWED = re.compile(
-    r"\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP|CALL|LOAD\s+CSV|FOREACH|APOC|DBMS|ALTER)\b",
-    re.I,
-)
-CODEBLOCK_RE = re.compile(r"```(?:cypher)?\s*([\s\S]*?)```", re.I)
+ANY_CODEBLOCK_RE = re.compile(r"```[\s\S]*?```")
+FIRST_LINE_RE = re.compile(r"\S[^\n]*")
 
 SYSTEM_PROMPT_GEN_CYPHER = (
     "Schema: (:Scene {id}), (:Segment {id, scene_id, semantic_name, centroid_point, num_points}).\n"
@@ -89,18 +132,82 @@ SYSTEM_PROMPT_SYNTHESIZE = (
     'produce a one-line plain English answer. If results are empty, say "No matching results found."'
 )
 
-DIST_BETWEEN_RE = re.compile(r"distance.*between\s+([a-z0-9 _-]+)\s+and\s+([a-z0-9 _-]+)", re.I)
-WITHIN_RE = re.compile(r"(within|less than|under)\s+([0-9]*\.?[0-9]+)\s*(m|meters|meter)\s+of\s+([a-z0-9 _-]+)", re.I)
-COUNT_RE = re.compile(r"(how many|number of|count of)\s+([a-z0-9 _-]+)", re.I)
-LIST_RE = re.compile(r"(find|show|list|what are|give me)\s+(?:all|every)?\s*([a-z0-9 _-]+)", re.I)
+# Fallback question shapes in one regex; m.lastgroup names the shape that matched.
+# Each branch skips ahead from the start on its own, so an earlier branch wins
+# wherever it occurs ("how many chairs within 2 m of the door" is a WITHIN question)
+INTENT_RE = re.compile(
+    r"\A(?:"
+    r"(?s:.*?)(?P<dist>distance.*between\s+(?P<a>[a-z0-9 ,_-]+)\s+and\s+(?P<b>[a-z0-9 _-]+))"
+    r"|(?s:.*?)(?P<within>(?:within|less than|under)\s+(?P<meters>[0-9]*\.?[0-9]+)\s*(?:m|meters|meter)\s+of\s+(?P<target>[a-z0-9 _-]+))"
+    r"|(?s:.*?)(?P<count>(?:how many|number of|count of)\s+(?P<csem>[a-z0-9 _-]+))"
+    r"|(?s:.*?)(?P<list>(?:find|show|list|what are|give me)\s+(?:all|every)?\s*(?P<lsem>[a-z0-9 _-]+))"
+    r")",
+    re.I,
+)
+
+def configure_threadpool() -> None:
+    """Size the worker pool used by sync endpoints and run_in_threadpool offloads"""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = API_THREADPOOL_SIZE
+    logger.info(f"Worker thread pool size: {API_THREADPOOL_SIZE}")
+
+
+# (startup, shutdown) pairs registered by the optional routers below; each hook
+# takes the app and may be sync or async
+LIFESPAN_HOOKS: List[Tuple[Callable[[FastAPI], Any], Callable[[FastAPI], Any]]] = []
+
+# The /chat fallback queries look up segments by scene and semantic name; the
+# TEXT index serves their CONTAINS matches on semantic_name
+SEGMENT_INDEXES = [
+    "CREATE INDEX segment_scene IF NOT EXISTS FOR (s:Segment) ON (s.scene_id)",
+    "CREATE INDEX segment_scene_semantic IF NOT EXISTS FOR (s:Segment) ON (s.scene_id, s.semantic_name)",
+    "CREATE TEXT INDEX segment_semantic IF NOT EXISTS FOR (s:Segment) ON (s.semantic_name)",
+]
+
+
+def create_segment_indexes(app: FastAPI) -> None:
+    """Create the :Segment indexes used by /chat if they are missing."""
+    if driver is None:
+        return
+    try:
+        with driver.session(database=NEO4J_DATABASE) as session:
+            for statement in SEGMENT_INDEXES:
+                session.run(statement).consume()
+    except Exception as e:
+        logger.warning("Could not create :Segment indexes: %s", e)
+
 
-app = FastAPI(title="BIMTwinOps API", version="2.0.0")
+LIFESPAN_HOOKS.append((create_segment_indexes, lambda _: None))
+
+
+async def _run_hook(hook: Callable[[FastAPI], Any], app: FastAPI) -> None:
+    result = hook(app)
+    if inspect.isawaitable(result):
+        await result
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients once before serving and dispose of them on shutdown"""
+    configure_threadpool()
+    for startup, _ in LIFESPAN_HOOKS:
+        await _run_hook(startup, app)
+    yield
+    for _, shutdown in reversed(LIFESPAN_HOOKS):
+        try:
+            await _run_hook(shutdown, app)
+        except Exception as e:
+            logger.error(f"Shutdown hook failed: {e}")
+
+
+app = FastAPI(title="BIMTwinOps API", version="2.0.0", lifespan=lifespan)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
 # Import and include Knowledge Graph routes
 try:
-    from .kg_routes import router as kg_router
+    from .kg_routes import router as kg_router, open_clients as open_kg_clients, close_clients as close_kg_clients
     app.include_router(kg_router)
+    LIFESPAN_HOOKS.append((open_kg_clients, close_kg_clients))
     logger.info("Knowledge Graph routes loaded successfully")
 except ImportError as e:
     logger.warning(f"Knowledge Graph routes not available: {e}")
@@ -109,8 +216,9 @@ except Exception as e:
 
 # Import and include GraphQL API
 try:
-    from .kg_graphql import graphql_router
+    from .kg_graphql import graphql_router, warm_up_clients, close_clients
     app.include_router(graphql_router, prefix="", tags=["GraphQL"])
+    LIFESPAN_HOOKS.append((lambda _: warm_up_clients(), lambda _: close_clients()))
     logger.info("GraphQL API enabled at /api/graphql (GraphiQL UI available)")
 except ImportError as e:
     logger.warning(f"GraphQL API not available: {e}")
@@ -146,6 +254,13 @@ def health_neo4j():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Neo4j health check failed: {e}")
 
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson; return it directly to skip jsonable_encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str)
+
+
 class ChatReq(BaseModel):
     question: str
     scene_id: Optional[str] = None
@@ -163,21 +278,44 @@ async def upload_pointcloud(file: UploadFile = File(...)):
                    f"This endpoint accepts .npy point cloud files or text-based coordinate files (CSV/TXT)."
         )
     
-    data = await file.read()
-    if filename_lower.endswith(".npy"):
-        np_array = np.load(io.BytesIO(data))
-    else:
-        # Try to parse as text coordinates (CSV/TXT)
-        try:
-            from io import StringIO
-            np_array = np.loadtxt(StringIO(data.decode("utf-8")))
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Failed to parse file as point cloud data. Expected .npy or text coordinates (CSV/TXT). Error: {str(e)}"
-            )
-    
-    scene_id = os.path.splitext(filename)[0]
+    npy_path = None
+    try:
+        if filename_lower.endswith(".npy"):
+            # Spool the upload to a file and memory-map it, so the points are paged
+            # in from disk instead of being held in memory twice (bytes + array)
+            with tempfile.NamedTemporaryFile(suffix=".npy", delete=False) as tmp:
+                npy_path = tmp.name
+                await run_in_threadpool(shutil.copyfileobj, file.file, tmp)
+            np_array = np.load(npy_path, mmap_mode="r")
+        else:
+            data = await file.read()
+            # Try to parse as text coordinates (CSV/TXT)
+            try:
+                np_array = parse_text_points(data)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Failed to parse file as point cloud data. Expected .npy or text coordinates (CSV/TXT). Error: {str(e)}"
+                )
+            del data
+
+        scene_id = os.path.splitext(filename)[0]
+        result = segment_upload(np_array, scene_id)
+        # The scene's segments were rewritten; cached /chat answers about it are stale
+        chat_cache.invalidate_scene(scene_id)
+        return result
+    finally:
+        if npy_path:
+            # Close the memory map first; Windows cannot delete a mapped file
+            np_array = None
+            try:
+                os.remove(npy_path)
+            except OSError as e:
+                logger.warning("Could not remove upload temp file %s: %s", npy_path, e)
+
+
+def segment_upload(np_array: np.ndarray, scene_id: str) -> Dict[str, Any]:
+    """Segment an uploaded point cloud, or return it unsegmented if PointNet weights are missing."""
     try:
         return process_uploaded_array(np_array, scene_id=scene_id)
     except FileNotFoundError as e:
@@ -216,133 +354,182 @@ async def upload_pointcloud(file: UploadFile = File(...)):
             "warning": str(e),
         }
 
-def extract_cypher_from_text(text: str) -> Tuple[str, str]:
-    m = CODEBLOCK_RE.search(text or "")
-    cypher = ""
-    if m:
-        cypher = m.group(1).strip()
-        if cypher.upper().startswith("# EMPTY"):
-            cypher = ""
-    explanation = re.sub(CODEBLOCK_RE, "", text or "").strip().split("\n")
-    explanation_line = ""
-    for line in explanation:
-        if line.strip():
-            explanation_line = line.strip()
-            break
-    return cypher, explanation_line
-
-def validate_cypher_readonly(cypher: str) -> bool:
-    if not cypher:
-        return False
-    if DISALLOWED.search(cypher):
-        return False
-    if ";" in cypher.replace("\n", " "):
-        return False
-    if "RETURN" not in cypher.upper():
-        return False
-    return True
-
-def normalize_distance_and_sanitize(cypher: str) -> str:
-    if not isinstance(cypher, str):
-        return ""
-    # Unescape literal "\n" sequences
-    cy = cypher.replace("\\n", "\n")
-    
-    # 1. Fix bare 'distance(' -> 'point.distance('
-    # The (?<!point\.) prevents matching if 'point.' is already present
-    cy = re.sub(r"(?<!point\.)\bdistance\s*\(", "point.distance(", cy, flags=re.I)
-    
-    # 2. Fix 'point.point.distance' just in case it still occurs
-    cy = cy.replace("point.point.distance", "point.distance")
-    
-    # Remove leading junk and trim
-    cy = re.sub(r"^[^\w\(\n\r]*", "", cy)
-    cy = cy.strip()
-    
-    return cy
-
-def neo4j_json(v: Any):
+def parse_text_points(data: bytes) -> np.ndarray:
+    """Parse comma- or whitespace-separated coordinates, one point per line, into an (N, cols) array."""
+    text = data.decode("utf-8").strip()
+    if "," in text:
+        text = text.replace(",", " ")
+    first_line = FIRST_LINE_RE.search(text)
+    if first_line is None:
+        raise ValueError("No coordinates found")
+    ncols = len(first_line.group().split())
+    nrows = text.count("\n") + 1
+
+    # np.fromstring parses the whole buffer in C without per-line Python work.
+    # It only warns (and stops) on malformed input, so treat that as a miss,
+    # as well as a value count that doesn't fill every line, and let loadtxt
+    # deal with comments, blank lines or reporting the error
     try:
-        if hasattr(v, "x") and hasattr(v, "y"):
-            return {"x": float(v.x), "y": float(v.y), "z": float(getattr(v, "z", 0.0))}
-        if isinstance(v, dict):
-            return {k: neo4j_json(x) for k, x in v.items()}
-        if isinstance(v, (list, tuple)):
-            return [neo4j_json(x) for x in v]
-        if isinstance(v, (int, float, str, bool)) or v is None:
-            return v
-        return str(v)
-    except Exception:
-        return str(v)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(text, dtype=np.float64, sep=" ")
+        if values.size == nrows * ncols:
+            return values.reshape(nrows, ncols)
+    except (DeprecationWarning, ValueError):
+        pass
+    return np.loadtxt(io.StringIO(text), ndmin=2)
+
+
+def _read_rows(tx, cypher: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return tx.run(cypher, params).data()
+
 
-def run_cypher_and_serialize(cypher: str) -> List[Dict[str, Any]]:
+def run_cypher_with_rewrite(
+    cypher: str,
+    cy_rewrite: Optional[str],
+    params: Optional[Dict[str, Any]] = None
+) -> Tuple[str, List[Dict[str, Any]], bool]:
+    """
+    Run cypher, and cy_rewrite if it returned nothing, on one session's connection.
+    Returns the query that produced the rows, the rows, and whether it was the rewrite.
+    A failing rewrite leaves the (empty) original result.
+    """
     if driver is None:
         raise RuntimeError("Neo4j driver is not available")
+    params = params or {}
     with driver.session(database=NEO4J_DATABASE) as session:
-        results = session.run(cypher).data()
-    json_rows = []
-    for row in results:
-        j = {}
-        for k, v in row.items():
-            j[k] = neo4j_json(v)
-        json_rows.append(j)
-    return json_rows
-
-def fallback_pattern_cypher(question: str, scene_id: Optional[str]) -> Tuple[str, str]:
-    q = (question or "").lower()
-    m = DIST_BETWEEN_RE.search(q)
-    if m and scene_id:
-        a = m.group(1).strip()
-        b = m.group(2).strip()
-        cy = (
-            f"MATCH (a:Segment {{scene_id: '{scene_id}'}}), (b:Segment {{scene_id: '{scene_id}'}}) "
-            f"WHERE toLower(a.semantic_name) CONTAINS toLower('{a}') AND toLower(b.semantic_name) CONTAINS toLower('{b}') "
-            f"RETURN a.id AS a_id, b.id AS b_id, point.distance(a.centroid_point, b.centroid_point) AS dist LIMIT 10"
-        )
-        return cy, f"Distance between {a} and {b}"
-    m2 = WITHIN_RE.search(q)
-    if m2 and scene_id:
-        meters = float(m2.group(2))
-        target = m2.group(4).strip()
-        cy = (
-            f"MATCH (t:Segment {{scene_id: '{scene_id}'}}) "
-            f"WHERE toLower(t.semantic_name) CONTAINS toLower('{target}') "
-            f"WITH t "
-            f"MATCH (o:Segment {{scene_id: '{scene_id}'}}) "
-            f"WHERE o.id <> t.id AND point.distance(t.centroid_point, o.centroid_point) <= {meters} "
-            f"RETURN o.id AS id, o.semantic_name AS semantic_name, point.distance(t.centroid_point, o.centroid_point) AS dist LIMIT 200"
-        )
-        return cy, f"Objects within {meters} m of {target}"
-    m3 = COUNT_RE.search(q)
-    if m3 and scene_id:
-        sem = m3.group(2).strip().split()[0]
-        cy = (
-            f"MATCH (s:Segment {{scene_id: '{scene_id}'}}) "
-            f"WHERE toLower(s.semantic_name) CONTAINS toLower('{sem}') "
-            f"RETURN count(s) AS count"
-        )
-        return cy, f"Count of {sem}"
-    m4 = LIST_RE.search(q)
-    if m4 and scene_id:
-        sem = m4.group(2).strip().split()[0]
-        cy = (
-            f"MATCH (s:Segment {{scene_id: '{scene_id}'}}) "
-            f"WHERE toLower(s.semantic_name) CONTAINS toLower('{sem}') "
-            f"RETURN s.id AS id, s.semantic_name AS semantic_name, s.num_points AS num_points LIMIT 200"
-        )
-        return cy, f"List segments matching {sem}"
-    return "", ""
+        results = session.execute_read(_read_rows, cypher, params)
+        if not results and cy_rewrite and cy_rewrite != cypher:
+            try:
+                rewritten = session.execute_read(_read_rows, cy_rewrite, params)
+            except Exception as e:
+                logger.warning("Rewritten Cypher failed: %s", e)
+            else:
+                if rewritten:
+                    return cy_rewrite, serialize_rows(rewritten), True
+    return cypher, serialize_rows(results), False
+
+# Fallback query templates: user tokens travel as parameters, so each template
+# is planned once by Neo4j and names cannot inject Cypher
+# Segment semantic names are the lowercase S3DIS labels and the question is
+# lowercased, so the CONTAINS matches need no toLower() and can use the index
+DIST_BETWEEN_CYPHER = (
+    "UNWIND $pairs AS pair "
+    "MATCH (a:Segment {scene_id: $scene_id}), (b:Segment {scene_id: $scene_id}) "
+    "WHERE a.semantic_name CONTAINS pair[0] AND b.semantic_name CONTAINS pair[1] "
+    "RETURN a.id AS a_id, b.id AS b_id, point.distance(a.centroid_point, b.centroid_point) AS dist LIMIT $limit"
+)
+WITHIN_CYPHER = (
+    "MATCH (t:Segment {scene_id: $scene_id}) "
+    "WHERE t.semantic_name CONTAINS $target "
+    "WITH t "
+    "MATCH (o:Segment {scene_id: $scene_id}) "
+    "WHERE o.id <> t.id AND point.distance(t.centroid_point, o.centroid_point) <= $meters "
+    "RETURN o.id AS id, o.semantic_name AS semantic_name, point.distance(t.centroid_point, o.centroid_point) AS dist LIMIT 200"
+)
+COUNT_CYPHER = (
+    "MATCH (s:Segment {scene_id: $scene_id}) "
+    "WHERE s.semantic_name CONTAINS $semantic "
+    "RETURN count(s) AS count"
+)
+LIST_CYPHER = (
+    "MATCH (s:Segment {scene_id: $scene_id}) "
+    "WHERE s.semantic_name CONTAINS $semantic "
+    "RETURN s.id AS id, s.semantic_name AS semantic_name, s.num_points AS num_points LIMIT 200"
+)
+
+
+def _distance_query(m: re.Match, scene_id: str) -> Tuple[str, Dict[str, Any], str]:
+    # "distance between a, b and c" measures every pair in one query
+    names = [n.strip() for n in m.group("a").split(",") if n.strip()] + [m.group("b").strip()]
+    pairs = [list(pair) for pair in combinations(names, 2)]
+    params = {"scene_id": scene_id, "pairs": pairs, "limit": 10 * len(pairs)}
+    return DIST_BETWEEN_CYPHER, params, f"Distance between {', '.join(names[:-1])} and {names[-1]}"
+
+
+def _within_query(m: re.Match, scene_id: str) -> Tuple[str, Dict[str, Any], str]:
+    meters = float(m.group("meters"))
+    target = m.group("target").strip()
+    params = {"scene_id": scene_id, "target": target, "meters": meters}
+    return WITHIN_CYPHER, params, f"Objects within {meters} m of {target}"
+
+
+def _count_query(m: re.Match, scene_id: str) -> Tuple[str, Dict[str, Any], str]:
+    sem = m.group("csem").strip().split()[0]
+    return COUNT_CYPHER, {"scene_id": scene_id, "semantic": sem}, f"Count of {sem}"
+
+
+def _list_query(m: re.Match, scene_id: str) -> Tuple[str, Dict[str, Any], str]:
+    sem = m.group("lsem").strip().split()[0]
+    return LIST_CYPHER, {"scene_id": scene_id, "semantic": sem}, f"List segments matching {sem}"
+
+
+# INTENT_RE branch -> query builder
+FALLBACK_BUILDERS = {
+    "dist": _distance_query,
+    "within": _within_query,
+    "count": _count_query,
+    "list": _list_query,
+}
+
+
+def fallback_pattern_cypher(question: str, scene_id: Optional[str]) -> Tuple[str, Dict[str, Any], str]:
+    """Map common question shapes to a parameterized query: (cypher, params, explanation)."""
+    # Every template is scoped to a scene
+    if not scene_id:
+        return "", {}, ""
+    m = INTENT_RE.match((question or "").lower())
+    if not m:
+        return "", {}, ""
+    return FALLBACK_BUILDERS[m.lastgroup](m, scene_id)
+
+
+def question_signature(question: str) -> Tuple:
+    """
+    Numbers and INTENT_RE entities (target, semantic names) of a question
+    The chat cache reuses a similar question's answer only when these match,
+    so "how many chairs" is never answered with the count of tables.
+    """
+    m = INTENT_RE.match(question)
+    if not m:
+        return numeric_tokens(question)
+    _, params, _ = FALLBACK_BUILDERS[m.lastgroup](m, "")
+    entities = sorted((name, repr(value)) for name, value in params.items() if name != "scene_id")
+    return (numeric_tokens(question), m.lastgroup, tuple(entities))
+
+def create_llm_session() -> requests.Session:
+    """HTTP session shared by the LLM calls, so /chat reuses pooled keep-alive connections."""
+    session = requests.Session()
+    # Retry refused connections and gateway errors only: a read timeout means the model is
+    # already generating, and retrying it would multiply the wait (and Gemini billing)
+    retries = Retry(
+        total=2, connect=2, read=False, status=2, backoff_factor=0.2,
+        status_forcelist=[502, 503, 504], allowed_methods=["POST"]
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=LLM_MAX_CONNECTIONS, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+llm_http = create_llm_session()
+LIFESPAN_HOOKS.append((lambda _: None, lambda _: llm_http.close()))
+
 
 def call_gemini(system_instruction: str, user_prompt: str, timeout: int = 30) -> str:
     if not GOOGLE_API_KEY:
         raise RuntimeError("GOOGLE_API_KEY missing in environment")
     headers = {"Content-Type": "application/json", "x-goog-api-key": GOOGLE_API_KEY}
-    merged = (system_instruction.strip() + "\n\n" + user_prompt.strip()).strip()
-    body = {"contents": [{"parts": [{"text": merged}]}]}
+    # The system prompt goes in systemInstruction, ahead of and separate from the
+    # question, so the identical prefix is eligible for Gemini's implicit caching
+    body = {
+        "systemInstruction": {"parts": [{"text": system_instruction.strip()}]},
+        "contents": [{"role": "user", "parts": [{"text": user_prompt.strip()}]}],
+    }
     last_err = None
     for url in MODEL_ENDPOINTS:
         try:
-            resp = requests.post(url, headers=headers, json=body, timeout=timeout)
+            resp = llm_http.post(url, headers=headers, json=body, timeout=timeout)
             if resp.status_code >= 400:
                 last_err = RuntimeError(f"{resp.status_code}: {resp.text}")
                 continue
@@ -369,33 +556,94 @@ def call_gemini(system_instruction: str, user_prompt: str, timeout: int = 30) ->
     raise RuntimeError(f"Gemini failed: {last_err}")
 
 
-def call_ollama(system_instruction: str, user_prompt: str, timeout: int = 60) -> str:
-    """Call local Ollama LLM for text generation."""
-    url = f"{OLLAMA_BASE_URL}/api/generate"
-    merged_prompt = f"{system_instruction.strip()}\n\n{user_prompt.strip()}"
-    
-    body = {
+def ollama_chat_body(system_instruction: str, user_prompt: str, stream: bool = False) -> Dict[str, Any]:
+    """Request body for Ollama's /api/chat."""
+    # A fixed leading system message lets Ollama reuse the prompt's KV cache
+    # across requests while the model stays loaded (keep_alive)
+    return {
         "model": OLLAMA_MODEL,
-        "prompt": merged_prompt,
-        "stream": False,
+        "messages": [
+            {"role": "system", "content": system_instruction.strip()},
+            {"role": "user", "content": user_prompt.strip()},
+        ],
+        "stream": stream,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "options": {
             "temperature": 0.3,
             "num_predict": 500
         }
     }
+
+
+def call_ollama(system_instruction: str, user_prompt: str, timeout: int = 60) -> str:
+    """Call local Ollama LLM for text generation."""
+    url = f"{OLLAMA_BASE_URL}/api/chat"
+    body = ollama_chat_body(system_instruction, user_prompt)
     
     try:
-        resp = requests.post(url, json=body, timeout=timeout)
+        resp = llm_http.post(url, json=body, timeout=timeout)
         if resp.status_code >= 400:
             raise RuntimeError(f"Ollama error {resp.status_code}: {resp.text}")
         data = resp.json()
-        return data.get("response", "")
+        return (data.get("message") or {}).get("content", "")
+    except requests.exceptions.ConnectionError:
+        raise RuntimeError(f"Cannot connect to Ollama at {OLLAMA_BASE_URL}. Make sure Ollama is running.")
+    except Exception as e:
+        raise RuntimeError(f"Ollama failed: {e}")
+
+
+def stream_ollama(system_instruction: str, user_prompt: str, timeout: int = 60) -> Iterator[str]:
+    """Yield the Ollama reply text piece by piece as the model generates it."""
+    url = f"{OLLAMA_BASE_URL}/api/chat"
+    body = ollama_chat_body(system_instruction, user_prompt, stream=True)
+
+    try:
+        with llm_http.post(url, json=body, timeout=timeout, stream=True) as resp:
+            if resp.status_code >= 400:
+                raise RuntimeError(f"Ollama error {resp.status_code}: {resp.text}")
+            # One JSON object per line, the last one flagged "done"
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                text = (chunk.get("message") or {}).get("content", "")
+                if text:
+                    yield text
+                if chunk.get("done"):
+                    break
     except requests.exceptions.ConnectionError:
         raise RuntimeError(f"Cannot connect to Ollama at {OLLAMA_BASE_URL}. Make sure Ollama is running.")
     except Exception as e:
         raise RuntimeError(f"Ollama failed: {e}")
 
 
+def embed_question(text: str, timeout: int = 10) -> Optional[np.ndarray]:
+    """Embed text with the Ollama embedding model; None if Ollama is unavailable."""
+    try:
+        resp = llm_http.post(
+            f"{OLLAMA_BASE_URL}/api/embeddings",
+            json={"model": OLLAMA_EMBED_MODEL, "prompt": text},
+            timeout=timeout,
+        )
+        if resp.status_code >= 400:
+            return None
+        embedding = resp.json().get("embedding")
+        return np.asarray(embedding, dtype=np.float32) if embedding else None
+    except Exception as e:
+        logger.debug("Question embedding failed: %s", e)
+        return None
+
+
+chat_cache = LLMCache(
+    maxsize=CHAT_CACHE_SIZE,
+    ttl=CHAT_CACHE_TTL,
+    similarity=CHAT_CACHE_SIMILARITY,
+    embed=embed_question,
+    dtype=CHAT_CACHE_EMBEDDING_DTYPE,
+    signature=question_signature,
+)
+
+
 def call_llm(system_instruction: str, user_prompt: str, timeout: int = 60) -> str:
     """Call the configured LLM provider (Ollama or Gemini)."""
     if LLM_PROVIDER == "ollama":
@@ -437,7 +685,7 @@ def synthesize_conversational_reply(question: str, cypher: str, rows: List[Dict[
         reply_text = call_llm(sys_inst, prompt)
         if reply_text:
             # strip codeblocks and whitespace
-            reply = re.sub(r"```[\s\S]*?```", "", reply_text).strip()
+            reply = ANY_CODEBLOCK_RE.sub("", reply_text).strip()
             # If reply looks like JSON dump, ignore and fallback
             if reply and not reply.startswith("{"):
                 return reply
@@ -469,63 +717,63 @@ def synthesize_conversational_reply(question: str, cypher: str, rows: List[Dict[
     return f"I found {len(rows)} result(s)."
 
 
-@app.post("/chat")
-async def chat(req: ChatReq):
-    if not req.question or not req.question.strip():
-        raise HTTPException(status_code=400, detail="Empty question")
-
-    cypher = ""
-    llm_explain = ""
-    # 1) Try to get cypher from LLM
-    try:
-        user_prompt = f"Scene ID: {req.scene_id}\nQuestion: {req.question}"
-        raw_llm = call_llm(SYSTEM_PROMPT_GEN_CYPHER, user_prompt)
-    except Exception as e:
-        raw_llm = ""
-        # try local fallback pattern before failing
-        cy_from_pattern, explain = fallback_pattern_cypher(req.question, req.scene_id)
+def cypher_from_llm_text(raw_llm: str, question: str, scene_id: Optional[str]) -> Tuple[str, Dict[str, Any], str]:
+    """Cypher, params and explanation from the LLM reply, or from the question patterns if it has none."""
+    cypher, llm_explain = extract_cypher_from_text(raw_llm)
+    cypher = normalize_distance_and_sanitize(cypher)
+    # if LLM didn't produce cypher, try local pattern fallback
+    if not cypher:
+        cy_from_pattern, pattern_params, explain = fallback_pattern_cypher(question, scene_id)
         if cy_from_pattern:
-            cypher = cy_from_pattern
-            llm_explain = f"(fallback pattern) {explain}"
-        else:
-            raise HTTPException(status_code=502, detail=f"LLM error: {e}")
-    else:
-        cypher, llm_explain = extract_cypher_from_text(raw_llm)
-        cypher = normalize_distance_and_sanitize(cypher)
-        # if LLM didn't produce cypher, try local pattern fallback
-        if not cypher:
-            cy_from_pattern, explain = fallback_pattern_cypher(req.question, req.scene_id)
-            if cy_from_pattern:
-                cypher = cy_from_pattern
-                llm_explain = f"(fallback pattern) {explain}"
+            return cy_from_pattern, pattern_params, f"(fallback pattern) {explain}"
+    return cypher, {}, llm_explain
 
-    if not cypher:
-        return {"llm_text": llm_explain or "No Cypher generated", "cypher": "", "results": [], "final_answer": None, "highlight_segment_id": None}
 
+def cypher_after_llm_error(question: str, scene_id: Optional[str], error: Exception) -> Tuple[str, Dict[str, Any], str]:
+    """Pattern-based Cypher when the LLM call failed; a 502 if no pattern matches."""
+    cy_from_pattern, pattern_params, explain = fallback_pattern_cypher(question, scene_id)
+    if not cy_from_pattern:
+        raise HTTPException(status_code=502, detail=f"LLM error: {error}")
+    return cy_from_pattern, pattern_params, f"(fallback pattern) {explain}"
+
+
+def no_cypher_response(llm_explain: str) -> Dict[str, Any]:
+    return {"llm_text": llm_explain or "No Cypher generated", "cypher": "", "results": [], "final_answer": None, "highlight_segment_id": None}
+
+
+async def query_chat_rows(scene_id: Optional[str], cypher: str, params: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]], bool]:
+    """
+    Check and run generated Cypher, retrying an empty result with :Segment/semantic_name naming.
+    Returns the Cypher that produced the rows, the rows, and whether it was rewritten.
+    """
     if not validate_cypher_readonly(cypher):
         raise HTTPException(status_code=400, detail="Generated Cypher rejected by safety rules")
 
-    if req.scene_id and req.scene_id not in cypher:
+    if scene_id and scene_id not in cypher and params.get("scene_id") != scene_id:
         raise HTTPException(status_code=400, detail="Generated Cypher missing scene_id filter")
 
+    # conservative rewrite, run on the same session only if the original returns nothing
+    cy_rewrite = cypher.replace(":Object", ":Segment").replace("category", "semantic_name").replace("scene:", "scene_id:")
     try:
-        rows = run_cypher_and_serialize(cypher)
+        return await run_in_threadpool(run_cypher_with_rewrite, cypher, cy_rewrite, params)
     except Exception as e:
         # helpful debug info: return cypher attempted
         raise HTTPException(status_code=500, detail=f"Neo4j error: {e}. Cypher: {cypher!r}")
 
-    # conservative rewrite if empty results
-    if not rows:
-        cy_rewrite = cypher.replace(":Object", ":Segment").replace("category", "semantic_name").replace("scene:", "scene_id:")
-        if cy_rewrite != cypher:
-            try:
-                rows2 = run_cypher_and_serialize(cy_rewrite)
-                if rows2:
-                    rows = rows2
-                    cypher = cy_rewrite
-                    llm_explain = (llm_explain or "") + " (rewritten to :Segment/semantic_name)"
-            except Exception:
-                pass
+
+async def build_chat_response(
+    req: ChatReq,
+    cypher: str,
+    params: Dict[str, Any],
+    rows: List[Dict[str, Any]],
+    llm_explain: str
+) -> Dict[str, Any]:
+    """The /chat response for the rows the Cypher returned."""
+    # conversational reply using the LLM (with fallback), generated while the
+    # machine-friendly fields below are worked out
+    synth_task = asyncio.create_task(
+        run_in_threadpool(synthesize_conversational_reply, req.question, cypher, rows)
+    )
 
     highlight_segment_id = None
     if rows:
@@ -554,18 +802,157 @@ async def chat(req: ChatReq):
     except Exception:
         final_answer = None
 
-    # conversational reply using the LLM (with fallback)
     try:
-        conversational_reply = synthesize_conversational_reply(req.question, cypher, rows)
+        conversational_reply = await synth_task
     except Exception:
         conversational_reply = None
 
     return {
         "llm_text": llm_explain,
         "cypher": cypher,
+        "params": params,
         "results": rows,
         "final_answer": final_answer,
         "conversational_reply": conversational_reply,
         "highlight_segment_id": highlight_segment_id,
     }
 
+
+REWRITE_NOTE = " (rewritten to :Segment/semantic_name)"
+
+
+def check_question(question: str) -> None:
+    """Reject empty questions, and questions too long to send to the LLM."""
+    if not question or not question.strip():
+        raise HTTPException(status_code=400, detail="Empty question")
+    if len(question) > CHAT_MAX_QUESTION_CHARS or question.count("\n") > CHAT_MAX_QUESTION_LINES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Question too long (limit {CHAT_MAX_QUESTION_CHARS} characters, {CHAT_MAX_QUESTION_LINES} lines)"
+        )
+
+
+@app.post("/chat", response_class=ORJSONResponse)
+async def chat(req: ChatReq):
+    check_question(req.question)
+
+    # Repeated (or near-identical) questions about a scene skip both LLM calls;
+    # exact repeats are answered before the embedding request is made
+    cached = chat_cache.get(req.scene_id, req.question)
+    if cached is None:
+        cached, question_embedding = await run_in_threadpool(chat_cache.lookup, req.scene_id, req.question)
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    # 1) Try to get cypher from LLM
+    llm_failed = False
+    try:
+        user_prompt = f"Scene ID: {req.scene_id}\nQuestion: {req.question}"
+        raw_llm = await run_in_threadpool(call_llm, SYSTEM_PROMPT_GEN_CYPHER, user_prompt)
+    except Exception as e:
+        # try local fallback pattern before failing
+        llm_failed = True
+        cypher, params, llm_explain = cypher_after_llm_error(req.question, req.scene_id, e)
+    else:
+        cypher, params, llm_explain = cypher_from_llm_text(raw_llm, req.question, req.scene_id)
+
+    if not cypher:
+        return ORJSONResponse(no_cypher_response(llm_explain))
+
+    cypher, rows, rewritten = await query_chat_rows(req.scene_id, cypher, params)
+    if rewritten:
+        llm_explain = (llm_explain or "") + REWRITE_NOTE
+
+    response = await build_chat_response(req, cypher, params, rows, llm_explain)
+    if not llm_failed:
+        # Fallback answers from an LLM outage are not worth replaying once it recovers
+        chat_cache.store(req.scene_id, req.question, response, question_embedding)
+    return ORJSONResponse(response)
+
+
+def _sse_event(event: str, payload: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(payload, default=str) + b"\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatReq):
+    """
+    Answer like /chat, streaming Server-Sent Events
+    Ollama's reply is sent as ``token`` events; as soon as its Cypher code fence
+    closes a ``cypher`` event is sent and the query runs while the explanation
+    is still being generated. The /chat response follows as a ``result`` event
+    (or an ``error`` event). Other providers send no tokens.
+    """
+    check_question(req.question)
+
+    async def event_generator():
+        query_task = None
+        try:
+            cached = chat_cache.get(req.scene_id, req.question)
+            if cached is None:
+                cached, question_embedding = await run_in_threadpool(chat_cache.lookup, req.scene_id, req.question)
+            if cached is not None:
+                yield _sse_event("result", cached)
+                return
+
+            user_prompt = f"Scene ID: {req.scene_id}\nQuestion: {req.question}"
+            raw_llm = ""
+            llm_failed = False
+            try:
+                if LLM_PROVIDER == "gemini":
+                    raw_llm = await run_in_threadpool(call_llm, SYSTEM_PROMPT_GEN_CYPHER, user_prompt)
+                else:
+                    async for chunk in iterate_in_threadpool(stream_ollama(SYSTEM_PROMPT_GEN_CYPHER, user_prompt)):
+                        raw_llm += chunk
+                        yield _sse_event("token", {"text": chunk})
+                        if query_task is None and CODEBLOCK_RE.search(raw_llm):
+                            cypher, params, _ = cypher_from_llm_text(raw_llm, req.question, req.scene_id)
+                            if cypher:
+                                yield _sse_event("cypher", {"cypher": cypher, "params": params})
+                                query_task = asyncio.create_task(query_chat_rows(req.scene_id, cypher, params))
+            except Exception as e:
+                llm_failed = True
+                if query_task is not None:
+                    # The fenced Cypher already arrived; only the explanation was lost
+                    llm_explain = extract_cypher_from_text(raw_llm)[1]
+                else:
+                    cypher, params, llm_explain = cypher_after_llm_error(req.question, req.scene_id, e)
+            else:
+                cypher, params, llm_explain = cypher_from_llm_text(raw_llm, req.question, req.scene_id)
+
+            if query_task is None:
+                if not cypher:
+                    yield _sse_event("result", no_cypher_response(llm_explain))
+                    return
+                yield _sse_event("cypher", {"cypher": cypher, "params": params})
+                query_task = asyncio.create_task(query_chat_rows(req.scene_id, cypher, params))
+
+            cypher, rows, rewritten = await query_task
+            if rewritten:
+                llm_explain = (llm_explain or "") + REWRITE_NOTE
+
+            response = await build_chat_response(req, cypher, params, rows, llm_explain)
+            if not llm_failed:
+                chat_cache.store(req.scene_id, req.question, response, question_embedding)
+            yield _sse_event("result", response)
+        except HTTPException as e:
+            yield _sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            logger.error(f"Chat stream failed: {e}")
+            yield _sse_event("error", {"status_code": 500, "detail": str(e)})
+        finally:
+            if query_task is not None and not query_task.done():
+                query_task.cancel()
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/chat/cache")
+def chat_cache_stats():
+    """Hit/miss counters of the /chat response cache."""
+    return chat_cache.stats()
+
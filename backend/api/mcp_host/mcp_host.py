@@ -22,11 +22,20 @@ References:
 """
 
 import asyncio
+import functools
+import hashlib
+import importlib.util
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import os
+import shutil
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
+
+import orjson
 
 # MCP SDK imports
 try:
@@ -38,10 +47,12 @@ except ImportError:
         "MCP SDK not installed. Run: pip install mcp"
     )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Level and handlers are left to the application (see main() for the CLI)
 logger = logging.getLogger(__name__)
 
+# Tool lists from earlier runs, keyed by server command, source files and protocol version
+TOOLS_CACHE_DIR = Path.home() / ".cache" / "bimtwinops" / "mcp_tools"
+
 
 class MCPServerType(Enum):
     """Supported MCP server types"""
@@ -51,7 +62,7 @@ class MCPServerType(Enum):
     OPENSEARCH = "opensearch"
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPServerConfig:
     """Configuration for an MCP server connection"""
     name: str
@@ -62,16 +73,104 @@ class MCPServerConfig:
     max_retries: int = 3
     timeout: int = 30  # seconds
     enabled: bool = True
+    # Reconnect delay after a failed connect, doubled per consecutive failure
+    backoff_base: float = 0.5  # seconds
+    backoff_cap: float = 30.0  # seconds
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPConnection:
     """Represents an active MCP server connection"""
     config: MCPServerConfig
-    session: ClientSession
+    session: Optional[ClientSession]
+    # Absolute path of config.command, resolved once when the server is added
+    command: str = ""
     tools: List[Tool] = field(default_factory=list)
+    # Names of `tools`, for the per-call existence check
+    tool_names: frozenset = field(default_factory=frozenset)
     is_connected: bool = False
     retry_count: int = 0
+    # Monotonic time before which connect() is not retried
+    next_retry_at: float = 0.0
+    # Task holding the server process and session open until `closing` is set
+    runner: Optional[asyncio.Task] = None
+    closing: Optional[asyncio.Event] = None
+    # Serializes connect/disconnect so concurrent callers spawn one process
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def _source_mtimes(connection: MCPConnection) -> Optional[List[float]]:
+    """
+    Modification times of the executable and code behind a server, or None
+    if they cannot all be found (its tools are then not cached)
+    """
+    mtimes = [os.path.getmtime(connection.command)]
+    
+    args = connection.config.args
+    if "-m" in args:
+        # python -m package.module: fingerprint the module's source files
+        index = args.index("-m") + 1
+        try:
+            spec = importlib.util.find_spec(args[index]) if index < len(args) else None
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+            return None
+        if spec.submodule_search_locations:
+            root = os.path.dirname(spec.origin)
+            mtimes.extend(
+                os.path.getmtime(os.path.join(root, name))
+                for name in sorted(os.listdir(root)) if name.endswith(".py")
+            )
+        else:
+            mtimes.append(os.path.getmtime(spec.origin))
+    else:
+        mtimes.extend(os.path.getmtime(arg) for arg in args if os.path.isfile(arg))
+    return mtimes
+
+
+def _tools_cache_key(connection: MCPConnection, init_result: Any) -> Optional[str]:
+    """Disk cache key for a server's tool list, or None if it should not be cached"""
+    config = connection.config
+    try:
+        mtimes = _source_mtimes(connection)
+    except OSError:
+        return None
+    if mtimes is None:
+        return None
+    info = init_result.model_dump(mode="json", by_alias=True)
+    fingerprint = json.dumps(
+        [connection.command, config.args, mtimes, info.get("protocolVersion"), info.get("serverInfo")],
+        sort_keys=True
+    )
+    return hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _load_cached_tools(key: Optional[str]) -> Optional[List[Tool]]:
+    if key is None:
+        return None
+    try:
+        with open(TOOLS_CACHE_DIR / f"{key}.json", "rb") as f:
+            return [Tool.model_validate(tool) for tool in json.load(f)]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable MCP tools cache {key}: {str(e)}")
+        return None
+
+
+def _store_cached_tools(key: Optional[str], tools: List[Tool]):
+    if key is None:
+        return
+    try:
+        TOOLS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = TOOLS_CACHE_DIR / f"{key}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([tool.model_dump(mode="json", by_alias=True, exclude_none=True) for tool in tools], f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Could not write MCP tools cache: {str(e)}")
 
 
 class MCPConnectionPool:
@@ -88,7 +187,10 @@ class MCPConnectionPool:
     def __init__(self, max_pool_size: int = 10):
         self.connections: Dict[str, MCPConnection] = {}
         self.max_pool_size = max_pool_size
-        self._lock = asyncio.Lock()
+        # Guards only the size check and insert; connect/disconnect lock per connection
+        self._pool_lock = asyncio.Lock()
+        # Bumped whenever the set of servers or their tools may have changed
+        self.epoch = 0
     
     async def add_connection(self, config: MCPServerConfig) -> bool:
         """
@@ -100,43 +202,43 @@ class MCPConnectionPool:
         Returns:
             True if connection successful, False otherwise
         """
-        async with self._lock:
+        # Resolve the executable once, so a missing one fails here rather than on every connect
+        command = shutil.which(config.command)
+        if command is None:
+            logger.error(f"Cannot add {config.name}: command {config.command!r} not found on PATH")
+            return False
+        
+        try:
+            # Initialize connection (will be established on first use)
+            connection = MCPConnection(
+                config=config,
+                session=None,  # Will be initialized when connecting
+                command=command,
+            )
+        except Exception as e:
+            logger.error(f"Failed to add connection {config.name}: {str(e)}")
+            return False
+        
+        async with self._pool_lock:
             if len(self.connections) >= self.max_pool_size:
                 logger.warning(f"Connection pool full, cannot add {config.name}")
                 return False
             
-            if config.name in self.connections:
+            if self.connections.setdefault(config.name, connection) is not connection:
                 logger.warning(f"Connection {config.name} already exists")
                 return False
-            
-            try:
-                # Create stdio client for the MCP server
-                server_params = StdioServerParameters(
-                    command=config.command,
-                    args=config.args,
-                    env=config.env
-                )
-                
-                # Initialize connection (will be established on first use)
-                connection = MCPConnection(
-                    config=config,
-                    session=None,  # Will be initialized when connecting
-                )
-                
-                self.connections[config.name] = connection
-                logger.info(f"Added MCP server: {config.name} ({config.type.value})")
-                return True
-                
-            except Exception as e:
-                logger.error(f"Failed to add connection {config.name}: {str(e)}")
-                return False
+            self.epoch += 1
+        
+        logger.info("Added MCP server: %s (%s)", config.name, config.type.value)
+        return True
     
-    async def connect(self, server_name: str) -> bool:
+    async def connect(self, server_name: str, refresh_tools: bool = False) -> bool:
         """
         Establish connection to an MCP server
         
         Args:
             server_name: Name of the server to connect to
+            refresh_tools: Ask the server for its tools even if they are cached on disk
             
         Returns:
             True if connection successful
@@ -147,46 +249,99 @@ class MCPConnectionPool:
         
         connection = self.connections[server_name]
         
-        if connection.is_connected:
-            logger.debug(f"Server {server_name} already connected")
+        async with connection.lock:
+            if connection.is_connected:
+                logger.debug("Server %s already connected", server_name)
+                return True
+            
+            if time.monotonic() < connection.next_retry_at:
+                # Still backing off from the last failure; fail fast
+                return False
+            
+            ready = asyncio.get_running_loop().create_future()
+            connection.closing = asyncio.Event()
+            connection.runner = asyncio.create_task(
+                self._serve(connection, ready, refresh_tools),
+                name=f"mcp-{server_name}"
+            )
+            
+            try:
+                await ready
+            except Exception as e:
+                connection.runner = None
+                delay = self._schedule_retry(connection)
+                logger.error(
+                    f"Failed to connect to {server_name} "
+                    f"(attempt {connection.retry_count}, retrying in {delay:.1f}s): {str(e)}"
+                )
+                return False
+            
+            logger.info("Connected to %s: %d tools available", server_name, len(connection.tools))
             return True
+    
+    @staticmethod
+    def _schedule_retry(connection: MCPConnection) -> float:
+        """Count a failure and hold off reconnecting for an exponentially growing delay"""
+        delay = min(
+            connection.config.backoff_base * (2 ** connection.retry_count),
+            connection.config.backoff_cap
+        )
+        connection.next_retry_at = time.monotonic() + delay
+        connection.retry_count += 1
+        return delay
+    
+    async def _serve(self, connection: MCPConnection, ready: asyncio.Future, refresh_tools: bool = False):
+        """
+        Keep a server's stdio process and client session open until disconnect
+        
+        The stdio/session context managers must be exited by the task that
+        entered them, so each connection gets its own task that holds them
+        for the connection's lifetime. `ready` is resolved once the session is
+        initialized (or with the error that prevented it).
+        """
+        server_params = StdioServerParameters(
+            command=connection.command,
+            args=connection.config.args,
+            env=connection.config.env
+        )
         
         try:
-            server_params = StdioServerParameters(
-                command=connection.config.command,
-                args=connection.config.args,
-                env=connection.config.env
-            )
-            
-            # Create client session
             async with stdio_client(server_params) as (read, write):
                 async with ClientSession(read, write) as session:
-                    # Initialize connection
-                    await session.initialize()
+                    timeout = connection.config.timeout
+                    init_result = await asyncio.wait_for(session.initialize(), timeout=timeout)
                     
-                    # Discover available tools
-                    tools_result = await session.list_tools()
-                    connection.tools = tools_result.tools
+                    # Discover available tools, unless this server build listed them before
+                    cache_key = _tools_cache_key(connection, init_result)
+                    tools = None if refresh_tools else _load_cached_tools(cache_key)
+                    if tools is None:
+                        tools_result = await asyncio.wait_for(session.list_tools(), timeout=timeout)
+                        tools = tools_result.tools
+                        _store_cached_tools(cache_key, tools)
+                    connection.tools = tools
+                    connection.tool_names = frozenset(t.name for t in tools)
                     
                     connection.session = session
                     connection.is_connected = True
                     connection.retry_count = 0
+                    connection.next_retry_at = 0.0
+                    self.epoch += 1
+                    ready.set_result(True)
                     
-                    logger.info(
-                        f"Connected to {server_name}: "
-                        f"{len(connection.tools)} tools available"
-                    )
-                    
-                    return True
-                    
+                    await connection.closing.wait()
         except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.error(f"Connection to {connection.config.name} lost: {str(e)}")
+        finally:
+            if connection.is_connected:
+                # Disconnected or lost: its tools are no longer available
+                self.epoch += 1
+            connection.session = None
             connection.is_connected = False
-            connection.retry_count += 1
-            logger.error(
-                f"Failed to connect to {server_name} "
-                f"(attempt {connection.retry_count}): {str(e)}"
-            )
-            return False
+            if not ready.done():
+                ready.set_exception(ConnectionError("Connection closed during startup"))
     
     async def disconnect(self, server_name: str) -> bool:
         """
@@ -204,19 +359,22 @@ class MCPConnectionPool:
         
         connection = self.connections[server_name]
         
-        try:
-            if connection.session:
-                # Close the session
-                # Note: Actual cleanup depends on MCP SDK implementation
+        async with connection.lock:
+            try:
+                if connection.runner:
+                    # Let the runner task close the session and stop the server process
+                    connection.closing.set()
+                    await connection.runner
+                    connection.runner = None
+                
                 connection.session = None
-            
-            connection.is_connected = False
-            logger.info(f"Disconnected from {server_name}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error disconnecting from {server_name}: {str(e)}")
-            return False
+                connection.is_connected = False
+                logger.info("Disconnected from %s", server_name)
+                return True
+                
+            except Exception as e:
+                logger.error(f"Error disconnecting from {server_name}: {str(e)}")
+                return False
     
     async def get_tools(self, server_name: Optional[str] = None) -> Dict[str, List[Tool]]:
         """
@@ -267,6 +425,88 @@ class MCPConnectionPool:
             ValueError: If server or tool not found
             RuntimeError: If tool execution fails
         """
+        connection = await self._connection_for(server_name, tool_name)
+        
+        timeout = connection.config.timeout
+        try:
+            # Call the tool
+            result = await asyncio.wait_for(
+                connection.session.call_tool(tool_name, arguments),
+                timeout=timeout
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Called %s.%s successfully", server_name, tool_name)
+            return result
+            
+        except asyncio.TimeoutError:
+            raise await self._timed_out(connection, tool_name)
+        except Exception as e:
+            logger.error(f"Error calling {server_name}.{tool_name}: {str(e)}", exc_info=True)
+            raise RuntimeError(f"Tool execution failed: {str(e)}")
+    
+    async def call_tool_stream(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: Dict[str, Any]
+    ) -> AsyncIterator[Union[Dict[str, Any], CallToolResult]]:
+        """
+        Call a tool, yielding its progress notifications as they arrive
+        
+        Each progress notification is yielded as a dict with `progress`,
+        `total` and `message`, and the final item is the CallToolResult. A
+        tool that reports no progress yields just its result. The timeout
+        applies to the gap between items rather than the whole call.
+        
+        Args:
+            server_name: Name of the server
+            tool_name: Name of the tool to call
+            arguments: Tool arguments
+            
+        Raises:
+            ValueError: If server or tool not found
+            RuntimeError: If tool execution fails
+        """
+        connection = await self._connection_for(server_name, tool_name)
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def on_progress(progress: float, total: Optional[float], message: Optional[str]):
+            queue.put_nowait({"progress": progress, "total": total, "message": message})
+        
+        try:
+            request = connection.session.call_tool(tool_name, arguments, progress_callback=on_progress)
+        except TypeError:
+            # SDK without progress callbacks: the result is the only item
+            request = connection.session.call_tool(tool_name, arguments)
+        call = asyncio.create_task(request)
+        call.add_done_callback(lambda _: queue.put_nowait(None))
+        
+        timeout = connection.config.timeout
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    raise await self._timed_out(connection, tool_name)
+                if item is None:
+                    break
+                yield item
+            
+            try:
+                result = call.result()
+            except Exception as e:
+                logger.error(f"Error calling {server_name}.{tool_name}: {str(e)}", exc_info=True)
+                raise RuntimeError(f"Tool execution failed: {str(e)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Called %s.%s successfully", server_name, tool_name)
+            yield result
+        finally:
+            # Consumer stopped early or the call failed: abandon the request
+            call.cancel()
+    
+    async def _connection_for(self, server_name: str, tool_name: str) -> MCPConnection:
+        """Connected connection for a tool call, raising if the server or tool is unknown"""
         if server_name not in self.connections:
             raise ValueError(f"Server {server_name} not found in pool")
         
@@ -279,22 +519,22 @@ class MCPConnectionPool:
                 raise RuntimeError(f"Failed to connect to {server_name}")
         
         # Verify tool exists
-        tool_names = [t.name for t in connection.tools]
-        if tool_name not in tool_names:
+        if tool_name not in connection.tool_names:
             raise ValueError(
                 f"Tool {tool_name} not found on server {server_name}. "
-                f"Available tools: {tool_names}"
+                f"Available tools: {sorted(connection.tool_names)}"
             )
         
-        try:
-            # Call the tool
-            result = await connection.session.call_tool(tool_name, arguments)
-            logger.info(f"Called {server_name}.{tool_name} successfully")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error calling {server_name}.{tool_name}: {str(e)}", exc_info=True)
-            raise RuntimeError(f"Tool execution failed: {str(e)}")
+        return connection
+    
+    async def _timed_out(self, connection: MCPConnection, tool_name: str) -> RuntimeError:
+        """Stop a server that stopped answering, back off, and return the error to raise"""
+        server_name = connection.config.name
+        timeout = connection.config.timeout
+        logger.error(f"Timed out calling {server_name}.{tool_name} after {timeout}s")
+        await self.disconnect(server_name)
+        self._schedule_retry(connection)
+        return RuntimeError(f"Tool {server_name}.{tool_name} timed out after {timeout}s")
     
     async def health_check(self) -> Dict[str, bool]:
         """
@@ -305,20 +545,15 @@ class MCPConnectionPool:
         """
         health = {}
         
+        # Reconnect every disconnected server at once rather than one by one
+        names = [name for name, conn in self.connections.items() if not conn.is_connected]
+        results = await asyncio.gather(*(self.connect(name) for name in names), return_exceptions=True)
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Health check failed for {name}: {str(result)}")
+        
         for name, conn in self.connections.items():
-            try:
-                if not conn.is_connected:
-                    await self.connect(name)
-                
-                # Try to list tools as a health check
-                if conn.is_connected:
-                    health[name] = True
-                else:
-                    health[name] = False
-                    
-            except Exception as e:
-                logger.error(f"Health check failed for {name}: {str(e)}")
-                health[name] = False
+            health[name] = conn.is_connected
         
         return health
     
@@ -336,9 +571,24 @@ class MCPHost:
     methods for agent interactions with MCP servers.
     """
     
-    def __init__(self, pool_size: int = 10):
+    def __init__(
+        self,
+        pool_size: int = 10,
+        tools_cache_ttl: float = 300.0,
+        health_interval: Optional[float] = 30.0
+    ):
         self.pool = MCPConnectionPool(max_pool_size=pool_size)
         self._initialized = False
+        # Seconds between background reconnects of dropped servers (None disables them)
+        self.health_interval = health_interval
+        self._health_task: Optional[asyncio.Task] = None
+        # discover_tools() result, reused until the TTL passes or the pool epoch changes
+        self._tools_cache: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._tools_cache_ts: float = 0.0
+        self._tools_cache_epoch: int = -1
+        self._tools_cache_ttl = tools_cache_ttl
+        # JSON encoding of _tools_cache, built on first discover_tools_bytes() call
+        self._tools_cache_bytes: Optional[bytes] = None
     
     async def initialize(self, configs: List[MCPServerConfig]):
         """
@@ -349,13 +599,16 @@ class MCPHost:
         """
         logger.info("Initializing MCP Host...")
         
-        for config in configs:
-            if config.enabled:
-                success = await self.pool.add_connection(config)
-                if not success:
-                    logger.warning(f"Failed to add server: {config.name}")
+        enabled = [config for config in configs if config.enabled]
+        results = await asyncio.gather(
+            *(self.pool.add_connection(config) for config in enabled),
+            return_exceptions=True
+        )
+        for config, result in zip(enabled, results):
+            if result is not True:
+                logger.warning(f"Failed to add server: {config.name}")
         
-        # Perform initial health check
+        # Perform initial health check (connects to all servers concurrently)
         health = await self.pool.health_check()
         healthy_count = sum(1 for status in health.values() if status)
         
@@ -363,18 +616,40 @@ class MCPHost:
             f"MCP Host initialized: {healthy_count}/{len(configs)} servers healthy"
         )
         
+        if self.health_interval and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop(), name="mcp-health")
+        
         self._initialized = True
     
+    async def _health_loop(self):
+        """Reconnect dropped servers on a schedule, off the callers' path"""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self.pool.health_check()
+            except Exception as e:
+                logger.warning(f"Background MCP health check failed: {str(e)}")
+    
     async def discover_tools(self) -> Dict[str, List[Dict[str, Any]]]:
         """
         Discover all available tools across all servers
         
+        The result is cached for `tools_cache_ttl` seconds, or until a server
+        is added, connected or disconnected; callers must not modify it.
+        
         Returns:
             Dictionary mapping server names to tool definitions
         """
         if not self._initialized:
             raise RuntimeError("MCP Host not initialized")
         
+        if (
+            self._tools_cache is not None
+            and self._tools_cache_epoch == self.pool.epoch
+            and time.monotonic() - self._tools_cache_ts < self._tools_cache_ttl
+        ):
+            return self._tools_cache
+        
         tools_by_server = await self.pool.get_tools()
         
         # Convert Tool objects to dictionaries for easier use
@@ -389,8 +664,23 @@ class MCPHost:
                 for tool in tools
             ]
         
+        self._tools_cache = result
+        self._tools_cache_bytes = None
+        self._tools_cache_ts = time.monotonic()
+        self._tools_cache_epoch = self.pool.epoch
         return result
     
+    async def discover_tools_bytes(self) -> bytes:
+        """
+        discover_tools() encoded as JSON, for passing tool schemas to an LLM
+        
+        The encoding is cached alongside the discover_tools() result.
+        """
+        tools = await self.discover_tools()
+        if self._tools_cache_bytes is None:
+            self._tools_cache_bytes = orjson.dumps(tools)
+        return self._tools_cache_bytes
+    
     async def execute_tool(
         self,
         server_name: str,
@@ -417,14 +707,66 @@ class MCPHost:
     # Alias for consistency with agent code
     call_tool = execute_tool
     
+    async def execute_tool_stream(
+        self,
+        server_name: str,
+        tool_name: str,
+        **kwargs
+    ) -> AsyncIterator[Union[Dict[str, Any], CallToolResult]]:
+        """
+        Execute a tool, yielding progress updates before its result
+        
+        Use as ``async for item in host.execute_tool_stream(...)``; progress
+        updates are dicts with `progress`, `total` and `message`, and the
+        last item is the CallToolResult.
+        
+        Args:
+            server_name: Name of the MCP server
+            tool_name: Name of the tool
+            **kwargs: Tool arguments
+        """
+        if not self._initialized:
+            raise RuntimeError("MCP Host not initialized")
+        
+        async for item in self.pool.call_tool_stream(server_name, tool_name, kwargs):
+            yield item
+    
+    async def call_tools_batch(
+        self,
+        calls: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> List[Union[CallToolResult, Exception]]:
+        """
+        Execute independent tools concurrently
+        
+        Calls on the same server share its session; MCP matches responses to
+        requests by id, so they may be in flight together.
+        
+        Args:
+            calls: (server_name, tool_name, arguments) tuples
+            
+        Returns:
+            Results in the order of `calls`; a failed call yields its exception
+        """
+        if not self._initialized:
+            raise RuntimeError("MCP Host not initialized")
+        
+        return await asyncio.gather(
+            *(self.pool.call_tool(server, tool, arguments) for server, tool, arguments in calls),
+            return_exceptions=True
+        )
+    
     async def health_status(self) -> Dict[str, Any]:
         """
         Get comprehensive health status of all servers
         
+        Reports the current connection state without contacting the
+        servers; dropped servers are reconnected by the background health
+        check every `health_interval` seconds.
+        
         Returns:
             Health status report
         """
-        health = await self.pool.health_check()
+        health = {name: conn.is_connected for name, conn in self.pool.connections.items()}
         
         return {
             "healthy": sum(1 for status in health.values() if status),
@@ -435,12 +777,62 @@ class MCPHost:
     async def shutdown(self):
         """Gracefully shutdown the MCP host"""
         logger.info("Shutting down MCP Host...")
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
         await self.pool.close_all()
         self._initialized = False
 
 
+@functools.cache
+def _load_default_configs() -> Tuple[MCPServerConfig, ...]:
+    """
+    Default server configurations, read from the environment on first use
+    (call ``_load_default_configs.cache_clear()`` after changing it)
+    """
+    return (
+        MCPServerConfig(
+            name="neo4j",
+            type=MCPServerType.NEO4J,
+            command="python",
+            args=["-m", "api.mcp_servers.neo4j"],
+            env={"NEO4J_URI": os.getenv("NEO4J_URI", "bolt://localhost:7687")}
+        ),
+        MCPServerConfig(
+            name="basex",
+            type=MCPServerType.BASEX,
+            command="python",
+            args=["-m", "api.mcp_servers.basex"],
+            env={
+                "BASEX_HOST": os.getenv("BASEX_HOST", "localhost"),
+                "BASEX_PORT": os.getenv("BASEX_PORT", "8984")
+            }
+        ),
+        MCPServerConfig(
+            name="bsdd",
+            type=MCPServerType.BSDD,
+            command="python",
+            args=["-m", "api.mcp_servers.bsdd"],
+            enabled=True
+        ),
+        MCPServerConfig(
+            name="opensearch",
+            type=MCPServerType.OPENSEARCH,
+            command="python",
+            args=["-m", "api.mcp_servers.opensearch"],
+            env={"OPENSEARCH_URL": os.getenv("OPENSEARCH_URL", "http://localhost:9200")}
+        ),
+    )
+
+
 # Global MCP host instance
 _mcp_host: Optional[MCPHost] = None
+# Held while the global host is created so concurrent callers start one set of servers
+_mcp_host_lock = asyncio.Lock()
 
 
 async def get_mcp_host() -> MCPHost:
@@ -452,42 +844,22 @@ async def get_mcp_host() -> MCPHost:
     """
     global _mcp_host
     
-    if _mcp_host is None:
-        _mcp_host = MCPHost(pool_size=10)
-        
-        # Default configurations (will be loaded from env/config in production)
-        configs = [
-            MCPServerConfig(
-                name="neo4j",
-                type=MCPServerType.NEO4J,
-                command="python",
-                args=["-m", "api.mcp_servers.neo4j"],
-                env={"NEO4J_URI": "bolt://localhost:7687"}
-            ),
-            MCPServerConfig(
-                name="basex",
-                type=MCPServerType.BASEX,
-                command="python",
-                args=["-m", "api.mcp_servers.basex"],
-                env={"BASEX_HOST": "localhost", "BASEX_PORT": "8984"}
-            ),
-            MCPServerConfig(
-                name="bsdd",
-                type=MCPServerType.BSDD,
-                command="python",
-                args=["-m", "api.mcp_servers.bsdd"],
-                enabled=True
-            ),
-            MCPServerConfig(
-                name="opensearch",
-                type=MCPServerType.OPENSEARCH,
-                command="python",
-                args=["-m", "api.mcp_servers.opensearch"],
-                env={"OPENSEARCH_URL": "http://localhost:9200"}
-            ),
-        ]
-        
-        await _mcp_host.initialize(configs)
+    if _mcp_host is not None and _mcp_host._initialized:
+        return _mcp_host
+    
+    async with _mcp_host_lock:
+        if _mcp_host is not None and _mcp_host._initialized:
+            return _mcp_host
+        
+        host = MCPHost(pool_size=10)
+        
+        try:
+            await host.initialize(list(_load_default_configs()))
+        except BaseException:
+            await host.shutdown()
+            raise
+        # Published only once initialized, so a failed start is retried by the next caller
+        _mcp_host = host
     
     return _mcp_host
 
@@ -524,4 +896,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
@@ -22,10 +22,12 @@ References:
 """
 
 from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict, deque
+import asyncio
 import logging
 import json
+import os
 from datetime import datetime
-from urllib.parse import quote
 import hashlib
 
 # MCP imports
@@ -48,6 +50,85 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Audit entries are buffered and written as one resource per batch
+AUDIT_BUFFER_MAX = int(os.getenv("BASEX_AUDIT_BUFFER_MAX", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("BASEX_AUDIT_FLUSH_INTERVAL", "30"))  # seconds
+
+# Query handles kept open per session, least recently used closed first
+PREPARED_QUERY_CACHE_SIZE = 128
+
+# Fixed XQuery texts; values are bound as external variables, never interpolated.
+# Each document's versions live under docs/<sha1 of uri>/ ($path, see _doc_path),
+# so they are opened by path instead of scanning every document for its @uri
+NEXT_VERSION_QUERY = """
+declare variable $db external;
+declare variable $path external;
+declare variable $uri external;
+let $versions := db:open($db, $path)/document[@uri = $uri]/version
+return if (exists($versions))
+       then max($versions/@number/number()) + 1
+       else 1
+"""
+
+VERSIONS_WITH_CONTENT_QUERY = """
+declare variable $db external;
+declare variable $path external;
+declare variable $uri external;
+declare variable $limit external;
+(
+    for $version in db:open($db, $path)/document[@uri = $uri]/version
+    order by $version/@timestamp descending
+    return $version
+)[position() <= xs:integer($limit)]
+"""
+
+VERSIONS_QUERY = """
+declare variable $db external;
+declare variable $path external;
+declare variable $uri external;
+declare variable $limit external;
+(
+    for $version in db:open($db, $path)/document[@uri = $uri]/version
+    order by $version/@timestamp descending
+    return
+        <version number="{$version/@number}"
+                 checksum="{$version/@checksum}"
+                 timestamp="{$version/@timestamp}">
+            {$version/metadata}
+        </version>
+)[position() <= xs:integer($limit)]
+"""
+
+# Moves documents stored under the old document_<uri>_v<n>.xml names to docs/<sha1>/v<n>.xml
+MIGRATE_DOCUMENT_PATHS_QUERY = """
+declare variable $db external;
+for $path in db:list($db)[not(starts-with(., 'docs/'))]
+let $doc := db:open($db, $path)/document
+where exists($doc/@uri)
+return db:rename(
+    $db,
+    $path,
+    'docs/' || lower-case(string(xs:hexBinary(hash:sha1(string($doc/@uri)))))
+        || '/v' || $doc/version/@number || '.xml'
+)
+"""
+
+# Empty $uri / $start and 'all' for $operation disable that filter
+AUDIT_TRAIL_QUERY = """
+declare variable $uri external;
+declare variable $operation external;
+declare variable $start external;
+declare variable $limit external;
+(
+    for $entry in db:open('audit_log')//entry
+    where ($uri = '' or $entry/uri = $uri)
+      and ($operation = 'all' or $entry/operation = $operation)
+      and ($start = '' or $entry/@timestamp >= $start)
+    order by $entry/@timestamp descending
+    return $entry
+)[position() <= xs:integer($limit)]
+"""
+
 
 class BaseXMCPServer:
     """
@@ -83,12 +164,20 @@ class BaseXMCPServer:
         # Database name for bSDD documents
         self.db_name = "bsdd_documents"
         
+        # Serialized audit <entry> elements waiting for the next flush
+        self._audit_buf: deque = deque()
+        self._audit_flusher_task: Optional[asyncio.Task] = None
+        
+        # Query text -> open query handle on the current session
+        self._prepared: "OrderedDict[str, Any]" = OrderedDict()
+        
         # Register tool handlers
         self._register_tools()
     
     def connect(self):
         """Establish connection to BaseX server"""
         try:
+            self._close_prepared()
             self.session = BaseXClient(
                 self.host,
                 self.port,
@@ -96,6 +185,11 @@ class BaseXMCPServer:
                 self.password
             )
             
+            # Index attribute values (@uri) and keep the indexes current on ADD;
+            # these options apply when the database is created
+            for option in ("UPDINDEX", "ATTRINDEX", "TOKENINDEX"):
+                self.session.execute(f"SET {option} true")
+            
             # Create database if it doesn't exist
             try:
                 self.session.execute(f"CHECK {self.db_name}")
@@ -103,18 +197,91 @@ class BaseXMCPServer:
                 logger.info(f"Creating database: {self.db_name}")
                 self.session.execute(f"CREATE DB {self.db_name}")
             
+            self._prepare_documents_db()
+            
             logger.info(f"Connected to BaseX at {self.host}:{self.port}")
             
+            # Flush buffered audit entries periodically when running in an event loop
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None and self._audit_flusher_task is None:
+                self._audit_flusher_task = loop.create_task(self._audit_flusher())
+            
         except Exception as e:
             logger.error(f"Failed to connect to BaseX: {str(e)}")
             raise
     
+    def _prepare_documents_db(self):
+        """Move documents to their per-URI paths and build the attribute/token indexes"""
+        try:
+            self.session.execute(f"OPEN {self.db_name}")
+            migrate = self.session.query(MIGRATE_DOCUMENT_PATHS_QUERY)
+            migrate.bind("$db", self.db_name)
+            migrate.execute()
+            self._close_query(migrate)
+            self.session.execute("CREATE INDEX ATTRIBUTE")
+            self.session.execute("CREATE INDEX TOKEN")
+        except Exception as e:
+            # Lookups still work without the indexes, just more slowly
+            logger.warning(f"Could not prepare {self.db_name} indexes: {str(e)}")
+    
+    @staticmethod
+    def _doc_path(uri: str) -> str:
+        """Database directory holding every version of the document with this URI"""
+        return f"docs/{hashlib.sha1(uri.encode('utf-8')).hexdigest()}/"
+    
     def disconnect(self):
         """Close BaseX connection"""
+        if self._audit_flusher_task is not None:
+            self._audit_flusher_task.cancel()
+            self._audit_flusher_task = None
         if self.session:
+            self._flush_audit()
+            self._close_prepared()
             self.session.close()
             logger.info("Disconnected from BaseX")
     
+    def _run_prepared(self, query: str, **bindings: Any) -> str:
+        """
+        Execute one of the fixed queries with its external variables bound
+        
+        The query handle is created on first use and reused for later calls
+        on the same session, saving the QUERY round trip per execution.
+        """
+        handle = self._prepared.pop(query, None)
+        if handle is None:
+            handle = self.session.query(query)
+            while len(self._prepared) >= PREPARED_QUERY_CACHE_SIZE:
+                _, evicted = self._prepared.popitem(last=False)
+                self._close_query(evicted)
+        
+        try:
+            for name, value in bindings.items():
+                handle.bind(f"${name}", value)
+            result = handle.execute()
+        except Exception:
+            # The handle may be unusable (e.g. the session dropped); prepare it again next time
+            self._close_query(handle)
+            raise
+        
+        self._prepared[query] = handle
+        return result
+    
+    @staticmethod
+    def _close_query(handle: Any):
+        try:
+            handle.close()
+        except Exception:
+            pass
+    
+    def _close_prepared(self):
+        """Close every cached query handle"""
+        for handle in self._prepared.values():
+            self._close_query(handle)
+        self._prepared.clear()
+    
     def _register_tools(self):
         """Register MCP tools"""
         
@@ -301,15 +468,10 @@ class BaseXMCPServer:
         checksum = hashlib.sha256(content.encode('utf-8')).hexdigest()
         
         # Create version number (query existing versions)
-        version_query = f"""
-        let $versions := db:open('{self.db_name}')//document[@uri='{uri}']/version
-        return if (exists($versions)) 
-               then max($versions/@number/number()) + 1
-               else 1
-        """
-        
         try:
-            version_result = self.session.query(version_query).execute()
+            version_result = self._run_prepared(
+                NEXT_VERSION_QUERY, db=self.db_name, path=self._doc_path(uri), uri=uri
+            )
             version_number = int(version_result) if version_result else 1
         except (ValueError, AttributeError):
             version_number = 1
@@ -347,8 +509,7 @@ class BaseXMCPServer:
             """
         
         # Store document using ADD command
-        safe_uri = quote(uri, safe='')
-        resource_name = f"document_{safe_uri}_v{version_number}.xml"
+        resource_name = f"{self._doc_path(uri)}v{version_number}.xml"
         
         self.session.execute(f"OPEN {self.db_name}")
         self.session.add(resource_name, doc_xml)
@@ -379,28 +540,12 @@ class BaseXMCPServer:
         """Retrieve version history for a document"""
         
         # XQuery to get versions
-        if include_content:
-            query = f"""
-            for $version in db:open('{self.db_name}')//document[@uri='{uri}']/version
-            order by $version/@timestamp descending
-            return $version
-            """
-        else:
-            query = f"""
-            for $version in db:open('{self.db_name}')//document[@uri='{uri}']/version
-            order by $version/@timestamp descending
-            return
-                <version number="{{$version/@number}}" 
-                         checksum="{{$version/@checksum}}" 
-                         timestamp="{{$version/@timestamp}}">
-                    {{$version/metadata}}
-                </version>
-            """
-        
-        query += f" [position() <= {limit}]"
+        query = VERSIONS_WITH_CONTENT_QUERY if include_content else VERSIONS_QUERY
         
         try:
-            result = self.session.query(query).execute()
+            result = self._run_prepared(
+                query, db=self.db_name, path=self._doc_path(uri), uri=uri, limit=str(int(limit))
+            )
             
             # Parse XML result
             versions = []
@@ -449,7 +594,7 @@ class BaseXMCPServer:
             
             # Set context if provided
             if context:
-                query = f"let $doc := db:open('{self.db_name}')//document[@uri='{context}'] return {query}"
+                query = f"let $doc := db:open('{self.db_name}', '{self._doc_path(context)}')/document return {query}"
             
             # Execute query
             query_obj = self.session.query(query)
@@ -490,32 +635,18 @@ class BaseXMCPServer:
     ) -> Dict[str, Any]:
         """Retrieve audit trail"""
         
-        # Build XQuery for audit trail
-        conditions = []
-        
-        if uri:
-            conditions.append(f"$entry/uri = '{uri}'")
-        
-        if operation_type != "all":
-            conditions.append(f"$entry/operation = '{operation_type}'")
-        
-        if start_date:
-            conditions.append(f"$entry/timestamp >= '{start_date}'")
-        
-        where_clause = " and ".join(conditions) if conditions else "true()"
-        
-        query = f"""
-        for $entry in db:open('audit_log')//entry
-        where {where_clause}
-        order by $entry/timestamp descending
-        return $entry
-        """
-        
-        query += f" [position() <= {limit}]"
+        # Write buffered entries first so earlier operations are included
+        self._flush_audit()
         
         try:
             # Note: In production, audit log should be in separate database
-            result = self.session.query(query).execute()
+            result = self._run_prepared(
+                AUDIT_TRAIL_QUERY,
+                uri=uri or "",
+                operation=operation_type,
+                start=start_date or "",
+                limit=str(int(limit))
+            )
             
             return {
                 "success": True,
@@ -543,7 +674,13 @@ class BaseXMCPServer:
         uri: str,
         details: Dict[str, Any]
     ):
-        """Log an operation to the audit trail"""
+        """
+        Log an operation to the audit trail
+        
+        The entry is buffered; it reaches BaseX with its batch once
+        AUDIT_BUFFER_MAX entries are waiting, every AUDIT_FLUSH_INTERVAL
+        seconds, or on disconnect.
+        """
         
         timestamp = datetime.utcnow().isoformat() + "Z"
         
@@ -555,6 +692,20 @@ class BaseXMCPServer:
         </entry>
         """
         
+        self._audit_buf.append(audit_xml)
+        if len(self._audit_buf) >= AUDIT_BUFFER_MAX:
+            # Write once the current tool call has returned
+            asyncio.get_running_loop().call_soon(self._flush_audit)
+    
+    def _flush_audit(self):
+        """Write all buffered audit entries to the audit_log database as one resource"""
+        if not self._audit_buf or not self.session:
+            return
+        
+        entries = list(self._audit_buf)
+        self._audit_buf.clear()
+        timestamp = datetime.utcnow().isoformat() + "Z"
+        
         try:
             # Create audit log database if it doesn't exist
             try:
@@ -564,16 +715,21 @@ class BaseXMCPServer:
             
             self.session.execute("OPEN audit_log")
             resource_name = f"audit_{timestamp.replace(':', '-')}.xml"
-            self.session.add(resource_name, audit_xml)
+            self.session.add(resource_name, f"<entries>{''.join(entries)}</entries>")
             
         except Exception as e:
             # Don't fail if audit logging fails
-            logger.warning(f"Audit logging failed: {str(e)}")
+            logger.warning(f"Audit logging failed, dropped {len(entries)} entries: {str(e)}")
+    
+    async def _audit_flusher(self):
+        """Flush the audit buffer every AUDIT_FLUSH_INTERVAL seconds"""
+        while True:
+            await asyncio.sleep(AUDIT_FLUSH_INTERVAL)
+            self._flush_audit()
 
 
 async def main():
     """Run the BaseX MCP server"""
-    import os
     
     # Get configuration from environment
     basex_host = os.getenv("BASEX_HOST", "localhost")
@@ -590,14 +746,17 @@ async def main():
     )
     
     # Run stdio server
-    async with stdio_server() as (read_stream, write_stream):
-        await server_instance.server.run(
-            read_stream,
-            write_stream,
-            server_instance.server.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server_instance.server.run(
+                read_stream,
+                write_stream,
+                server_instance.server.create_initialization_options()
+            )
+    finally:
+        # Writes any audit entries still buffered
+        server_instance.disconnect()
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
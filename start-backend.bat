@@ -44,4 +44,4 @@ echo ========================================
 echo Press Ctrl+C to stop
 echo.
 
-python -m uvicorn api.main:app --host 127.0.0.1 --port 8000
+python -m uvicorn api.main:app --host 127.0.0.1 --port 8000 --http httptools
@@ -170,5 +170,8 @@ Write-Host "========================================" -ForegroundColor Cyan
 Write-Host "Press Ctrl+C to stop" -ForegroundColor Yellow
 Write-Host ""
 
+# Use the httptools parser everywhere and uvloop where it is available (not on Windows)
+$loopFlag = if ($IsWindows -or $env:OS -eq "Windows_NT") { "asyncio" } else { "uvloop" }
+
 # Run uvicorn
-python -m uvicorn api.main:app --host $bindHost --port $port $reloadFlag
+python -m uvicorn api.main:app --host $bindHost --port $port --http httptools --loop $loopFlag $reloadFlag